@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Connect4 Benchmark Runner
+Searches a fixed, versioned suite of positions and compares the results
+against a stored baseline so runs are comparable across commits and machines
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../games/connect4'))
+from connect4 import ConnectFour
+import test as c4f
+
+SUITE_FILE = os.path.join(os.path.dirname(__file__), 'benchmark_positions.json')
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'benchmark_baseline.json')
+DEFAULT_TOLERANCE = 0.10
+MIN_TIMED_SECONDS = 0.005  # timings below this are too noisy to gate on
+
+
+def load_suite(filename=SUITE_FILE):
+    """Load the benchmark position suite"""
+    with open(filename, 'r') as f:
+        return json.load(f)
+
+
+def position_from_entry(entry):
+    """Build the ConnectFour position described by a suite entry"""
+    return ConnectFour.from_moves(entry['moves'])
+
+
+def benchmark_position(entry, depth=None, repeat=1):
+    """Search one position at every depth up to its target depth.
+
+    Node counts are deterministic; times are the best of `repeat` runs.
+    `time_to_depth[d - 1]` is the cumulative time an iterative-deepening
+    search would need to finish depth d.
+    """
+    game = position_from_entry(entry)
+    cur = game.bitboard[game.current_player]
+    opp = game.bitboard[game.opponent_symbol()]
+    target_depth = depth or entry['depth']
+
+    per_depth = []
+    elapsed = 0.0
+    for d in range(1, target_depth + 1):
+        best_time = None
+        for _ in range(repeat):
+            c4f.reset_nodes()
+            start_time = time.perf_counter()
+            move = c4f.find_best(cur, opp, d)
+            move_time = time.perf_counter() - start_time
+            if best_time is None or move_time < best_time:
+                best_time = move_time
+        nodes = c4f.get_nodes()
+        elapsed += best_time
+        per_depth.append({
+            'depth': d,
+            'move': move,
+            'nodes': nodes,
+            'time': best_time,
+            'time_to_depth': elapsed
+        })
+
+    final = per_depth[-1]
+    return {
+        'id': entry['id'],
+        'phase': entry['phase'],
+        'depth': target_depth,
+        'move': final['move'],
+        'nodes': final['nodes'],
+        'time': final['time'],
+        'nodes_per_second': final['nodes'] / final['time'] if final['time'] > 0 else 0,
+        'time_to_depth': [d['time_to_depth'] for d in per_depth],
+        'per_depth': per_depth
+    }
+
+
+def run_benchmark(suite=None, depth=None, repeat=1, position_ids=None, verbose=True):
+    """Run the whole suite (or the selected position ids)"""
+    if suite is None:
+        suite = load_suite()
+
+    results = {
+        'suite': suite['suite'],
+        'suite_version': suite['version'],
+        'timestamp': datetime.now().isoformat(),
+        'positions': {}
+    }
+
+    for entry in suite['positions']:
+        if position_ids and entry['id'] not in position_ids:
+            continue
+        result = benchmark_position(entry, depth, repeat)
+        results['positions'][entry['id']] = result
+        if verbose:
+            print(f"  {entry['id']:<8} depth {result['depth']:>2}: move {result['move']}, "
+                  f"{result['nodes']:>10} nodes, {result['nodes_per_second']:>12.0f} nodes/s, "
+                  f"{result['time_to_depth'][-1]:.4f}s to depth")
+
+    return results
+
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Return a list of regressions of `results` relative to `baseline`.
+
+    Node counts and chosen moves are machine independent, so any change in
+    them is a behavioural change; timings are only compared within tolerance
+    and only for positions that take long enough to time reliably.
+    """
+    if results['suite_version'] != baseline['suite_version']:
+        raise ValueError(f"Suite version {results['suite_version']} does not match "
+                         f"baseline version {baseline['suite_version']}")
+
+    regressions = []
+    for position_id, result in results['positions'].items():
+        base = baseline['positions'].get(position_id)
+        if base is None or base['depth'] != result['depth']:
+            continue
+
+        if result['move'] != base['move']:
+            regressions.append({'id': position_id, 'metric': 'move',
+                                'baseline': base['move'], 'current': result['move']})
+        if result['nodes'] > base['nodes'] * (1 + tolerance):
+            regressions.append({'id': position_id, 'metric': 'nodes',
+                                'baseline': base['nodes'], 'current': result['nodes']})
+        if base['time_to_depth'][-1] < MIN_TIMED_SECONDS:
+            continue
+        if result['nodes_per_second'] < base['nodes_per_second'] * (1 - tolerance):
+            regressions.append({'id': position_id, 'metric': 'nodes_per_second',
+                                'baseline': base['nodes_per_second'],
+                                'current': result['nodes_per_second']})
+        if result['time_to_depth'][-1] > base['time_to_depth'][-1] * (1 + tolerance):
+            regressions.append({'id': position_id, 'metric': 'time_to_depth',
+                                'baseline': base['time_to_depth'][-1],
+                                'current': result['time_to_depth'][-1]})
+
+    return regressions
+
+
+def save_baseline(results, filename=BASELINE_FILE):
+    """Write benchmark results as the new baseline"""
+    with open(filename, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Baseline saved to {filename}")
+    return filename
+
+
+def main():
+    """Run the suite and gate on regressions against the baseline"""
+    parser = argparse.ArgumentParser(description="Connect4 fixed-position benchmark")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="store this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative slowdown before a regression is flagged")
+    parser.add_argument('--depth', type=int, default=None,
+                        help="override the per-position search depth")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="timing repetitions per depth (best is kept)")
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('positions', nargs='*', help="position ids to run (default: all)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("CONNECT4 BENCHMARK SUITE")
+    print("=" * 60)
+
+    results = run_benchmark(depth=args.depth, repeat=args.repeat, position_ids=args.positions)
+
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"\nNo regressions beyond {args.tolerance:.0%} tolerance.")
+        return 0
+
+    print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%} tolerance:")
+    for r in regressions:
+        print(f"  {r['id']:<8} {r['metric']:<17} baseline {r['baseline']}  current {r['current']}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,75 +9,69 @@ import os
 import json
 import time
 import random
+import argparse
 from datetime import datetime
 
 # Import the Connect4 game
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../games'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../games/connect4'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from connect4 import ConnectFour
 import test as c4f
+from dedupe import distinct_starts
+from match import ConnectFourState, ConnectFourAgent
+from connect4_benchmark import load_suite, position_from_entry
+from result_cache import ResultCache, engine_hash
+from run_journal import RunJournal
+from tournament import run_tournament, move_times
+
+# Games per chunk (one checkpoint, one worker task) in the game-by-game sections
+GAMES_PER_CHUNK = 25
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../output/cache/connect4_comprehensive_journal.jsonl')
 
 class Connect4ComprehensiveSimulation:
-    """Enhanced simulation class for Connect4"""
+    """Enhanced simulation class for Connect4. The game-by-game sections are
+    played by tournament.run_tournament with this seed, workers and cache"""
     
-    def __init__(self):
+    def __init__(self, seed=0, workers=None, cache=None):
+        self.seed = seed
+        self.workers = workers
+        self.cache = cache  # ResultCache for whole scenarios, or None to play them all
         self.results = {}
+        self.journal = None  # RunJournal while run_comprehensive_simulation runs
+    
+    def checkpointed(self, key, compute):
+        """compute(), or its result from the run journal when an interrupted
+        run already finished it"""
+        if self.journal is None:
+            return compute()
+        return self.journal.run(key, compute)
+    
+    def run_scenarios(self, scenarios):
+        """Play tournament scenarios on the process pool; results by name"""
+        results, _ = run_tournament(scenarios, self.seed, self.workers, GAMES_PER_CHUNK, self.cache, self.journal)
+        return results
     
     def simulate_ai_vs_random_depth_analysis(self, depths=[2, 4, 6, 8, 10], games_per_depth=50):
         """Simulate AI vs random at different depths"""
         print(f"Running AI vs Random at different depths...")
         
         depth_results = {}
+        scenarios = [(f'connect4_comprehensive_depth{depth}_vs_random', 'connect4', 'ai', 'random',
+                      {'depth1': depth}, games_per_depth) for depth in depths]
+        results = self.run_scenarios(scenarios)
         
-        for depth in depths:
-            print(f"  Testing depth {depth}...")
-            
-            ai_wins = 0
-            random_wins = 0
-            draws = 0
-            total_moves = 0
-            ai_move_times = []
-            
-            for game_num in range(games_per_depth):
-                game = ConnectFour()
-                moves = 0
-                
-                while True:
-                    if game.current_player == 'X':  # AI player
-                        start_time = time.time()
-                        col = game.best_move(depth)
-                        move_time = time.time() - start_time
-                        ai_move_times.append(move_time)
-                        game.make_move(col)
-                    else:  # Random player
-                        valid_moves = game.get_valid_moves()
-                        if valid_moves:
-                            col = random.choice(valid_moves)
-                            game.make_move(col)
-                        else:
-                            break
-                    
-                    moves += 1
-                    
-                    # Check if game is over
-                    if c4f.win(game.bitboard['X']):
-                        ai_wins += 1
-                        break
-                    elif c4f.win(game.bitboard['O']):
-                        random_wins += 1
-                        break
-                    elif not game.get_valid_moves():
-                        draws += 1
-                        break
-                
-                total_moves += moves
+        for depth, scenario in zip(depths, scenarios):
+            result = results[scenario[0]]
+            ai_move_times = move_times(result, 1)
             
             depth_results[depth] = {
-                'ai_wins': ai_wins,
-                'random_wins': random_wins,
-                'draws': draws,
+                'ai_wins': result['agent1_wins'],
+                'random_wins': result['agent2_wins'],
+                'draws': result['draws'],
                 'total_games': games_per_depth,
-                'ai_win_rate': (ai_wins / games_per_depth) * 100,
-                'avg_moves': total_moves / games_per_depth,
+                'ai_win_rate': result['agent1_win_rate'],
+                'avg_moves': result['avg_moves'],
                 'avg_ai_move_time': sum(ai_move_times) / len(ai_move_times) if ai_move_times else 0,
                 'total_ai_time': sum(ai_move_times),
                 'depth': depth
@@ -92,59 +86,28 @@ class Connect4ComprehensiveSimulation:
         print(f"Running AI vs AI depth comparisons...")
         
         comparison_results = {}
-        
-        for depth1, depth2 in depth_pairs:
-            print(f"  Testing depth {depth1} vs depth {depth2}...")
-            
-            ai1_wins = 0
-            ai2_wins = 0
-            draws = 0
-            total_moves = 0
-            ai1_times = []
-            ai2_times = []
-            
-            for game_num in range(games_per_pair):
-                game = ConnectFour()
-                moves = 0
-                
-                while True:
-                    if game.current_player == 'X':  # AI1 (deeper depth)
-                        start_time = time.time()
-                        col = game.best_move(depth1)
-                        move_time = time.time() - start_time
-                        ai1_times.append(move_time)
-                        game.make_move(col)
-                    else:  # AI2 (shallower depth)
-                        start_time = time.time()
-                        col = game.best_move(depth2)
-                        move_time = time.time() - start_time
-                        ai2_times.append(move_time)
-                        game.make_move(col)
-                    
-                    moves += 1
-                    
-                    # Check if game is over
-                    if c4f.win(game.bitboard['X']):
-                        ai1_wins += 1
-                        break
-                    elif c4f.win(game.bitboard['O']):
-                        ai2_wins += 1
-                        break
-                    elif not game.get_valid_moves():
-                        draws += 1
-                        break
-                
-                total_moves += moves
+        # Depth depth1 plays X, depth2 O; the first player is drawn per game.
+        # Both searches are deterministic, so the runner plays each starting
+        # player once and weights it by the games that drew it.
+        scenarios = [(f'connect4_comprehensive_depth{depth1}_vs_depth{depth2}', 'connect4', 'ai', 'ai',
+                      {'depth1': depth1, 'depth2': depth2}, games_per_pair) for depth1, depth2 in depth_pairs]
+        results = self.run_scenarios(scenarios)
+        
+        for (depth1, depth2), scenario in zip(depth_pairs, scenarios):
+            print(f"  Depth {depth1} vs depth {depth2}:")
             
+            played = results[scenario[0]]
+            ai1_times = move_times(played, 1)
+            ai2_times = move_times(played, 2)
             comparison_results[f"{depth1}_vs_{depth2}"] = {
-                'ai1_wins': ai1_wins,
-                'ai2_wins': ai2_wins,
-                'draws': draws,
+                'ai1_wins': played['agent1_wins'],
+                'ai2_wins': played['agent2_wins'],
+                'draws': played['draws'],
                 'total_games': games_per_pair,
-                'ai1_win_rate': (ai1_wins / games_per_pair) * 100,
-                'ai2_win_rate': (ai2_wins / games_per_pair) * 100,
-                'draw_rate': (draws / games_per_pair) * 100,
-                'avg_moves': total_moves / games_per_pair,
+                'ai1_win_rate': played['agent1_win_rate'],
+                'ai2_win_rate': played['agent2_win_rate'],
+                'draw_rate': played['draw_rate'],
+                'avg_moves': played['avg_moves'],
                 'ai1_avg_time': sum(ai1_times) / len(ai1_times) if ai1_times else 0,
                 'ai2_avg_time': sum(ai2_times) / len(ai2_times) if ai2_times else 0,
                 'depth1': depth1,
@@ -167,20 +130,26 @@ class Connect4ComprehensiveSimulation:
             'O': []   # Second player (AI or random)
         }
         
-        # AI first moves
-        for game_num in range(num_games):
+        # AI first moves. Only games X starts record anything, and those all
+        # search the same two positions, so search them once and repeat.
+        # ConnectFour() draws its first player unseeded, so draw it from seed here
+        agent = ConnectFourAgent(depth)
+        rng = random.Random(self.seed)
+        for first_player, weight in distinct_starts(num_games, [agent], lambda: rng.choice(['X', 'O'])):
             game = ConnectFour()
+            game.current_player = first_player
+            state = ConnectFourState(game)
             
             # Record AI's opening move
             if game.current_player == 'X':
-                col = game.best_move(depth)
-                opening_moves['X'].append(col)
-                game.make_move(col)
+                col = agent.select(state)
+                opening_moves['X'].extend([col] * weight)
+                state.apply(col)
                 
                 # AI's response to opening
-                if not c4f.win(game.bitboard['X']) and game.get_valid_moves():
-                    col = game.best_move(depth)
-                    opening_moves['O'].append(col)
+                if state.terminal() is None:
+                    col = agent.select(state)
+                    opening_moves['O'].extend([col] * weight)
         
         # Calculate move distributions
         move_distribution = {}
@@ -196,46 +165,64 @@ class Connect4ComprehensiveSimulation:
         
         return move_distribution
     
-    def test_computation_time_scaling(self, depths=[2, 4, 6, 8, 10, 12], positions_per_depth=20):
-        """Test how computation time scales with search depth"""
+    def time_depth(self, positions, depth, suite_version):
+        """Search every benchmark position at depth; timing summary, or None without positions"""
+        times = []
+        nodes = []
+        
+        for entry in positions:
+            game = position_from_entry(entry)
+            cur = game.bitboard[game.current_player]
+            opp = game.bitboard[game.opponent_symbol()]
+            
+            # Time the AI move
+            c4f.reset_nodes()
+            start_time = time.perf_counter()
+            c4f.find_best(cur, opp, depth)
+            move_time = time.perf_counter() - start_time
+            times.append(move_time)
+            nodes.append(c4f.get_nodes())
+        
+        if not times:
+            return None
+        return {
+            'avg_time': sum(times) / len(times),
+            'min_time': min(times),
+            'max_time': max(times),
+            'avg_nodes': sum(nodes) / len(nodes),
+            'nodes_per_second': sum(nodes) / sum(times) if sum(times) > 0 else 0,
+            'total_positions': len(times),
+            'suite_version': suite_version,
+            'depth': depth
+        }
+    
+    def test_computation_time_scaling(self, depths=[2, 4, 6, 8, 10, 12], positions_per_phase=4):
+        """Test how computation time scales with search depth on the fixed benchmark suite.
+        Takes the first positions_per_phase positions of each game phase and searches each
+        one only at depths up to its suite 'depth', so the deepest searches run on the
+        endgame positions the suite sizes for them rather than on openings."""
         print(f"Testing computation time scaling...")
         
+        suite = load_suite()
+        phase_counts = {}
+        positions = []
+        for entry in suite['positions']:
+            phase_counts[entry['phase']] = phase_counts.get(entry['phase'], 0) + 1
+            if phase_counts[entry['phase']] <= positions_per_phase:
+                positions.append(entry)
         timing_results = {}
         
         for depth in depths:
             print(f"  Testing depth {depth}...")
             
-            times = []
-            
-            for _ in range(positions_per_depth):
-                game = ConnectFour()
-                
-                # Make a few random moves to get to mid-game position
-                for _ in range(random.randint(3, 10)):
-                    valid_moves = game.get_valid_moves()
-                    if valid_moves:
-                        col = random.choice(valid_moves)
-                        game.make_move(col)
-                    if c4f.win(game.bitboard['X']) or c4f.win(game.bitboard['O']) or not game.get_valid_moves():
-                        break
-                
-                # Time the AI move
-                if game.get_valid_moves() and not c4f.win(game.bitboard['X']) and not c4f.win(game.bitboard['O']):
-                    start_time = time.time()
-                    game.best_move(depth)
-                    move_time = time.time() - start_time
-                    times.append(move_time)
-            
-            if times:
-                timing_results[depth] = {
-                    'avg_time': sum(times) / len(times),
-                    'min_time': min(times),
-                    'max_time': max(times),
-                    'total_positions': len(times),
-                    'depth': depth
-                }
+            at_depth = [entry for entry in positions if depth <= entry['depth']]
+            timing = self.checkpointed(['timing', depth, suite['version'], [entry['id'] for entry in at_depth]],
+                                       lambda: self.time_depth(at_depth, depth, suite['version']))
+            if timing is not None:
+                timing_results[depth] = timing
                 
-                print(f"    Depth {depth}: {timing_results[depth]['avg_time']:.4f}s avg time")
+                print(f"    Depth {depth}: {timing_results[depth]['avg_time']:.4f}s avg time "
+                      f"over {timing['total_positions']} positions")
         
         return timing_results
     
@@ -252,58 +239,32 @@ class Connect4ComprehensiveSimulation:
             'game_lengths': []
         }
         
-        for game_num in range(num_games):
-            game = ConnectFour()
-            moves = 0
-            game_moves = []
-            game_times = []
-            
-            while True:
-                if game.current_player == 'X':  # AI player
-                    start_time = time.time()
-                    col = game.best_move(depth)
-                    move_time = time.time() - start_time
-                    game_times.append(move_time)
-                    game_moves.append(('AI', col))
-                    game.make_move(col)
-                else:  # Random player
-                    valid_moves = game.get_valid_moves()
-                    if valid_moves:
-                        col = random.choice(valid_moves)
-                        game_moves.append(('Random', col))
-                        game.make_move(col)
-                    else:
-                        break
-                
-                moves += 1
-                
-                # Check if game is over
-                if c4f.win(game.bitboard['X']):
-                    results['ai_wins'] += 1
-                    winner = 'AI'
-                    break
-                elif c4f.win(game.bitboard['O']):
-                    results['random_wins'] += 1
-                    winner = 'Random'
-                    break
-                elif not game.get_valid_moves():
-                    results['draws'] += 1
-                    winner = 'Draw'
-                    break
+        name = f'connect4_comprehensive_detailed_depth{depth}'
+        played = self.run_scenarios([(name, 'connect4', 'ai', 'random',
+                                      {'depth1': depth, 'record_games': True}, num_games)])[name]
+        names = {1: 'AI', 2: 'Random'}
+        
+        for game_num, ((winner, length, moves), timings) in enumerate(zip(played['games'],
+                                                                          played['timings']['games'])):
+            game_times = timings[0]
+            if winner == 1:
+                results['ai_wins'] += 1
+            elif winner == 2:
+                results['random_wins'] += 1
+            else:
+                results['draws'] += 1
             
             results['games'].append({
                 'game_id': game_num + 1,
-                'winner': winner,
-                'moves': moves,
-                'move_sequence': game_moves[:10],  # First 10 moves
+                'winner': names.get(winner, 'Draw'),
+                'moves': length,
+                'move_sequence': [(names[player], col) for player, col in moves[:10]],  # First 10 moves
                 'ai_avg_time': sum(game_times) / len(game_times) if game_times else 0
             })
-            
             results['move_times'].extend(game_times)
-            results['game_lengths'].append(moves)
-            
-            if (game_num + 1) % 20 == 0:
-                print(f"  Completed {game_num + 1}/{num_games} games")
+            results['game_lengths'].append(length)
+        
+        print(f"  Completed {num_games}/{num_games} games")
         
         # Calculate summary statistics
         results['ai_win_rate'] = (results['ai_wins'] / num_games) * 100
@@ -319,16 +280,29 @@ class Connect4ComprehensiveSimulation:
         
         return results
     
-    def run_comprehensive_simulation(self):
-        """Run all Connect4 simulations and collect comprehensive data"""
+    def run_comprehensive_simulation(self, resume=True):
+        """Run all Connect4 simulations and collect comprehensive data. Finished
+        chunks are checkpointed to a run journal, so a crashed or interrupted
+        run picks up where it stopped; resume=False discards the journal."""
         print("=" * 60)
         print("COMPREHENSIVE CONNECT4 SIMULATION")
         print("=" * 60)
         
         start_time = time.time()
         
+        if not resume and os.path.exists(JOURNAL_PATH):
+            os.remove(JOURNAL_PATH)
+        # Chunks are only reusable with the engine and this script as they were
+        self.journal = RunJournal(JOURNAL_PATH, {
+            'script': 'connect4_comprehensive_simulation',
+            'engine': engine_hash('connect4', ['analysis/connect4/connect4_comprehensive_simulation.py'])
+        })
+        if self.journal.recovered:
+            print(f"Resuming: {self.journal.recovered} finished chunk(s) recovered from {JOURNAL_PATH}")
+        
         self.results = {
             'timestamp': datetime.now().isoformat(),
+            'seed': self.seed,
             'game': 'Connect4',
             'simulation_results': {}
         }
@@ -359,7 +333,7 @@ class Connect4ComprehensiveSimulation:
         # 4. Computation time scaling
         print("\n4. COMPUTATION TIME SCALING")
         print("-" * 50)
-        timing_analysis = self.test_computation_time_scaling([2, 4, 6, 8, 10, 12], 15)
+        timing_analysis = self.test_computation_time_scaling([2, 4, 6, 8, 10, 12], 4)
         self.results['simulation_results']['timing_analysis'] = timing_analysis
         
         # 5. Detailed win rate analysis
@@ -368,15 +342,17 @@ class Connect4ComprehensiveSimulation:
         detailed_analysis = self.simulate_win_rate_vs_random(120, 8)
         self.results['simulation_results']['detailed_win_analysis'] = detailed_analysis
         
-        # 6. Performance metrics
-        total_time = time.time() - start_time
+        # 6. Performance metrics, counting the time recovered chunks took
+        # when they were first played
+        total_time = time.time() - start_time + self.journal.reused_seconds
         total_games = (5*75 + 4*40 + 100 + 120)  # Sum of all games
         
         self.results['simulation_results']['performance_metrics'] = {
             'total_simulation_time': total_time,
             'total_games_simulated': total_games,
             'games_per_second': total_games / total_time,
-            'avg_time_per_game': total_time / total_games
+            'avg_time_per_game': total_time / total_games,
+            'resumed_chunks': self.journal.reused
         }
         
         # Save results to JSON
@@ -389,6 +365,13 @@ class Connect4ComprehensiveSimulation:
         with open(filename, 'w') as f:
             json.dump(self.results, f, indent=2, default=str)
         
+        # Results are safely written, so the next run starts from scratch
+        if self.cache is not None:
+            print(self.cache.report())
+        print(self.journal.report())
+        self.journal.close(complete=True)
+        self.journal = None
+        
         print("\n" + "=" * 60)
         print("CONNECT4 SIMULATION COMPLETE")
         print("=" * 60)
@@ -401,8 +384,16 @@ class Connect4ComprehensiveSimulation:
 
 def main():
     """Main function to run the comprehensive simulation"""
-    simulation = Connect4ComprehensiveSimulation()
-    results, filename = simulation.run_comprehensive_simulation()
+    parser = argparse.ArgumentParser(description="Run the comprehensive Connect4 simulation")
+    parser.add_argument('--fresh', action='store_true', help="ignore chunks checkpointed by an interrupted run")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--no-cache', action='store_true', help="play every scenario, ignoring stored results")
+    args = parser.parse_args()
+    cache = ResultCache(enabled=not args.no_cache)
+    
+    simulation = Connect4ComprehensiveSimulation(seed=args.seed, workers=args.workers, cache=cache)
+    results, filename = simulation.run_comprehensive_simulation(resume=not args.fresh)
     
     print(f"\nSimulation data saved to: {filename}")
     print("This data can now be used by visualization scripts.")
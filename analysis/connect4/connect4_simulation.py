@@ -5,7 +5,8 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../games'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../games/connect4'))
 from connect4 import ConnectFour
-import test as c4f
+from dedupe import distinct_starts
+from match import ConnectFourState, ConnectFourAgent, RandomAgent, play_match
 
 class Connect4Simulation:
     """
@@ -25,40 +26,22 @@ class Connect4Simulation:
         draws = 0
         total_moves = 0
         ai_move_times = []
+        agent = ConnectFourAgent(ai_depth)
+        opponent = RandomAgent()
         
         for game_num in range(num_games):
             self.game = ConnectFour()
-            moves = 0
+            result = play_match(ConnectFourState(self.game), agent, opponent)
+            ai_move_times.extend(result.move_times[0])
             
-            while True:
-                if self.game.current_player == 'X':  # AI player
-                    start_time = time.time()
-                    col = self.game.best_move(ai_depth)
-                    move_time = time.time() - start_time
-                    ai_move_times.append(move_time)
-                    self.game.make_move(col)
-                else:  # Random player
-                    valid_moves = self.game.get_valid_moves()
-                    if valid_moves:
-                        col = random.choice(valid_moves)
-                        self.game.make_move(col)
-                    else:
-                        break
-                
-                moves += 1
-                
-                # Check if game is over
-                if c4f.win(self.game.bitboard['X']):
-                    ai_wins += 1
-                    break
-                elif c4f.win(self.game.bitboard['O']):
-                    random_wins += 1
-                    break
-                elif not self.game.get_valid_moves():
-                    draws += 1
-                    break
+            if result.winner == 1:
+                ai_wins += 1
+            elif result.winner == 2:
+                random_wins += 1
+            else:
+                draws += 1
             
-            total_moves += moves
+            total_moves += result.length
             
             if (game_num + 1) % 20 == 0:
                 print(f"Completed {game_num + 1}/{num_games} games")
@@ -87,35 +70,24 @@ class Connect4Simulation:
         ai2_wins = 0
         draws = 0
         total_moves = 0
+        agent1 = ConnectFourAgent(depth1)  # X, the deeper search
+        agent2 = ConnectFourAgent(depth2)  # O, the shallower search
         
-        for game_num in range(num_games):
+        # Both AIs are deterministic, so a game only depends on the randomly
+        # drawn starting player: play each starting player once and weight it
+        for first_player, weight in distinct_starts(num_games, [agent1, agent2], lambda: ConnectFour().current_player):
             self.game = ConnectFour()
-            moves = 0
-            
-            while True:
-                if self.game.current_player == 'X':  # AI1 (deeper depth)
-                    col = self.game.best_move(depth1)
-                else:  # AI2 (shallower depth)
-                    col = self.game.best_move(depth2)
-                
-                self.game.make_move(col)
-                moves += 1
-                
-                # 检查游戏是否结束
-                if c4f.win(self.game.bitboard['X']):
-                    ai1_wins += 1
-                    break
-                elif c4f.win(self.game.bitboard['O']):
-                    ai2_wins += 1
-                    break
-                elif not self.game.get_valid_moves():
-                    draws += 1
-                    break
+            self.game.current_player = first_player
+            result = play_match(ConnectFourState(self.game), agent1, agent2, timed=False)
             
-            total_moves += moves
+            if result.winner == 1:
+                ai1_wins += weight
+            elif result.winner == 2:
+                ai2_wins += weight
+            else:
+                draws += weight
             
-            if (game_num + 1) % 10 == 0:
-                print(f"Completed {game_num + 1}/{num_games} games")
+            total_moves += result.length * weight
         
         results = {
             'ai1_wins': ai1_wins,
@@ -138,14 +110,16 @@ class Connect4Simulation:
         print(f"Analyzing opening move distribution, {num_games} games total...")
         
         opening_moves = {'X': [], 'O': []}
+        ai_opening = None  # the AI's search from the empty board always gives the same column
         
         for game_num in range(num_games):
             self.game = ConnectFour()
             
             # Record AI's opening move
             if self.game.current_player == 'X':
-                col = self.game.best_move(ai_depth)
-                opening_moves['X'].append(col)
+                if ai_opening is None:
+                    ai_opening = self.game.best_move(ai_depth)
+                opening_moves['X'].append(ai_opening)
             else:
                 # Random opponent's opening move
                 col = random.choice(self.game.get_valid_moves())
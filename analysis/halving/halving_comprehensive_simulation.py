@@ -8,79 +8,92 @@ import sys
 import os
 import json
 import time
-import random
+import argparse
 from datetime import datetime
+from functools import partial
+
+import numpy as np
 
 # Import the Halving game
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../games'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from Halving import HalvingGame
+from halving_automaton import HalvingAutomaton
+from halving_family import RuleSet, HalvingFamilyGame
+from dedupe import distinct_starts
+from match import HalvingState, HalvingAgent, play_match
+from tournament import GAMES_PER_CHUNK, run_tournament, move_times
+from result_cache import ResultCache, engine_hash
+from run_journal import RunJournal
+
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../output/cache/halving_comprehensive_journal.jsonl')
 
 class HalvingComprehensiveSimulation:
-    """Comprehensive simulation class for Halving Game"""
+    """Comprehensive simulation class for Halving Game. Games are played as
+    tournament scenarios (see tournament.run_tournament for seed and workers)"""
     
-    def __init__(self):
+    def __init__(self, rules=None, seed=0, workers=None, cache=None):
+        # rules: a RuleSet other than Halving's, played as a HalvingFamilyGame
+        self.rules = rules
+        self.game_factory = HalvingGame if rules is None else partial(HalvingFamilyGame, rules=rules)
+        self.seed = seed
+        self.workers = workers
+        self.cache = cache  # ResultCache for whole scenarios, or None to play them all
         self.results = {}
+        self.journal = None  # RunJournal while run_comprehensive_simulation runs
+    
+    def scenario(self, name, agent1, agent2, initial_number, num_games, **params):
+        """Tournament scenario from initial_number under this simulation's rules"""
+        params['start'] = initial_number
+        if self.rules is not None:
+            params['rules'] = self.rules.to_dict()
+        return (name, 'halving', agent1, agent2, params, num_games)
+    
+    def run_scenarios(self, scenarios):
+        """Play tournament scenarios on the process pool; results by name"""
+        results, _ = run_tournament(scenarios, self.seed, self.workers, GAMES_PER_CHUNK, self.cache, self.journal)
+        return results
     
     def simulate_with_different_initial_numbers(self, initial_numbers=[10, 15, 20, 25, 30, 50, 75, 100], games_per_number=50):
         """Test win rates with different initial numbers"""
         print(f"Running simulations with different initial numbers...")
         
         number_results = {}
-        
-        for initial_num in initial_numbers:
-            print(f"  Testing initial number {initial_num}...")
+        # Minimax vs minimax from a fixed start is one game: the runner plays
+        # it once and counts it for every game of the scenario, and timings
+        # keep one entry per move actually searched
+        scenarios = [self.scenario(f'halving_comprehensive_{initial_num}_minimax_vs_minimax', 'minimax', 'minimax',
+                                   initial_num, games_per_number, record_games=True)
+                     for initial_num in initial_numbers]
+        results = self.run_scenarios(scenarios)
+        
+        for initial_num, scenario in zip(initial_numbers, scenarios):
+            print(f"  Initial number {initial_num}:")
             
-            player1_wins = 0
-            player2_wins = 0
-            game_lengths = []
+            played = results[scenario[0]]
+            game = self.game_factory(initial_num)
             halving_moves = 0
             subtraction_moves = 0
-            computation_times = []
+            computation_times = move_times(played, 1) + move_times(played, 2)
             
-            for game_num in range(games_per_number):
-                game = HalvingGame(initial_num)
+            # Track strategy preferences
+            for _, _, moves in played['games']:
                 current_number = initial_num
-                current_player = 1
-                moves = 0
-                game_start_time = time.time()
-                
-                while current_number > 1:
-                    is_maximizing = (current_player == 1)
-                    
-                    start_time = time.time()
-                    _, move = game.minimax(current_number, is_maximizing)
-                    move_time = time.time() - start_time
-                    computation_times.append(move_time)
-                    
-                    # Track strategy preferences
-                    if move == current_number // 2:
+                for _, move in moves:
+                    if game.operation(current_number, move).startswith("/"):
                         halving_moves += 1
-                    else:  # move == current_number - 1
+                    else:
                         subtraction_moves += 1
-                    
                     current_number = move
-                    current_player = 2 if current_player == 1 else 1
-                    moves += 1
-                
-                game_time = time.time() - game_start_time
-                
-                # Determine winner
-                winner = 2 if current_player == 1 else 1
-                if winner == 1:
-                    player1_wins += 1
-                else:
-                    player2_wins += 1
-                
-                game_lengths.append(moves)
             
             number_results[initial_num] = {
                 'initial_number': initial_num,
-                'player1_wins': player1_wins,
-                'player2_wins': player2_wins,
-                'player1_win_rate': (player1_wins / games_per_number) * 100,
-                'player2_win_rate': (player2_wins / games_per_number) * 100,
-                'avg_game_length': sum(game_lengths) / len(game_lengths),
-                'total_moves': sum(game_lengths),
+                'player1_wins': played['agent1_wins'],
+                'player2_wins': played['agent2_wins'],
+                'player1_win_rate': played['agent1_win_rate'],
+                'player2_win_rate': played['agent2_win_rate'],
+                'avg_game_length': played['avg_moves'],
+                'total_moves': played['total_moves'],
                 'halving_moves': halving_moves,
                 'subtraction_moves': subtraction_moves,
                 'halving_percentage': (halving_moves / (halving_moves + subtraction_moves)) * 100 if (halving_moves + subtraction_moves) > 0 else 0,
@@ -106,43 +119,47 @@ class HalvingComprehensiveSimulation:
             
             move_patterns = []
             decision_points = []
+            agent = HalvingAgent()
             
-            for game_num in range(games_per_number):
-                game = HalvingGame(initial_num)
+            # Deterministic on both sides: analyze the one distinct game and
+            # repeat its patterns and decision points for every copy
+            for _, weight in distinct_starts(games_per_number, [agent]):
+                game = self.game_factory(initial_num)
+                result = play_match(HalvingState(initial_num, game), agent, agent, timed=False)
                 current_number = initial_num
-                current_player = 1
                 game_pattern = []
+                game_decisions = []
                 
-                while current_number > 1:
+                # Walk the played game, examining every position with a choice
+                for current_player, move in result.moves:
                     is_maximizing = (current_player == 1)
                     possible_moves = game.get_moves(current_number)
                     
                     if len(possible_moves) > 1:  # Decision point
-                        _, optimal_move = game.minimax(current_number, is_maximizing)
+                        optimal_move = move
                         
                         # Analyze what happens with each choice
                         move_analysis = {}
                         for possible_move in possible_moves:
                             # Simulate opponent's response
-                            temp_game = HalvingGame(initial_num)
+                            temp_game = self.game_factory(initial_num)
                             _, opponent_response = temp_game.minimax(possible_move, not is_maximizing)
                             
-                            operation = "halve" if possible_move == current_number // 2 else "subtract"
+                            operation = "halve" if game.operation(current_number, possible_move).startswith("/") else "subtract"
                             move_analysis[possible_move] = {
                                 'operation': operation,
                                 'opponent_response': opponent_response,
                                 'chosen': (possible_move == optimal_move)
                             }
                         
-                        decision_points.append({
+                        game_decisions.append({
                             'number': current_number,
                             'player': current_player,
                             'analysis': move_analysis,
                             'optimal_choice': optimal_move
                         })
                     
-                    _, move = game.minimax(current_number, is_maximizing)
-                    operation = "halve" if move == current_number // 2 else "subtract"
+                    operation = "halve" if game.operation(current_number, move).startswith("/") else "subtract"
                     
                     game_pattern.append({
                         'from': current_number,
@@ -152,9 +169,9 @@ class HalvingComprehensiveSimulation:
                     })
                     
                     current_number = move
-                    current_player = 2 if current_player == 1 else 1
                 
-                move_patterns.append(game_pattern)
+                move_patterns.extend([game_pattern] * weight)
+                decision_points.extend(game_decisions * weight)
             
             # Analyze patterns
             total_halving = sum(1 for pattern in move_patterns for move in pattern if move['operation'] == 'halve')
@@ -186,91 +203,103 @@ class HalvingComprehensiveSimulation:
         for num in numbers:
             print(f"  Testing number {num}...")
             
+            # Start each number cold: the first trial solves it, later ones hit the shared cache
+            self.game_factory(num).clear_cache()
             computation_times = []
             game_lengths = []
+            agent = HalvingAgent()
             
             for trial in range(trials_per_number):
-                game = HalvingGame(num)
-                current_number = num
-                current_player = 1
-                moves = 0
-                total_computation_time = 0
-                
-                while current_number > 1:
-                    is_maximizing = (current_player == 1)
-                    
-                    start_time = time.time()
-                    _, move = game.minimax(current_number, is_maximizing)
-                    computation_time = time.time() - start_time
-                    total_computation_time += computation_time
-                    
-                    current_number = move
-                    current_player = 2 if current_player == 1 else 1
-                    moves += 1
-                
-                computation_times.append(total_computation_time)
-                game_lengths.append(moves)
+                game = self.game_factory(num)
+                result = play_match(HalvingState(num, game), agent, agent)
+                computation_times.append(sum(result.times))
+                game_lengths.append(result.length)
             
             scaling_results[num] = {
                 'initial_number': num,
                 'avg_total_computation_time': sum(computation_times) / len(computation_times),
                 'avg_game_length': sum(game_lengths) / len(game_lengths),
                 'avg_time_per_move': (sum(computation_times) / len(computation_times)) / (sum(game_lengths) / len(game_lengths)) if game_lengths else 0,
+                'cold_computation_time': computation_times[0],
+                'cache_stats': game.cache_stats(),
                 'trials': trials_per_number
             }
             
             result = scaling_results[num]
-            print(f"    Avg computation time: {result['avg_total_computation_time']:.4f}s")
+            print(f"    Avg computation time: {result['avg_total_computation_time']:.4f}s "
+                  f"(cold {result['cold_computation_time']:.4f}s, "
+                  f"cache hit rate {result['cache_stats']['hit_rate']:.1%})")
             print(f"    Avg game length: {result['avg_game_length']:.1f} moves")
         
         return scaling_results
     
+    def analyze_large_numbers(self, bit_lengths=[16, 24, 32, 48, 63], samples_per_length=100000):
+        """Outcomes and first moves far beyond any table, from the verified outcome automaton"""
+        print(f"Analyzing starting numbers up to 2^63...")
+        
+        start_time = time.time()
+        automaton = HalvingAutomaton.build()
+        build_time = time.time() - start_time
+        print(f"  Automaton: {automaton.num_states} states, verified for 1..{automaton.verified_limit}, "
+              f"built in {build_time:.2f}s")
+        
+        rng = np.random.default_rng(self.seed)
+        large_results = {}
+        
+        for bits in bit_lengths:
+            examples = {}
+            start_time = time.time()
+            for n in (2 ** bits - 1, 2 ** bits, 3 * 2 ** (bits - 1)):
+                examples[str(n)] = {
+                    'player1_wins': automaton.is_win(n),
+                    'optimal_move': automaton.best_move(n)
+                }
+            query_time = (time.time() - start_time) / len(examples)
+            
+            # Random numbers with exactly `bits` bits
+            numbers = rng.integers(2 ** (bits - 1), 2 ** bits - 1, size=samples_per_length,
+                                   dtype=np.uint64, endpoint=True)
+            win_rate = float(automaton.win_mask(numbers).mean()) * 100
+            
+            large_results[bits] = {
+                'bit_length': bits,
+                'examples': examples,
+                'player1_win_rate': win_rate,
+                'samples': samples_per_length,
+                'avg_query_time': query_time
+            }
+            print(f"  {bits}-bit numbers: first player wins {win_rate:.2f}% "
+                  f"({query_time * 1e6:.1f}us per query)")
+        
+        return {
+            'num_states': automaton.num_states,
+            'verified_limit': automaton.verified_limit,
+            'build_time': build_time,
+            'by_bit_length': large_results
+        }
+    
     def simulate_minimax_vs_random(self, initial_numbers=[15, 25, 50, 75], games_per_number=50):
         """Compare minimax strategy vs random strategy"""
         print(f"Running Minimax vs Random simulations...")
         
         comparison_results = {}
-        
-        for initial_num in initial_numbers:
-            print(f"  Testing initial number {initial_num}...")
-            
-            minimax_wins = 0
-            random_wins = 0
-            game_lengths = []
-            
-            for game_num in range(games_per_number):
-                game = HalvingGame(initial_num)
-                current_number = initial_num
-                current_player = 1  # Minimax player
-                moves = 0
-                
-                while current_number > 1:
-                    if current_player == 1:  # Minimax player
-                        _, move = game.minimax(current_number, True)
-                    else:  # Random player
-                        possible_moves = game.get_moves(current_number)
-                        move = random.choice(possible_moves) if possible_moves else current_number - 1
-                    
-                    current_number = move
-                    current_player = 2 if current_player == 1 else 1
-                    moves += 1
-                
-                game_lengths.append(moves)
-                
-                # Determine winner
-                winner = 2 if current_player == 1 else 1
-                if winner == 1:  # Minimax player wins
-                    minimax_wins += 1
-                else:  # Random player wins
-                    random_wins += 1
+        # The minimax player moves first
+        scenarios = [self.scenario(f'halving_comprehensive_{initial_num}_minimax_vs_random', 'minimax', 'random',
+                                   initial_num, games_per_number)
+                     for initial_num in initial_numbers]
+        results = self.run_scenarios(scenarios)
+        
+        for initial_num, scenario in zip(initial_numbers, scenarios):
+            print(f"  Initial number {initial_num}:")
             
+            played = results[scenario[0]]
             comparison_results[initial_num] = {
                 'initial_number': initial_num,
-                'minimax_wins': minimax_wins,
-                'random_wins': random_wins,
-                'minimax_win_rate': (minimax_wins / games_per_number) * 100,
-                'random_win_rate': (random_wins / games_per_number) * 100,
-                'avg_game_length': sum(game_lengths) / len(game_lengths),
+                'minimax_wins': played['agent1_wins'],
+                'random_wins': played['agent2_wins'],
+                'minimax_win_rate': played['agent1_win_rate'],
+                'random_win_rate': played['agent2_win_rate'],
+                'avg_game_length': played['avg_moves'],
                 'total_games': games_per_number
             }
             
@@ -287,18 +316,18 @@ class HalvingComprehensiveSimulation:
         first_move_analysis = {}
         
         for initial_num in initial_numbers:
-            game = HalvingGame(initial_num)
+            game = self.game_factory(initial_num)
             
             # Get optimal first move
             _, optimal_move = game.minimax(initial_num, True)
-            optimal_operation = "halve" if optimal_move == initial_num // 2 else "subtract"
+            optimal_operation = "halve" if game.operation(initial_num, optimal_move).startswith("/") else "subtract"
             
             # Analyze consequences of each possible first move
             possible_moves = game.get_moves(initial_num)
             move_consequences = {}
             
             for move in possible_moves:
-                operation = "halve" if move == initial_num // 2 else "subtract"
+                operation = "halve" if game.operation(initial_num, move).startswith("/") else "subtract"
                 
                 # Simulate opponent's best response
                 _, opponent_move = game.minimax(move, False)
@@ -327,16 +356,29 @@ class HalvingComprehensiveSimulation:
         
         return first_move_analysis
     
-    def run_comprehensive_simulation(self):
-        """Run all Halving Game simulations and collect comprehensive data"""
+    def run_comprehensive_simulation(self, resume=True):
+        """Run all Halving Game simulations and collect comprehensive data. Finished
+        chunks of games are checkpointed to a run journal, so a crashed or
+        interrupted run picks up where it stopped; resume=False discards it."""
         print("=" * 60)
         print("COMPREHENSIVE HALVING GAME SIMULATION")
         print("=" * 60)
         
         start_time = time.time()
         
+        if not resume and os.path.exists(JOURNAL_PATH):
+            os.remove(JOURNAL_PATH)
+        # Chunks are only reusable with the engine and this script as they were
+        self.journal = RunJournal(JOURNAL_PATH, {
+            'script': 'halving_comprehensive_simulation',
+            'engine': engine_hash('halving', ['analysis/halving/halving_comprehensive_simulation.py'])
+        })
+        if self.journal.recovered:
+            print(f"Resuming: {self.journal.recovered} finished chunk(s) recovered from {JOURNAL_PATH}")
+        
         self.results = {
             'timestamp': datetime.now().isoformat(),
+            'seed': self.seed,
             'game': 'Halving Game',
             'simulation_results': {}
         }
@@ -356,8 +398,11 @@ class HalvingComprehensiveSimulation:
         # 3. Performance scaling
         print("\n3. PERFORMANCE SCALING ANALYSIS")
         print("-" * 50)
-        scaling_analysis = self.test_performance_scaling(list(range(10, 101, 15)), 8)
+        scaling_analysis = self.test_performance_scaling(list(range(10, 101, 15)) + [1000, 10000], 8)
         self.results['simulation_results']['scaling_analysis'] = scaling_analysis
+        if self.game_factory is HalvingGame:  # the outcome automaton covers the standard rules only
+            large_number_analysis = self.analyze_large_numbers()
+            self.results['simulation_results']['large_number_analysis'] = large_number_analysis
         
         # 4. Minimax vs Random comparison
         print("\n4. MINIMAX VS RANDOM STRATEGY")
@@ -382,16 +427,19 @@ class HalvingComprehensiveSimulation:
         
         print(f"\nOverall halving preference: {avg_halving_preference:.1f}%")
         
-        # 6. Performance metrics
-        total_time = time.time() - start_time
-        total_games = (9*40 + 5*25 + 7*8 + 5*40)  # Sum of all games
+        # 6. Performance metrics, counting the time recovered chunks took
+        # when they were first played
+        total_time = time.time() - start_time + self.journal.reused_seconds
+        total_games = (9*40 + 5*25 + 9*8 + 5*40)  # Sum of all games
         
         self.results['simulation_results']['performance_metrics'] = {
             'total_simulation_time': total_time,
             'total_games_simulated': total_games,
             'games_per_second': total_games / total_time,
             'avg_time_per_game': total_time / total_games,
-            'avg_halving_preference': avg_halving_preference
+            'avg_halving_preference': avg_halving_preference,
+            'minimax_cache': self.game_factory(1).cache_stats(),
+            'resumed_chunks': self.journal.reused
         }
         
         # Save results to JSON
@@ -404,6 +452,13 @@ class HalvingComprehensiveSimulation:
         with open(filename, 'w') as f:
             json.dump(self.results, f, indent=2, default=str)
         
+        # Results are safely written, so the next run starts from scratch
+        if self.cache is not None:
+            print(self.cache.report())
+        print(self.journal.report())
+        self.journal.close(complete=True)
+        self.journal = None
+        
         print("\n" + "=" * 60)
         print("HALVING GAME SIMULATION COMPLETE")
         print("=" * 60)
@@ -417,8 +472,29 @@ class HalvingComprehensiveSimulation:
 
 def main():
     """Main function to run the comprehensive simulation"""
-    simulation = HalvingComprehensiveSimulation()
-    results, filename = simulation.run_comprehensive_simulation()
+    parser = argparse.ArgumentParser(description="Comprehensive Halving game simulation")
+    parser.add_argument('--subtract', type=int, nargs='*', help="subtraction amounts (default: 1)")
+    parser.add_argument('--divisors', type=int, nargs='*', help="division factors (default: 2)")
+    parser.add_argument('--ceil', action='store_true', help="round divisions up")
+    parser.add_argument('--terminal', type=int, default=1, help="number the game ends at")
+    parser.add_argument('--misere', action='store_true', help="the player left without a move wins")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--no-cache', action='store_true', help="play every scenario, ignoring stored results")
+    parser.add_argument('--fresh', action='store_true', help="ignore chunks checkpointed by an interrupted run")
+    args = parser.parse_args()
+    cache = ResultCache(enabled=not args.no_cache)
+    
+    rules = RuleSet(subtract=(1,) if args.subtract is None else args.subtract,
+                    divisors=(2,) if args.divisors is None else args.divisors,
+                    rounding='ceil' if args.ceil else 'floor',
+                    terminal=args.terminal, misere=args.misere)
+    if rules == RuleSet():
+        simulation = HalvingComprehensiveSimulation(seed=args.seed, workers=args.workers, cache=cache)
+    else:
+        print(f"Rules: {rules.description()}")
+        simulation = HalvingComprehensiveSimulation(rules, seed=args.seed, workers=args.workers, cache=cache)
+    results, filename = simulation.run_comprehensive_simulation(resume=not args.fresh)
     
     print(f"\nSimulation data saved to: {filename}")
     print("This data can now be used by visualization scripts.")
@@ -2,15 +2,21 @@ import random
 import time
 import sys
 import os
+import tempfile
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../games'))
 from Halving import HalvingGame
+from halving_tablebase import HalvingTablebase
+from dedupe import distinct_starts
+from match import HalvingState, HalvingAgent, RandomAgent, play_match
 
 class HalvingSimulation:
     """
     Halving游戏模拟类，用于进行策略分析和性能测试
     """
     
-    def __init__(self):
+    def __init__(self, game_factory=HalvingGame):
+        # game_factory(initial_number) builds the game, e.g. a HalvingFamilyGame for other rule sets
+        self.game_factory = game_factory
         self.results = []
         
     def simulate_game_series(self, initial_numbers, num_games_per_number=10):
@@ -32,40 +38,32 @@ class HalvingSimulation:
         player2_wins = 0
         game_lengths = []
         move_sequences = []
+        agent = HalvingAgent()
         
-        for game_num in range(num_games):
-            game = HalvingGame(initial_number)
-            current_number = initial_number
-            current_player = 1
+        # Minimax on both sides replays the same game from a given start, so
+        # it is played once and counted num_games times
+        for _, weight in distinct_starts(num_games, [agent]):
+            game = self.game_factory(initial_number)
+            result = play_match(HalvingState(initial_number, game), agent, agent, timed=False)
             moves = []
-            
-            while current_number > 1:
-                is_maximizing = (current_player == 1)
-                _, move = game.minimax(current_number, is_maximizing)
-                
-                operation = "-1" if move == current_number - 1 else "/2"
+            current_number = initial_number
+            for player, move in result.moves:
                 moves.append({
-                    'player': current_player,
+                    'player': player,
                     'from': current_number,
                     'to': move,
-                    'operation': operation
+                    'operation': game.operation(current_number, move)
                 })
-                
                 current_number = move
-                current_player = 2 if current_player == 1 else 1
             
             # 确定获胜者
-            winner = 2 if current_player == 1 else 1
-            if winner == 1:
-                player1_wins += 1
+            if result.winner == 1:
+                player1_wins += weight
             else:
-                player2_wins += 1
+                player2_wins += weight
             
-            game_lengths.append(len(moves))
-            move_sequences.append(moves)
-            
-            if (game_num + 1) % 5 == 0:
-                print(f"  Completed {game_num + 1}/{num_games} games")
+            game_lengths.extend([len(moves)] * weight)
+            move_sequences.extend([moves] * weight)
         
         results = {
             'initial_number': initial_number,
@@ -92,20 +90,20 @@ class HalvingSimulation:
         
         for initial_num in initial_numbers:
             print(f"\n分析初始数字 {initial_num} 的策略:")
-            game = HalvingGame(initial_num)
+            game = self.game_factory(initial_num)
             
             # 分析第一步的最佳移动
             _, first_move = game.minimax(initial_num, True)
-            first_operation = "-1" if first_move == initial_num - 1 else "/2"
+            first_operation = game.operation(initial_num, first_move)
             
-            # 分析游戏的关键决策点
+            # 分析游戏的关键决策点：沿双方最优对局逐步检查
             key_decisions = []
             current_num = initial_num
-            player = 1
+            agent = HalvingAgent()
+            result = play_match(HalvingState(initial_num, game), agent, agent, timed=False)
             
-            while current_num > 1:
+            for player, move in result.moves:
                 is_maximizing = (player == 1)
-                _, move = game.minimax(current_num, is_maximizing)
                 
                 # 检查是否有多个选择
                 possible_moves = game.get_moves(current_num)
@@ -116,7 +114,7 @@ class HalvingSimulation:
                         # 模拟对手的最佳回应
                         _, opponent_move = game.minimax(possible_move, not is_maximizing)
                         move_analysis[possible_move] = {
-                            'operation': "-1" if possible_move == current_num - 1 else "/2",
+                            'operation': game.operation(current_num, possible_move),
                             'next_state': opponent_move
                         }
                     
@@ -128,7 +126,6 @@ class HalvingSimulation:
                     })
                 
                 current_num = move
-                player = 2 if player == 1 else 1
             
             strategy_analysis[initial_num] = {
                 'first_move': first_move,
@@ -149,7 +146,8 @@ class HalvingSimulation:
         
         for num in range(10, max_number + 1, step):
             print(f"测试数字: {num}")
-            game = HalvingGame(num)
+            game = self.game_factory(num)
+            game.clear_cache()  # time a cold solve, not a cache hit
             
             start_time = time.time()
             _, _ = game.minimax(num, True)
@@ -164,6 +162,40 @@ class HalvingSimulation:
         
         return performance_data
     
+    def test_tablebase_scaling(self, limits=[10**4, 10**6, 10**7], queries=1000):
+        """测试自底向上表库的构建与查询时间（不受递归深度限制）"""
+        print("测试表库构建与查询时间...")
+        
+        performance_data = []
+        
+        for limit in limits:
+            # 在临时目录中构建，避免覆盖共享目录中更大的表库
+            with tempfile.TemporaryDirectory() as directory:
+                tablebase = HalvingTablebase(limit, directory=directory)
+                start_time = time.time()
+                tablebase.build()
+                build_time = time.time() - start_time
+                tablebase.load()
+                
+                numbers = [random.randint(1, limit) for _ in range(queries)]
+                start_time = time.time()
+                for n in numbers:
+                    tablebase.best_move(n)
+                query_time = (time.time() - start_time) / queries
+                
+                performance_data.append({
+                    'number': limit,
+                    'build_time': build_time,
+                    'query_time': query_time,
+                    'player1_wins': tablebase.is_win(limit),
+                    'game_length': tablebase.distance_to_end(limit)
+                })
+                del tablebase  # 释放内存映射后再删除目录
+            
+            print(f"  1..{limit}: 构建 {build_time:.3f}秒, 单次查询 {query_time * 1e6:.1f}微秒")
+        
+        return performance_data
+    
     def compare_minimax_vs_random(self, initial_numbers, num_games=20):
         """比较Minimax算法与随机策略"""
         print("比较Minimax算法与随机策略...")
@@ -194,30 +226,20 @@ class HalvingSimulation:
         minimax_wins = 0
         random_wins = 0
         game_lengths = []
+        agent = HalvingAgent()  # Minimax玩家，先手
+        opponent = RandomAgent()  # 随机玩家
         
         for game_num in range(num_games):
-            game = HalvingGame(initial_number)
-            current_number = initial_number
-            current_player = 1  # Minimax玩家
-            
-            while current_number > 1:
-                if current_player == 1:  # Minimax玩家
-                    _, move = game.minimax(current_number, True)
-                else:  # 随机玩家
-                    possible_moves = game.get_moves(current_number)
-                    move = random.choice(possible_moves)
-                
-                current_number = move
-                current_player = 2 if current_player == 1 else 1
+            game = self.game_factory(initial_number)
+            result = play_match(HalvingState(initial_number, game), agent, opponent, timed=False)
             
             # 确定获胜者
-            winner = 2 if current_player == 1 else 1
-            if winner == 1:  # Minimax玩家获胜
+            if result.winner == 1:  # Minimax玩家获胜
                 minimax_wins += 1
             else:
                 random_wins += 1
             
-            game_lengths.append(moves)
+            game_lengths.append(result.length)
         
         return {
             'minimax_wins': minimax_wins,
@@ -250,6 +272,8 @@ def main():
     print("3. 算法性能测试")
     performance_data = simulation.test_performance_scaling(100, 20)
     print()
+    tablebase_data = simulation.test_tablebase_scaling()
+    print()
     
     # 4. 策略比较
     print("4. Minimax vs 随机策略比较")
@@ -7,7 +7,9 @@ Comprehensive simulation and analysis for the Nim game with different agent type
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../games'))
-from nim import NimGame, simulate_game, run_simulation_batch, analyze_depth_performance
+from nim import NimGame, simulate_game, run_simulation_batch, analyze_depth_performance, analyze_large_scale
+from nim_census import run_census, summarize_census
+from nim_batch import simulate_batch
 import json
 import time
 from datetime import datetime
@@ -76,44 +78,24 @@ def nim_comprehensive_simulation():
     
     results['simulation_results']['depth_analysis'] = depth_results
     
-    print("Depth\tWin Rate\tAvg Length\tAvg Nodes\tTime/Game")
-    print("-" * 55)
+    print("Depth\tWin Rate\tAvg Length\tAvg Nodes\tCutoffs\tMemo Hits\tTime/Game")
+    print("-" * 80)
     for depth, data in depth_results.items():
-        print(f"{depth}\t{data['win_rate']:.1f}%\t\t{data['avg_length']:.1f}\t\t{data['avg_nodes']:.0f}\t\t{data['avg_time_per_game']:.4f}s")
+        print(f"{depth}\t{data['win_rate']:.1f}%\t\t{data['avg_length']:.1f}\t\t{data['avg_nodes']:.0f}\t\t"
+              f"{data['avg_cutoffs']:.0f}\t{data['avg_memo_hits']:.0f}\t\t{data['avg_time_per_game']:.4f}s")
     
     # 3. Initial Configuration Analysis
     print("\n3. INITIAL CONFIGURATION ANALYSIS")
     print("-" * 60)
     
-    configurations = [
-        ([1, 2, 3], "Small piles"),
-        ([3, 4, 5], "Standard configuration"),
-        ([2, 4, 6], "Even numbers"),
-        ([1, 3, 5, 7], "Four piles"),
-        ([5, 6, 7], "Large piles"),
-        ([1, 1, 1], "Equal small piles")
-    ]
-    
-    config_analysis = {}
-    for config, description in configurations:
-        print(f"\nTesting {description}: {config}")
-        config_results = run_simulation_batch(
-            num_games=100,
-            agent1_type="nim_sum",
-            agent2_type="random",
-            initial_piles=config,
-            depth=8
-        )
-        
-        config_analysis[str(config)] = {
-            'description': description,
-            'win_rate': config_results['agent1_win_rate'],
-            'avg_length': config_results['avg_game_length'],
-            'avg_nodes': config_results['avg_nodes_per_game']
-        }
-        
-        print(f"  Win rate: {config_results['agent1_win_rate']:.1f}%")
-        print(f"  Avg length: {config_results['avg_game_length']:.1f} moves")
+    # Every configuration of up to 4 piles of at most 7 stones, with exact
+    # nim-sum vs random win probabilities instead of sampled games
+    census_rows = run_census(num_piles=4, max_pile=7)
+    config_analysis = summarize_census(census_rows)
+    for group in config_analysis.values():
+        print(f"\n{group['description']}: {group['configurations']} configurations, "
+              f"{group['p_positions']} P positions")
+        print(f"  Win rate: {group['win_rate']:.1f}% (lowest {group['min_win_rate']:.1f}%)")
     
     results['simulation_results']['configuration_analysis'] = config_analysis
     
@@ -165,16 +147,17 @@ def nim_comprehensive_simulation():
     print("\n5. STABILITY AND CONSISTENCY ANALYSIS")
     print("-" * 60)
     
-    # Run multiple smaller batches to check consistency
+    # Run multiple vectorized batches to check consistency
     batch_results = []
-    for i in range(10):  # 10 batches of 50 games each
+    for i in range(10):  # 10 batches of 100,000 games each
         print(f"Running batch {i+1}/10...")
-        batch = run_simulation_batch(
-            num_games=50,
+        batch = simulate_batch(
+            num_games=100000,
             agent1_type="nim_sum",
             agent2_type="random",
             initial_piles=[3, 4, 5],
-            depth=8
+            seed=i,
+            verbose=False
         )
         batch_results.append(batch['agent1_win_rate'])
     
@@ -232,6 +215,23 @@ def nim_comprehensive_simulation():
     
     results['simulation_results']['scaling_analysis'] = scaling_results
     
+    # 7. Large-Scale Analysis
+    print("\n7. LARGE-SCALE ANALYSIS")
+    print("-" * 60)
+    
+    large_scale_results = analyze_large_scale(
+        pile_counts=[1000, 10000, 100000],
+        max_pile=1000,
+        num_games=3
+    )
+    results['simulation_results']['large_scale_analysis'] = large_scale_results
+    
+    print("Piles\tStones\t\tWin Rate\tAvg Length\tMoves/s")
+    print("-" * 65)
+    for num_piles, data in large_scale_results.items():
+        print(f"{num_piles}\t{data['total_stones']}\t{data['win_rate']:.1f}%\t\t"
+              f"{data['avg_length']:.0f}\t\t{data['moves_per_second']:.0f}")
+    
     # Save comprehensive results
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"../../output/text/nim_comprehensive_simulation_{timestamp}.json"
@@ -246,7 +246,7 @@ def nim_comprehensive_simulation():
     print("COMPREHENSIVE SIMULATION ANALYSIS COMPLETE")
     print("=" * 80)
     print(f"Results saved to: {filename}")
-    total_simulations = 150*4 + 100*6 + 100*6 + 100*2 + 50*10 + 50*5
+    total_simulations = 150*4 + 100*6 + 100*2 + 100000*10 + 50*5 + 3*3
     print(f"Total simulations run: {total_simulations}")
     print(f"Analysis duration: {(time.time() - results_start_time):.1f} seconds")
     
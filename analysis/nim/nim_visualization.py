@@ -116,8 +116,8 @@ def create_nim_performance_analysis():
         config_win_rates = [config_data[config]['win_rate'] for config in configs]
         config_labels = [config_data[config]['description'] for config in configs]
     else:
-        config_labels = ['Small piles', 'Standard', 'Even numbers', 'Four piles']
-        config_win_rates = [100, 100, 100, 98]
+        config_labels = ['1 pile', '2 piles', '3 piles', '4 piles']
+        config_win_rates = [100.0, 92.9, 99.5, 99.1]
     
     bars3 = ax3.bar(range(len(config_labels)), config_win_rates, 
                     color=NIM_COLORS['accent'], alpha=0.8)
@@ -326,26 +326,29 @@ def create_nim_mathematical_insights():
                       Patch(facecolor=NIM_COLORS['secondary'], label='Losing Position')]
     ax1.legend(handles=legend_elements, loc='upper right')
     
-    # 2. Theoretical vs Actual Performance
-    configurations = ['Small\nPiles', 'Standard\nConfig', 'Large\nPiles', 'Four\nPiles']
-    theoretical_performance = [100, 100, 100, 100]  # Perfect play should always win
+    # 2. Forced Wins vs Exact Win Rate per pile count, from the census:
+    # against perfect play only N positions are won, while random play also
+    # gives away part of the P positions
     try:
         data = load_nim_simulation_data()
-        if 'simulation_results' in data and 'configuration_analysis' in data['simulation_results']:
-            config_data = data['simulation_results']['configuration_analysis']
-            actual_performance = [list(config_data.values())[i]['win_rate'] for i in range(min(4, len(config_data)))]
-        else:
-            actual_performance = [100, 100, 98, 99]  # Sample data
-    except:
-        actual_performance = [100, 100, 98, 99]  # Sample data
+    except FileNotFoundError:
+        data = create_sample_nim_data()
+    groups = list(data.get('simulation_results', {}).get('configuration_analysis', {}).values())
+    if not groups or not all('p_positions' in group for group in groups):
+        # Results written before the census lack the P position counts
+        groups = list(create_sample_nim_data()['simulation_results']['configuration_analysis'].values())
+    configurations = [group['description'] for group in groups]
+    theoretical_performance = [(group['configurations'] - group['p_positions']) / group['configurations'] * 100
+                               for group in groups]
+    actual_performance = [group['win_rate'] for group in groups]
     
     x = np.arange(len(configurations))
     width = 0.35
     
     bars2_1 = ax2.bar(x - width/2, theoretical_performance, width, 
-                      label='Theoretical Perfect Play', color=NIM_COLORS['primary'], alpha=0.8)
+                      label='Forced Wins (N positions)', color=NIM_COLORS['primary'], alpha=0.8)
     bars2_2 = ax2.bar(x + width/2, actual_performance, width, 
-                      label='Actual Performance', color=NIM_COLORS['secondary'], alpha=0.8)
+                      label='Exact Win Rate vs Random', color=NIM_COLORS['secondary'], alpha=0.8)
     
     for bars in [bars2_1, bars2_2]:
         for bar in bars:
@@ -353,12 +356,12 @@ def create_nim_mathematical_insights():
             ax2.text(bar.get_x() + bar.get_width()/2, height + 0.5,
                     f'{height:.1f}%', ha='center', va='bottom', fontsize=9)
     
-    ax2.set_title('Theoretical vs Actual Performance', fontweight='bold')
+    ax2.set_title('Forced Wins vs Exact Win Rate by Pile Count', fontweight='bold')
     ax2.set_ylabel('Win Rate (%)')
     ax2.set_xticks(x)
     ax2.set_xticklabels(configurations)
-    ax2.legend()
-    ax2.set_ylim(95, 105)
+    ax2.legend(loc='lower right')
+    ax2.set_ylim(0, 110)
     ax2.grid(axis='y', alpha=0.3)
     
     # 3. Complexity Analysis
@@ -452,11 +455,15 @@ def create_sample_nim_data():
                 '8': {'win_rate': 100, 'avg_nodes': 3200},
                 '10': {'win_rate': 100, 'avg_nodes': 12800}
             },
-            'configuration_analysis': {
-                '[1, 2, 3]': {'description': 'Small piles', 'win_rate': 100},
-                '[3, 4, 5]': {'description': 'Standard', 'win_rate': 100},
-                '[2, 4, 6]': {'description': 'Even numbers', 'win_rate': 100},
-                '[1, 3, 5, 7]': {'description': 'Four piles', 'win_rate': 98}
+            'configuration_analysis': {  # nim_census up to 4 piles of 7 stones
+                '1': {'description': '1 pile', 'configurations': 7, 'p_positions': 0,
+                      'win_rate': 100.0, 'min_win_rate': 100.0},
+                '2': {'description': '2 piles', 'configurations': 28, 'p_positions': 7,
+                      'win_rate': 92.9, 'min_win_rate': 0.0},
+                '3': {'description': '3 piles', 'configurations': 84, 'p_positions': 7,
+                      'win_rate': 99.5, 'min_win_rate': 80.0},
+                '4': {'description': '4 piles', 'configurations': 210, 'p_positions': 35,
+                      'win_rate': 99.1, 'min_win_rate': 0.0}
             },
             'strategy_comparison': {
                 'minimax_only': {'win_rate': 85, 'avg_nodes': 5000},
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for simulation scenario results
+A scenario is keyed on its game, agents, parameters, game count, seed and a hash
+of the engine sources it runs, so unchanged scenarios load from disk instead of
+being played again
+"""
+
+import os
+import json
+import glob
+import hashlib
+import argparse
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+CACHE_DIR = os.path.join(ROOT, 'output/cache/results')
+
+# Engine sources per game, relative to the repository root
+ENGINE_SOURCES = {
+    'tic_tac_toe': ['games/tic_tac_toe.py'],
+    'connect4': ['games/connect4/connect4.py', 'games/connect4/test.pyx'],
+    'halving': ['games/Halving.py', 'games/halving_family.py'],
+    'nim': ['games/nim.py'],
+    'mnk': ['games/mnk_game.py'],
+}
+# Shared by every game: the state adapters, the match loop and the search engine
+COMMON_SOURCES = ['games/match.py', 'games/search/negamax.py', 'games/search/table.py']
+
+def engine_hash(game, sources=()):
+    """SHA-256 over the engine sources of game plus any extra sources"""
+    digest = hashlib.sha256()
+    for path in sorted(set(ENGINE_SOURCES.get(game, []) + COMMON_SOURCES + list(sources))):
+        digest.update(path.encode())
+        full_path = os.path.join(ROOT, path)
+        if os.path.exists(full_path):
+            with open(full_path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+class ResultCache:
+    """On-disk scenario results, one JSON file per key under directory/<game>/"""
+
+    def __init__(self, directory=CACHE_DIR, enabled=True):
+        self.directory = directory
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def spec(self, game, agents, params=None, num_games=None, seed=None, sources=()):
+        """Everything a scenario's result depends on; sources are extra files
+        (e.g. the script playing it) hashed along with the game's engine"""
+        return {
+            'game': game,
+            'agents': list(agents),
+            'params': params or {},
+            'num_games': num_games,
+            'seed': seed,
+            'sources': sorted(sources),
+            'engine': engine_hash(game, sources)
+        }
+
+    @staticmethod
+    def key(spec):
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+    def path(self, spec):
+        return os.path.join(self.directory, spec['game'], f'{self.key(spec)}.json')
+
+    def get(self, spec):
+        """Stored result for spec, or None; counts a hit or a miss"""
+        path = self.path(spec)
+        if self.enabled and os.path.exists(path):
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            self.hits += 1
+            return entry['result']
+        self.misses += 1
+        return None
+
+    def put(self, spec, result):
+        """Store result (JSON-serializable) for spec and return it as it will
+        load back, so fresh and cached results look the same to callers"""
+        result = json.loads(json.dumps(result))
+        if self.enabled:
+            path = self.path(spec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'w') as f:
+                json.dump({'spec': spec, 'created': datetime.now().isoformat(), 'result': result}, f)
+            os.replace(path + '.tmp', path)
+        return result
+
+    def cached(self, spec, compute):
+        """Result of compute() for spec, loaded from disk when present"""
+        result = self.get(spec)
+        if result is None:
+            result = self.put(spec, compute())
+        return result
+
+    def report(self):
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0.0
+        return f"Result cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate)"
+
+# ---- maintenance ----
+def entries(directory=CACHE_DIR, game=None):
+    """(path, entry) for every stored result, optionally of one game"""
+    pattern = os.path.join(directory, game or '*', '*.json')
+    for path in sorted(glob.glob(pattern)):
+        with open(path, 'r') as f:
+            yield path, json.load(f)
+
+def invalidate(directory=CACHE_DIR, game=None, stale_only=False):
+    """Delete stored results (of one game, or only those whose engine sources
+    have changed since); returns the number removed"""
+    removed = 0
+    for path, entry in list(entries(directory, game)):
+        spec = entry['spec']
+        if stale_only and engine_hash(spec['game'], spec['sources']) == spec['engine']:
+            continue
+        os.remove(path)
+        removed += 1
+    return removed
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or invalidate cached simulation results")
+    parser.add_argument('command', choices=['stats', 'list', 'clear'])
+    parser.add_argument('--game', help="only this game (tic_tac_toe, connect4, halving, nim)")
+    parser.add_argument('--stale', action='store_true', help="with clear: only results whose engine changed")
+    parser.add_argument('--dir', default=CACHE_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'clear':
+        removed = invalidate(args.dir, args.game, args.stale)
+        print(f"Removed {removed} cached result(s)")
+        return
+
+    counts = {}
+    for path, entry in entries(args.dir, args.game):
+        spec = entry['spec']
+        counts[spec['game']] = counts.get(spec['game'], 0) + 1
+        if args.command == 'list':
+            print(f"{os.path.basename(path)[:16]}  {spec['game']:<12} {' vs '.join(spec['agents']):<24} "
+                  f"games={spec['num_games']} seed={spec['seed']} {entry['created']}")
+    for game, count in sorted(counts.items()):
+        print(f"{game:<12} {count} cached result(s)")
+    if not counts:
+        print("No cached results")
+
+if __name__ == "__main__":
+    main()
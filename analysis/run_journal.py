@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Append-only checkpoint journal for long simulation runs
+Each finished unit of work (a chunk of games, one depth, ...) is appended as one
+JSON line and flushed to disk, so an interrupted run resumes where it stopped
+"""
+
+import os
+import json
+import time
+
+class RunJournal:
+    """Journal of key -> value checkpoints in a JSON-lines file.
+
+    The first line holds the run's spec; a journal written for a different
+    spec is moved aside to <path>.old and a fresh one started. Every record
+    is flushed and fsynced before record() returns, and a half-written last
+    line (the process died mid-write) is ignored on load. Keys and values
+    must be JSON-serializable; keys are compared by their JSON form. The time
+    each checkpoint took is kept, so a resumed run can report its full cost."""
+
+    def __init__(self, path, spec=None):
+        self.path = path
+        self.spec = spec
+        self.entries = {}
+        self.seconds = {}
+        self.reused = 0
+        self.reused_seconds = 0.0
+        self._load()
+        self.recovered = len(self.entries)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        new_file = not os.path.exists(path)
+        self._file = open(path, 'a')
+        if new_file:
+            self._write({'spec': spec})
+
+    @staticmethod
+    def _key(key):
+        return json.dumps(key, sort_keys=True)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            lines = f.read().split('\n')
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break  # Cut short by a crash: everything after it is lost anyway
+        if not records or records[0].get('spec') != json.loads(json.dumps(self.spec)):
+            os.replace(self.path, self.path + '.old')
+            return
+        for record in records[1:]:
+            key = self._key(record['key'])
+            self.entries[key] = record['value']
+            self.seconds[key] = record.get('seconds', 0.0)
+        if len(records) < len([line for line in lines if line]):
+            # Rewrite without the broken tail so new records start on a clean line
+            with open(self.path, 'w') as f:
+                for record in records:
+                    f.write(json.dumps(record) + '\n')
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def __contains__(self, key):
+        return self._key(key) in self.entries
+
+    def get(self, key):
+        return self.entries.get(self._key(key))
+
+    def record(self, key, value, seconds=0.0):
+        """Checkpoint value for key; returns it as a resumed run will load it"""
+        value = json.loads(json.dumps(value))
+        self.entries[self._key(key)] = value
+        self.seconds[self._key(key)] = seconds
+        self._write({'key': key, 'value': value, 'seconds': seconds})
+        return value
+
+    def reuse(self, key):
+        """Checkpointed value for key, counted as recovered work, or None"""
+        if key not in self:
+            return None
+        self.reused += 1
+        self.reused_seconds += self.seconds[self._key(key)]
+        return self.get(key)
+
+    def run(self, key, compute):
+        """Value for key from the journal, or compute() and checkpoint it"""
+        if key in self:
+            return self.reuse(key)
+        start_time = time.time()
+        value = compute()
+        return self.record(key, value, time.time() - start_time)
+
+    def report(self):
+        if not self.recovered:
+            return f"Journal {self.path}: starting fresh"
+        report = f"Journal {self.path}: {self.reused} of {self.recovered} recovered checkpoint(s) reused"
+        if self.reused_seconds:
+            report += f", {self.reused_seconds:.1f}s of earlier work skipped"
+        return report
+
+    def close(self, complete=False):
+        """Close the journal; a complete run deletes it so the next run starts fresh"""
+        self._file.close()
+        if complete and os.path.exists(self.path):
+            os.remove(self.path)
@@ -9,68 +9,53 @@ import os
 import json
 import time
 import random
+import argparse
 from datetime import datetime
 
 # Import the TicTacToe game
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../games'))
-from tic_tac_toe import TicTacToe, PLAYER_X, PLAYER_O, DRAW
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from tic_tac_toe import TicTacToe
+from tournament import GAMES_PER_CHUNK, run_tournament, move_times
+from result_cache import ResultCache, engine_hash
+from run_journal import RunJournal
+
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../output/cache/tic_tac_toe_comprehensive_journal.jsonl')
 
 class TicTacToeSimulation:
-    """Comprehensive simulation class for Tic-Tac-Toe"""
+    """Comprehensive simulation class for Tic-Tac-Toe. Its game sweeps run
+    through tournament.run_tournament, which takes the seed and workers"""
     
-    def __init__(self):
+    def __init__(self, seed=0, workers=None, cache=None):
+        self.seed = seed
+        self.workers = workers
+        self.cache = cache  # ResultCache for whole scenarios, or None to play them all
         self.results = {}
+        self.journal = None  # RunJournal while run_comprehensive_simulation runs
+    
+    def run_scenarios(self, scenarios):
+        """Play tournament scenarios on the process pool; results by name"""
+        results, _ = run_tournament(scenarios, self.seed, self.workers, GAMES_PER_CHUNK, self.cache, self.journal)
+        return results
     
     def simulate_agent_vs_random(self, num_games=100):
         """Simulate agent vs random player (≥100 games)"""
         print(f"Running Agent vs Random simulation ({num_games} games)...")
         
-        agent_wins = 0
-        random_wins = 0
-        draws = 0
-        game_lengths = []
-        agent_move_times = []
-        
-        for game_num in range(num_games):
-            game = TicTacToe()
-            moves = 0
-            
-            while not game.game_over:
-                moves += 1
-                
-                if game.player == PLAYER_X:  # Agent's turn
-                    start_time = time.time()
-                    row, col = game.find_best_move()
-                    move_time = time.time() - start_time
-                    agent_move_times.append(move_time)
-                    game.make_move(row, col)
-                else:  # Random player's turn
-                    available_moves = game.get_available_moves()
-                    if available_moves:
-                        row, col = random.choice(available_moves)
-                        game.make_move(row, col)
-            
-            game_lengths.append(moves)
-            
-            if game.winner == PLAYER_X:
-                agent_wins += 1
-            elif game.winner == PLAYER_O:
-                random_wins += 1
-            else:
-                draws += 1
-            
-            if (game_num + 1) % 20 == 0:
-                print(f"  Completed {game_num + 1}/{num_games} games")
+        name = 'tic_tac_toe_comprehensive_agent_vs_random'
+        played = self.run_scenarios([(name, 'tic_tac_toe', 'agent', 'random', {'record_games': True}, num_games)])[name]
+        game_lengths = [length for _, length, _ in played['games']]
+        agent_move_times = move_times(played, 1)
         
         results = {
-            'agent_wins': agent_wins,
-            'random_wins': random_wins,
-            'draws': draws,
+            'agent_wins': played['agent1_wins'],
+            'random_wins': played['agent2_wins'],
+            'draws': played['draws'],
             'total_games': num_games,
-            'agent_win_rate': (agent_wins / num_games) * 100,
-            'random_win_rate': (random_wins / num_games) * 100,
-            'draw_rate': (draws / num_games) * 100,
-            'avg_game_length': sum(game_lengths) / len(game_lengths),
+            'agent_win_rate': played['agent1_win_rate'],
+            'random_win_rate': played['agent2_win_rate'],
+            'draw_rate': played['draw_rate'],
+            'avg_game_length': played['avg_moves'],
             'avg_agent_move_time': sum(agent_move_times) / len(agent_move_times) if agent_move_times else 0,
             'game_lengths': game_lengths
         }
@@ -86,45 +71,25 @@ class TicTacToeSimulation:
         """Simulate agent vs agent games"""
         print(f"Running Agent vs Agent simulation ({num_games} games)...")
         
-        x_wins = 0
-        o_wins = 0
-        draws = 0
-        game_lengths = []
-        total_computation_time = 0
-        
-        for game_num in range(num_games):
-            game = TicTacToe()
-            moves = 0
-            game_start_time = time.time()
-            
-            while not game.game_over:
-                moves += 1
-                row, col = game.find_best_move()
-                game.make_move(row, col)
-            
-            total_computation_time += time.time() - game_start_time
-            game_lengths.append(moves)
-            
-            if game.winner == PLAYER_X:
-                x_wins += 1
-            elif game.winner == PLAYER_O:
-                o_wins += 1
-            else:
-                draws += 1
-            
-            if (game_num + 1) % 20 == 0:
-                print(f"  Completed {game_num + 1}/{num_games} games")
+        # Both sides play find_best_move from the empty board, so every game
+        # is the same: the runner plays it once (its workers load the lookup
+        # table first, so it is not a cold start) and counts it for every
+        # game of the scenario. Only the played game is timed.
+        name = 'tic_tac_toe_comprehensive_agent_vs_agent'
+        played = self.run_scenarios([(name, 'tic_tac_toe', 'agent', 'agent', {'record_games': True}, num_games)])[name]
+        game_lengths = [length for _, length, _ in played['games']]
+        game_times = [sum(game[0]) + sum(game[1]) for game in played['timings']['games'] if game is not None]
         
         results = {
-            'x_wins': x_wins,
-            'o_wins': o_wins,
-            'draws': draws,
+            'x_wins': played['agent1_wins'],
+            'o_wins': played['agent2_wins'],
+            'draws': played['draws'],
             'total_games': num_games,
-            'x_win_rate': (x_wins / num_games) * 100,
-            'o_win_rate': (o_wins / num_games) * 100,
-            'draw_rate': (draws / num_games) * 100,
-            'avg_game_length': sum(game_lengths) / len(game_lengths),
-            'avg_computation_time': total_computation_time / num_games,
+            'x_win_rate': played['agent1_win_rate'],
+            'o_win_rate': played['agent2_win_rate'],
+            'draw_rate': played['draw_rate'],
+            'avg_game_length': played['avg_moves'],
+            'avg_computation_time': sum(game_times) / len(game_times),
             'game_lengths': game_lengths
         }
         
@@ -140,115 +105,76 @@ class TicTacToeSimulation:
         print(f"Testing search depth performance...")
         
         depth_results = {}
-        
-        for depth in depths:
-            print(f"  Testing depth {depth}...")
-            
-            agent_wins = 0
-            random_wins = 0
-            draws = 0
-            move_times = []
-            
-            for game_num in range(games_per_depth):
-                game = TicTacToe()
-                
-                while not game.game_over:
-                    if game.player == PLAYER_X:  # Agent with limited depth
-                        start_time = time.time()
-                        row, col = self.find_best_move_with_depth(game, depth)
-                        move_time = time.time() - start_time
-                        move_times.append(move_time)
-                        game.make_move(row, col)
-                    else:  # Random player
-                        available_moves = game.get_available_moves()
-                        if available_moves:
-                            row, col = random.choice(available_moves)
-                            game.make_move(row, col)
-                
-                if game.winner == PLAYER_X:
-                    agent_wins += 1
-                elif game.winner == PLAYER_O:
-                    random_wins += 1
-                else:
-                    draws += 1
+        # The agent searches its move plus depth replies on the shared
+        # negamax engine (match.TicTacToeSearchAgent)
+        scenarios = [(f'tic_tac_toe_comprehensive_depth{depth}_vs_random', 'tic_tac_toe', 'search', 'random',
+                      {'depth1': depth}, games_per_depth) for depth in depths]
+        results = self.run_scenarios(scenarios)
+        
+        for depth, scenario in zip(depths, scenarios):
+            played = results[scenario[0]]
+            agent_move_times = move_times(played, 1)
+            stats = played['agent_stats'][0]
+            searches = stats.get('searches', 0)
             
             depth_results[depth] = {
-                'agent_wins': agent_wins,
-                'random_wins': random_wins,
-                'draws': draws,
-                'agent_win_rate': (agent_wins / games_per_depth) * 100,
-                'avg_move_time': sum(move_times) / len(move_times) if move_times else 0,
+                'agent_wins': played['agent1_wins'],
+                'random_wins': played['agent2_wins'],
+                'draws': played['draws'],
+                'agent_win_rate': played['agent1_win_rate'],
+                'avg_move_time': sum(agent_move_times) / len(agent_move_times) if agent_move_times else 0,
+                'avg_nodes_per_move': stats.get('nodes', 0) / searches if searches else 0,
                 'total_games': games_per_depth
             }
             
-            print(f"    Depth {depth}: {depth_results[depth]['agent_win_rate']:.1f}% win rate, {depth_results[depth]['avg_move_time']:.4f}s avg time")
+            print(f"    Depth {depth}: {depth_results[depth]['agent_win_rate']:.1f}% win rate, "
+                  f"{depth_results[depth]['avg_move_time']:.4f}s avg time, "
+                  f"{depth_results[depth]['avg_nodes_per_move']:.0f} nodes/move")
         
         return depth_results
     
-    def find_best_move_with_depth(self, game, max_depth):
-        """Find best move with limited search depth"""
-        if game.cnt == 0 and game.board[1][1] == 0:  # First move, take center
-            return (1, 1)
-        
-        best_val = float('-inf') if game.player == PLAYER_X else float('inf')
-        best_move = (-1, -1)
-        
-        for i in range(3):
-            for j in range(3):
-                if game.board[i][j] == 0:  # Empty cell
-                    game.board[i][j] = game.player
-                    move_val = self.minimax_with_depth(game, 0, max_depth, game.player == PLAYER_O)
-                    game.board[i][j] = 0  # Undo move
-                    
-                    if game.player == PLAYER_X:
-                        if move_val > best_val:
-                            best_move = (i, j)
-                            best_val = move_val
-                    else:
-                        if move_val < best_val:
-                            best_move = (i, j)
-                            best_val = move_val
-        
-        return best_move
-    
-    def minimax_with_depth(self, game, depth, max_depth, is_maximizing, alpha=float('-inf'), beta=float('inf')):
-        """Minimax with depth limit"""
-        score = game.evaluate_board()
-        
-        # Terminal state or depth limit reached
-        if score == 10:
-            return score - depth
-        if score == -10:
-            return score + depth
-        if len(game.get_available_moves()) == 0:
-            return 0
-        if depth >= max_depth:
-            return 0  # Neutral evaluation at depth limit
-        
-        if is_maximizing:
-            best = float('-inf')
-            for i in range(3):
-                for j in range(3):
-                    if game.board[i][j] == 0:
-                        game.board[i][j] = PLAYER_X
-                        best = max(best, self.minimax_with_depth(game, depth + 1, max_depth, False, alpha, beta))
-                        game.board[i][j] = 0
-                        alpha = max(alpha, best)
-                        if beta <= alpha:
-                            break
-            return best
-        else:
-            best = float('inf')
-            for i in range(3):
-                for j in range(3):
-                    if game.board[i][j] == 0:
-                        game.board[i][j] = PLAYER_O
-                        best = min(best, self.minimax_with_depth(game, depth + 1, max_depth, True, alpha, beta))
-                        game.board[i][j] = 0
-                        beta = min(beta, best)
-                        if beta <= alpha:
-                            break
-            return best
+    def test_mnk_depth_performance(self, boards=[(4, 4, 3), (5, 5, 4)], depths=[1, 2, 3, 4], games_per_depth=20):
+        """Depth performance on larger m,n,k boards, where search cost actually grows"""
+        print(f"Testing m,n,k search depth performance...")
+        
+        board_results = {}
+        
+        scenarios = {(m, n, k, depth): (f'tic_tac_toe_comprehensive_mnk{m}x{n}_k{k}_depth{depth}_vs_random', 'mnk',
+                                        'ai', 'random', {'board': [m, n, k], 'depth1': depth}, games_per_depth)
+                     for m, n, k in boards for depth in depths}
+        results = self.run_scenarios(list(scenarios.values()))
+        
+        for m, n, k in boards:
+            board_key = f"{m}x{n}_k{k}"
+            print(f"  Board {m}x{n}, {k} in a row...")
+            depth_results = {}
+            
+            for depth in depths:
+                played = results[scenarios[m, n, k, depth][0]]
+                agent_move_times = move_times(played, 1)
+                stats = played['agent_stats'][0]
+                nodes = stats.get('nodes', 0)
+                tt_hits = stats.get('tt_hits', 0)
+                searches = stats.get('searches', 0)
+                
+                depth_results[depth] = {
+                    'agent_wins': played['agent1_wins'],
+                    'random_wins': played['agent2_wins'],
+                    'draws': played['draws'],
+                    'agent_win_rate': played['agent1_win_rate'],
+                    'avg_move_time': sum(agent_move_times) / len(agent_move_times) if agent_move_times else 0,
+                    'avg_nodes_per_move': nodes / searches if searches else 0,
+                    'avg_tt_hits_per_move': tt_hits / searches if searches else 0,
+                    'total_games': games_per_depth
+                }
+                
+                result = depth_results[depth]
+                print(f"    Depth {depth}: {result['agent_win_rate']:.1f}% win rate, "
+                      f"{result['avg_move_time']:.4f}s avg time, {result['avg_nodes_per_move']:.0f} nodes/move")
+            
+            board_results[board_key] = depth_results
+        
+        return board_results
     
     def analyze_opening_moves(self, num_games=100):
         """Analyze opening move preferences"""
@@ -259,6 +185,7 @@ class TicTacToeSimulation:
             'random': []
         }
         
+        rng = random.Random(self.seed)
         for game_num in range(num_games):
             game = TicTacToe()
             
@@ -271,7 +198,7 @@ class TicTacToeSimulation:
             if not game.game_over:
                 available_moves = game.get_available_moves()
                 if available_moves:
-                    row, col = random.choice(available_moves)
+                    row, col = rng.choice(available_moves)
                     opening_moves['random'].append((row, col))
         
         # Calculate distributions
@@ -288,16 +215,29 @@ class TicTacToeSimulation:
         
         return opening_distribution
     
-    def run_comprehensive_simulation(self):
-        """Run all simulations and collect comprehensive data"""
+    def run_comprehensive_simulation(self, resume=True):
+        """Run all simulations and collect comprehensive data. Finished chunks
+        of games are checkpointed to a run journal, so a crashed or
+        interrupted run picks up where it stopped; resume=False discards it."""
         print("=" * 60)
         print("COMPREHENSIVE TIC-TAC-TOE SIMULATION")
         print("=" * 60)
         
         start_time = time.time()
         
+        if not resume and os.path.exists(JOURNAL_PATH):
+            os.remove(JOURNAL_PATH)
+        # Chunks are only reusable with the engine and this script as they were
+        self.journal = RunJournal(JOURNAL_PATH, {
+            'script': 'tic_tac_toe_comprehensive_simulation',
+            'engine': engine_hash('tic_tac_toe', ['analysis/tic_tac_toe/tic_tac_toe_comprehensive_simulation.py', 'games/mnk_game.py'])
+        })
+        if self.journal.recovered:
+            print(f"Resuming: {self.journal.recovered} finished chunk(s) recovered from {JOURNAL_PATH}")
+        
         self.results = {
             'timestamp': datetime.now().isoformat(),
+            'seed': self.seed,
             'game': 'Tic-Tac-Toe',
             'simulation_results': {}
         }
@@ -320,8 +260,14 @@ class TicTacToeSimulation:
         depth_performance = self.test_search_depth_performance([1, 2, 3, 4, 5, 6], 50)
         self.results['simulation_results']['depth_performance'] = depth_performance
         
-        # 4. Opening move analysis
-        print("\n4. OPENING MOVE ANALYSIS")
+        # 4. Search depth performance on larger m,n,k boards
+        print("\n4. M,N,K BOARD DEPTH PERFORMANCE")
+        print("-" * 40)
+        mnk_performance = self.test_mnk_depth_performance([(4, 4, 3), (5, 5, 4)], [1, 2, 3, 4], 20)
+        self.results['simulation_results']['mnk_depth_performance'] = mnk_performance
+        
+        # 5. Opening move analysis
+        print("\n5. OPENING MOVE ANALYSIS")
         print("-" * 40)
         opening_analysis = self.analyze_opening_moves(100)
         self.results['simulation_results']['opening_analysis'] = opening_analysis
@@ -331,15 +277,17 @@ class TicTacToeSimulation:
         most_common_opening = max(agent_opening.items(), key=lambda x: x[1]['count'])
         print(f"  Most common agent opening: {most_common_opening[0]} ({most_common_opening[1]['percentage']:.1f}%)")
         
-        # 5. Performance metrics
-        total_time = time.time() - start_time
-        total_games = (150 + 100 + 6*50 + 100)  # Sum of all games
+        # 6. Performance metrics, counting the time recovered chunks took
+        # when they were first played
+        total_time = time.time() - start_time + self.journal.reused_seconds
+        total_games = (150 + 100 + 6*50 + 2*4*20 + 100)  # Sum of all games
         
         self.results['simulation_results']['performance_metrics'] = {
             'total_simulation_time': total_time,
             'total_games_simulated': total_games,
             'games_per_second': total_games / total_time,
-            'avg_time_per_game': total_time / total_games
+            'avg_time_per_game': total_time / total_games,
+            'resumed_chunks': self.journal.reused
         }
         
         # Save results to JSON
@@ -352,6 +300,13 @@ class TicTacToeSimulation:
         with open(filename, 'w') as f:
             json.dump(self.results, f, indent=2, default=str)
         
+        # Results are safely written, so the next run starts from scratch
+        if self.cache is not None:
+            print(self.cache.report())
+        print(self.journal.report())
+        self.journal.close(complete=True)
+        self.journal = None
+        
         print("\n" + "=" * 60)
         print("TIC-TAC-TOE SIMULATION COMPLETE")
         print("=" * 60)
@@ -364,8 +319,16 @@ class TicTacToeSimulation:
 
 def main():
     """Main function to run the comprehensive simulation"""
-    simulation = TicTacToeSimulation()
-    results, filename = simulation.run_comprehensive_simulation()
+    parser = argparse.ArgumentParser(description="Comprehensive Tic-Tac-Toe simulation")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--no-cache', action='store_true', help="play every scenario, ignoring stored results")
+    parser.add_argument('--fresh', action='store_true', help="ignore chunks checkpointed by an interrupted run")
+    args = parser.parse_args()
+    cache = ResultCache(enabled=not args.no_cache)
+    
+    simulation = TicTacToeSimulation(seed=args.seed, workers=args.workers, cache=cache)
+    results, filename = simulation.run_comprehensive_simulation(resume=not args.fresh)
     
     print(f"\nSimulation data saved to: {filename}")
     print("This data can now be used by visualization scripts.")
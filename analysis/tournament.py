@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Parallel tournament runner for Tic-Tac-Toe, Connect4, Halving and Nim
+Splits every scenario into fixed-size chunks of games and runs them on a process pool;
+the comprehensive simulation scripts play their game sweeps through it too
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import zlib
+import hashlib
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../games'))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../games/connect4'))
+from result_cache import ResultCache, engine_hash
+from run_journal import RunJournal
+from dedupe import distinct_starts
+import nim
+from Halving import HalvingGame
+from halving_family import RuleSet, HalvingFamilyGame
+from mnk_game import MNKGame
+from tic_tac_toe import load_lookup_table
+from match import (play_match, TicTacToeState, MNKState, NimState, HalvingState, ConnectFourState,
+                   RandomAgent, TicTacToeAgent, TicTacToeSearchAgent, MNKAgent, NimAgent, HalvingAgent,
+                   ConnectFourAgent)
+
+GAMES_PER_CHUNK = 25
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../output/text')
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../output/cache/tournament_journal.jsonl')
+
+# (name, game, agent1, agent2, params, num_games); agent 1 is player 1. The
+# comprehensive simulation scripts build their own scenario lists and run
+# them with run_tournament; these are the runner's standalone sweeps.
+DEFAULT_SCENARIOS = [
+    ('ttt_agent_vs_random', 'tic_tac_toe', 'agent', 'random', {}, 200),
+    ('ttt_random_vs_agent', 'tic_tac_toe', 'random', 'agent', {}, 200),
+    ('ttt_random_vs_random', 'tic_tac_toe', 'random', 'random', {}, 200),
+    ('c4_depth2_vs_random', 'connect4', 'ai', 'random', {'depth1': 2}, 75),
+    ('c4_depth4_vs_random', 'connect4', 'ai', 'random', {'depth1': 4}, 75),
+    ('c4_depth6_vs_random', 'connect4', 'ai', 'random', {'depth1': 6}, 75),
+    ('c4_depth8_vs_random', 'connect4', 'ai', 'random', {'depth1': 8}, 75),
+    ('c4_depth10_vs_random', 'connect4', 'ai', 'random', {'depth1': 10}, 75),
+    ('c4_depth8_vs_depth6', 'connect4', 'ai', 'ai', {'depth1': 8, 'depth2': 6}, 40),
+    ('c4_depth8_vs_depth4', 'connect4', 'ai', 'ai', {'depth1': 8, 'depth2': 4}, 40),
+    ('c4_depth6_vs_depth4', 'connect4', 'ai', 'ai', {'depth1': 6, 'depth2': 4}, 40),
+    ('c4_depth10_vs_depth6', 'connect4', 'ai', 'ai', {'depth1': 10, 'depth2': 6}, 40),
+    ('c4_100k_vs_10k_nodes', 'connect4', 'ai', 'ai', {'nodes1': 100000, 'nodes2': 10000}, 50),
+    ('halving_10_minimax_vs_random', 'halving', 'minimax', 'random', {'start': 10}, 100),
+    ('halving_50_minimax_vs_random', 'halving', 'minimax', 'random', {'start': 50}, 100),
+    ('halving_100_minimax_vs_random', 'halving', 'minimax', 'random', {'start': 100}, 100),
+    ('halving_50_random_vs_random', 'halving', 'random', 'random', {'start': 50}, 100),
+    ('nim_357_nim_sum_vs_random', 'nim', 'nim_sum', 'random', {'piles': [3, 5, 7]}, 200),
+    ('nim_357_minimax_vs_random', 'nim', 'minimax', 'random', {'piles': [3, 5, 7], 'depth': 8}, 200),
+    ('nim_357_1k_nodes_vs_random', 'nim', 'minimax', 'random', {'piles': [3, 5, 7], 'depth': 15, 'nodes1': 1000}, 200),
+    ('nim_12345_nim_sum_vs_random', 'nim', 'nim_sum', 'random', {'piles': [1, 2, 3, 4, 5]}, 200),
+    ('nim_357_random_vs_random', 'nim', 'random', 'random', {'piles': [3, 5, 7]}, 200),
+]
+
+# ---- single games on the shared match loop ----
+def make_agent(game, agent, params, side):
+    # params: 'depth1'/'depth2' for Connect4, m,n,k and Tic-Tac-Toe 'search'
+    # depths, 'nodes1'/'nodes2' for node budgets per move (which replace the
+    # depth), 'depth' for Nim minimax
+    if agent == 'random':
+        return RandomAgent()
+    max_nodes = params.get(f'nodes{side}')
+    if game == 'tic_tac_toe':
+        return TicTacToeSearchAgent(params[f'depth{side}']) if agent == 'search' else TicTacToeAgent()
+    if game == 'mnk':
+        return MNKAgent(params.get(f'depth{side}'))
+    if game == 'connect4':
+        return ConnectFourAgent(params.get(f'depth{side}', 8), max_nodes=max_nodes)
+    if game == 'halving':
+        return HalvingAgent()
+    return NimAgent(params.get('depth', 8), use_nim_sum=agent == 'nim_sum', max_nodes=max_nodes)
+
+def make_state(game, params, start=None):
+    # params: 'board' [m, n, k] for m,n,k games, 'start' and optionally
+    # 'rules' (RuleSet.to_dict()) for Halving, 'piles' for Nim. start is a
+    # drawn start from draw_start (Connect4's first player), else drawn here
+    if game == 'tic_tac_toe':
+        return TicTacToeState()
+    if game == 'mnk':
+        return MNKState(MNKGame(*params['board']))
+    if game == 'connect4':
+        from connect4 import ConnectFour
+        # ConnectFour() reseeds the global RNG from the OS; keep the chunk's stream
+        state = random.getstate()
+        board = ConnectFour()
+        random.setstate(state)
+        board.current_player = start if start is not None else random.choice(['X', 'O'])
+        return ConnectFourState(board)
+    if game == 'halving':
+        if 'rules' in params:
+            return HalvingState(params['start'], HalvingFamilyGame(params['start'], RuleSet(**params['rules'])))
+        return HalvingState(params['start'])
+    return NimState(params['piles'])
+
+def draw_start(game, rng):
+    # The random part of a game's setup as drawn by make_state, for
+    # distinct_starts; None when every game of the scenario starts alike
+    if game == 'connect4':
+        return lambda: rng.choice(['X', 'O'])
+    return None
+
+# ---- workers ----
+def warmup(games):
+    """Process-pool initializer: load tables and extensions once per worker"""
+    if 'tic_tac_toe' in games:
+        load_lookup_table()
+    if 'connect4' in games:
+        import test as c4f
+        c4f.find_best(0, 0, 2)
+    if 'halving' in games:
+        HalvingGame(2).minimax(2, True)
+
+def run_chunk(task):
+    """Play one chunk of a scenario from its own seed. Returns the chunk's
+    integer totals and, next to them, its timings: 'games' has one entry per
+    game, [agent1 move times, agent2 move times], or None for a game that
+    was a replay, and 'seconds' the chunk's wall time. A chunk of a
+    deterministic scenario carries its distinct starts with their weights
+    (see make_tasks): each start is played once and its result counted weight
+    times. With params['record_games'] the totals also keep
+    [winner, length, [[player, move], ...]] for every game."""
+    index, game, agent1, agent2, params, num_games, seed_state, starts = task
+    random.seed(int.from_bytes(np.asarray(seed_state, dtype=np.uint32).tobytes(), 'little'))
+    # The Nim transposition table carries over between games; start each
+    # chunk empty so node counts do not depend on which worker ran it
+    nim.transposition_table.clear()
+
+    totals = {'agent1_wins': 0, 'agent2_wins': 0, 'draws': 0, 'total_moves': 0, 'total_nodes': 0,
+              'length_counts': {}, 'agent_stats': [{}, {}]}
+    if params.get('record_games'):
+        totals['games'] = []
+    timings = {'games': [], 'seconds': 0.0}
+    start_time = time.perf_counter()
+    agents = (make_agent(game, agent1, params, 1), make_agent(game, agent2, params, 2))
+    for start, weight in (starts if starts is not None else [(None, 1)] * num_games):
+        result = play_match(make_state(game, params, start), agents[0], agents[1])
+        timings['games'].append(list(result.move_times))
+        timings['games'].extend([None] * (weight - 1))
+        if result.winner == 1:
+            totals['agent1_wins'] += weight
+        elif result.winner == 2:
+            totals['agent2_wins'] += weight
+        else:
+            totals['draws'] += weight
+        totals['total_moves'] += result.length * weight
+        totals['total_nodes'] += sum(stats.get('nodes', 0) for stats in result.stats) * weight
+        totals['length_counts'][result.length] = totals['length_counts'].get(result.length, 0) + weight
+        for summed, stats in zip(totals['agent_stats'], result.stats):
+            for key, value in stats.items():
+                summed[key] = summed.get(key, 0) + value * weight
+        if 'games' in totals:
+            game_record = [result.winner, result.length, [list(move) for move in result.moves]]
+            totals['games'].extend([game_record] * weight)
+    timings['seconds'] = time.perf_counter() - start_time
+    return index, totals, timings
+
+def scenario_seed(seed, name):
+    """Root SeedSequence of one scenario, derived from its name rather than its
+    place in the list, so a scenario plays the same games in any selection"""
+    return np.random.SeedSequence(seed, spawn_key=(zlib.crc32(name.encode()),))
+
+def make_tasks(scenarios, seed, games_per_chunk=GAMES_PER_CHUNK, indices=None):
+    """Chunk tasks in a fixed order for the scenarios at indices (default all).
+    Each scenario has its own SeedSequence and each chunk a child of it, so a
+    chunk's games depend only on (seed, scenario, chunk) and never on the
+    worker that runs it. When both agents are deterministic a game is fixed
+    by its start, so the scenario's starts are drawn up front from its own
+    seed and deduplicated with distinct_starts; its chunks then hold up to
+    games_per_chunk distinct starts with their weights instead of games."""
+    tasks = []
+    for s in (range(len(scenarios)) if indices is None else indices):
+        name, game, agent1, agent2, params, num_games = scenarios[s]
+        root = scenario_seed(seed, name)
+        agents = (make_agent(game, agent1, params, 1), make_agent(game, agent2, params, 2))
+        if agents[0].deterministic and agents[1].deterministic:
+            rng = random.Random(int.from_bytes(root.generate_state(4).tobytes(), 'little'))
+            starts = [[start, weight] for start, weight in distinct_starts(num_games, agents, draw_start(game, rng))]
+            groups = [starts[i:i + games_per_chunk] for i in range(0, len(starts), games_per_chunk)]
+        else:
+            groups = [None] * len(range(0, num_games, games_per_chunk))
+        chunk_seeds = root.spawn(len(groups))
+        for c, (group, chunk_seed) in enumerate(zip(groups, chunk_seeds)):
+            if group is None:
+                count = min(games_per_chunk, num_games - c * games_per_chunk)
+            else:
+                count = sum(weight for _, weight in group)
+            tasks.append(((s, c), game, agent1, agent2, params, count, chunk_seed.generate_state(4).tolist(), group))
+    return tasks
+
+def merge(scenarios, chunk_results, indices=None):
+    """Add chunk totals in chunk order; only integers are summed, so the
+    merged numbers are identical for any worker count. Per-move timings are
+    concatenated in game order under 'timings' (with the chunks' summed
+    wall time), which results_digest skips."""
+    results = {}
+    for s in (range(len(scenarios)) if indices is None else indices):
+        name, game, agent1, agent2, params, num_games = scenarios[s]
+        chunks = sorted((index[1], totals, timings) for index, totals, timings in chunk_results
+                        if index[0] == s)
+        merged = {'game': game, 'agent1': agent1, 'agent2': agent2, 'params': params,
+                  'num_games': num_games, 'agent1_wins': 0, 'agent2_wins': 0, 'draws': 0,
+                  'total_moves': 0, 'total_nodes': 0, 'length_counts': {}, 'agent_stats': [{}, {}]}
+        if params.get('record_games'):
+            merged['games'] = []
+        timings = {'games': [], 'seconds': 0.0}
+        for _, totals, chunk_timings in chunks:
+            for key in ('agent1_wins', 'agent2_wins', 'draws', 'total_moves', 'total_nodes'):
+                merged[key] += totals[key]
+            for length, count in totals['length_counts'].items():
+                # Journaled totals come back from JSON with string lengths
+                length = int(length)
+                merged['length_counts'][length] = merged['length_counts'].get(length, 0) + count
+            for summed, stats in zip(merged['agent_stats'], totals['agent_stats']):
+                for key, value in stats.items():
+                    summed[key] = summed.get(key, 0) + value
+            if 'games' in merged:
+                merged['games'].extend(totals['games'])
+            timings['games'].extend(chunk_timings['games'])
+            timings['seconds'] += chunk_timings['seconds']
+        merged['length_counts'] = {str(k): merged['length_counts'][k] for k in sorted(merged['length_counts'])}
+        merged['agent1_win_rate'] = merged['agent1_wins'] / num_games * 100
+        merged['agent2_win_rate'] = merged['agent2_wins'] / num_games * 100
+        merged['draw_rate'] = merged['draws'] / num_games * 100
+        merged['avg_moves'] = merged['total_moves'] / num_games
+        merged['avg_nodes'] = merged['total_nodes'] / num_games
+        merged['timings'] = timings
+        results[name] = merged
+    return results
+
+def move_times(result, side):
+    """Per-move times of agent side (1 or 2) over the games actually played"""
+    return [t for game in result['timings']['games'] if game is not None for t in game[side - 1]]
+
+def scenario_spec(cache, scenario, seed, games_per_chunk):
+    """Result cache spec of one scenario; chunking is part of it because the
+    Nim table is emptied per chunk, which shows in node counts"""
+    name, game, agent1, agent2, params, num_games = scenario
+    return cache.spec(game, (agent1, agent2), dict(params, scenario=name, games_per_chunk=games_per_chunk),
+                      num_games, seed, sources=['analysis/tournament.py'])
+
+def results_digest(results):
+    """SHA-256 of the merged results without their timings, for checking runs
+    against each other"""
+    results = {name: {key: value for key, value in result.items() if key != 'timings'}
+               for name, result in results.items()}
+    return hashlib.sha256(json.dumps(results, sort_keys=True).encode()).hexdigest()
+
+def chunk_key(task, scenarios, seed, games_per_chunk, engines):
+    """Run journal key of one chunk task: everything its totals depend on"""
+    (s, c), game = task[0], task[1]
+    return [list(scenarios[s]), c, seed, games_per_chunk, engines[game]]
+
+def run_tournament(scenarios=DEFAULT_SCENARIOS, seed=0, workers=None, games_per_chunk=GAMES_PER_CHUNK,
+                   cache=None, journal=None):
+    """Run every scenario. Each one is split into chunks of games_per_chunk
+    games, each chunk seeded from seed, and the chunks are played on a pool
+    of workers processes (default: one per CPU); workers=1 plays them all in
+    this process. With a
+    ResultCache, scenarios already stored are loaded and only the rest play.
+    With a RunJournal, chunk totals are checkpointed as they finish and chunks
+    an interrupted run already played are taken from it."""
+    start_time = time.time()
+    specs = [scenario_spec(cache, scenario, seed, games_per_chunk) for scenario in scenarios] if cache else None
+    stored = {}
+    if cache is not None:
+        for s, spec in enumerate(specs):
+            result = cache.get(spec)
+            if result is not None:
+                stored[s] = result
+    pending = [s for s in range(len(scenarios)) if s not in stored]
+
+    tasks = make_tasks(scenarios, seed, games_per_chunk, pending)
+    chunk_results = []
+    keys = {}
+    if journal is not None:
+        engines = {game: engine_hash(game, ['analysis/tournament.py']) for game in {task[1] for task in tasks}}
+        remaining = []
+        for task in tasks:
+            key = keys[task[0]] = chunk_key(task, scenarios, seed, games_per_chunk, engines)
+            chunk = journal.reuse(key)
+            if chunk is None:
+                remaining.append(task)
+            else:
+                chunk_results.append((task[0], chunk['totals'], chunk['timings']))
+        tasks = remaining
+
+    def finished(results):
+        # Checkpoint each chunk as it arrives (pool.map yields in task order)
+        for index, totals, timings in results:
+            if journal is not None:
+                journal.record(keys[index], {'totals': totals, 'timings': timings}, timings['seconds'])
+            chunk_results.append((index, totals, timings))
+
+    games = sorted({task[1] for task in tasks})
+    if tasks:
+        if workers == 1:
+            warmup(games)
+            finished(run_chunk(task) for task in tasks)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=warmup, initargs=(games,)) as pool:
+                finished(pool.map(run_chunk, tasks))
+    played = merge(scenarios, chunk_results, pending)
+
+    results = {}
+    for s, scenario in enumerate(scenarios):
+        name = scenario[0]
+        if s in stored:
+            results[name] = stored[s]
+        elif cache is not None:
+            results[name] = cache.put(specs[s], played[name])
+        else:
+            results[name] = played[name]
+    return results, time.time() - start_time
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game tournament on a process pool")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk', type=int, default=GAMES_PER_CHUNK, help="games per chunk")
+    parser.add_argument('--games', nargs='*', help="only these games (tic_tac_toe, connect4, halving, nim)")
+    parser.add_argument('--no-cache', action='store_true', help="play every scenario, ignoring stored results")
+    parser.add_argument('--fresh', action='store_true', help="ignore chunks checkpointed by an interrupted run")
+    args = parser.parse_args()
+    cache = ResultCache(enabled=not args.no_cache)
+    if args.fresh and os.path.exists(JOURNAL_PATH):
+        os.remove(JOURNAL_PATH)
+    journal = RunJournal(JOURNAL_PATH)
+    if journal.recovered:
+        print(f"Resuming: {journal.recovered} finished chunk(s) recovered from {JOURNAL_PATH}")
+
+    scenarios = [s for s in DEFAULT_SCENARIOS if not args.games or s[1] in args.games]
+    print(f"Running {len(scenarios)} scenarios, {sum(s[5] for s in scenarios)} games "
+          f"(seed {args.seed}, {args.workers or os.cpu_count()} workers)")
+    results, elapsed = run_tournament(scenarios, args.seed, args.workers, args.chunk, cache, journal)
+    print(cache.report())
+    print(journal.report())
+
+    for name, result in results.items():
+        print(f"  {name:<32} P1 {result['agent1_win_rate']:5.1f}%  P2 {result['agent2_win_rate']:5.1f}%  "
+              f"draw {result['draw_rate']:5.1f}%  {result['avg_moves']:.1f} moves")
+    digest = results_digest(results)
+    print(f"Finished in {elapsed:.1f}s, results digest {digest[:16]}")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = os.path.join(OUTPUT_DIR, f'tournament_results_{timestamp}.json')
+    with open(filename, 'w') as f:
+        json.dump({'timestamp': datetime.now().isoformat(), 'seed': args.seed, 'workers': args.workers,
+                   'games_per_chunk': args.chunk, 'wall_time': elapsed, 'digest': digest,
+                   'results': results}, f, indent=2)
+    print(f"Results saved to: {filename}")
+    # Results are safely written, so the next run starts from scratch
+    journal.close(complete=True)
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,42 @@
+from collections import OrderedDict
+
+from search import Searcher, EXACT, WIN_SCORE
+
+SOLVED_DEPTH = 1 << 30  # deeper than any game, so every search is exact
+
+class _SolveTable:
+    #Searcher table for one HalvingGame.minimax solve: this solve's results
+    #(in case the bounded shared cache evicts them before their parents are
+    #done) over the shared cache. Every entry is exact, and a value is kept
+    #as win or loss only, so two winning moves tie and the search keeps the
+    #first of get_moves(), as a full-window alpha-beta minimax does.
+    def __init__(self):
+        self.solved = {}
+    
+    def get(self, number):
+        result = self.solved.get(number)
+        if result is None:
+            result = HalvingGame.cache.get(number)
+            if result is None:
+                return None
+        value, move = result
+        return (SOLVED_DEPTH, value * WIN_SCORE, EXACT, move)
+    
+    def store(self, number, entry):
+        _, score, _, move = entry
+        result = (1 if score > 0 else -1, move)
+        self.solved[number] = result
+        HalvingGame._store(number, result)
+
 class HalvingGame:
+    # Solved positions shared by every instance: number -> (value, move), value
+    # +1 if the player to move wins
+    cache = OrderedDict()
+    cache_max_size = 1000000
+    cache_hits = 0
+    cache_misses = 0
+    cache_evictions = 0
+    
     def __init__(self, initial_number):
         self.initial_number = initial_number
     
@@ -10,37 +48,75 @@ class HalvingGame:
             moves.append(current_number // 2)
         return moves
     
+    def is_game_over(self, current_number):
+        return current_number <= 1
+    
+    def winner(self, current_player):
+        #Winner once the game is over with current_player to move
+        return 2 if current_player == 1 else 1
+    
+    def operation(self, current_number, move):
+        return "/2" if move == current_number // 2 else "-1"
+    
+    @classmethod
+    def cache_stats(cls):
+        lookups = cls.cache_hits + cls.cache_misses
+        return {
+            'size': len(cls.cache),
+            'max_size': cls.cache_max_size,
+            'hits': cls.cache_hits,
+            'misses': cls.cache_misses,
+            'evictions': cls.cache_evictions,
+            'hit_rate': cls.cache_hits / lookups if lookups else 0.0
+        }
+    
+    @classmethod
+    def clear_cache(cls):
+        cls.cache.clear()
+        cls.cache_hits = 0
+        cls.cache_misses = 0
+        cls.cache_evictions = 0
+    
+    @classmethod
+    def _store(cls, key, result):
+        cls.cache[key] = result
+        if len(cls.cache) > cls.cache_max_size:
+            cls.cache.popitem(last=False)
+            cls.cache_evictions += 1
+    
     def minimax(self, current_number, is_maximizing, depth=0, alpha=float('-inf'), beta=float('inf')):
-        # Minimax algorithm  with alpha-beta pruning
-        
-        # Base case: game over
-        if current_number==1:
-            return (1 if not is_maximizing else -1, None)  # Previous player wins
-        
-        if is_maximizing:
-            best_value = float('-inf')
-            best_move = None
-            for move in self.get_moves(current_number):
-                value, _ = self.minimax(move, False, depth+1, alpha, beta)
-                if value > best_value:
-                    best_value = value
-                    best_move = move
-                alpha = max(alpha, best_value)
-                if beta <= alpha:
-                    break  # Beta pruning
-            return (best_value, best_move)
+        # Memoized minimax on the shared negamax engine (search.Searcher):
+        # returns (value, move) with value +1 if the maximizer wins and move
+        # the first of get_moves() reaching that value, the same answer the
+        # full-window alpha-beta search gives. Results are exact, so
+        # alpha/beta are accepted for compatibility but not needed.
+        result = self.cache.get(current_number)
+        if result is not None:
+            self.cache.move_to_end(current_number)
+            HalvingGame.cache_hits += 1
         else:
-            best_value = float('inf')
-            best_move = None
-            for move in self.get_moves(current_number):
-                value, _ = self.minimax(move, True, depth+1, alpha, beta)
-                if value < best_value:
-                    best_value = value
-                    best_move = move
-                beta = min(beta, best_value)
-                if beta <= alpha:
-                    break  # Alpha pruning
-            return (best_value, best_move)
+            HalvingGame.cache_misses += 1
+            result = self._solve(current_number)
+        value, move = result
+        return (value if is_maximizing else -value, move)
+    
+    def _solve(self, number):
+        # Every number below this one is reachable through -1 moves. Search
+        # them bottom-up, so each search finds both children in the table
+        # and stays one ply deep: a long chain of -1 moves from a large
+        # number never hits the recursion limit.
+        if self.is_game_over(number):
+            return (-1, None)  # The previous player reached 1 and won
+        from match import HalvingState  # match imports this module
+        table = _SolveTable()
+        searcher = Searcher(table)
+        for n in range(2, number + 1):
+            result = self.cache.get(n)
+            if result is None:
+                searcher.search(HalvingState(n, self), SOLVED_DEPTH)
+            else:
+                table.solved[n] = result
+        return table.solved[number]
     
     def play_game(self):
         #Simulate two agent players using Minimax algorithm
@@ -15,6 +15,15 @@ class ConnectFour:
         self.bitboard = {'X': 0, 'O': 0}
         self.current_player = random.choice(['X', 'O'])
 
+    @classmethod
+    def from_moves(cls, moves: str, first_player: str = 'X') -> 'ConnectFour':
+        # Rebuild a position from a string of column digits played alternately
+        game = cls()
+        game.current_player = first_player
+        for ch in moves:
+            game.make_move(int(ch))
+        return game
+
     def mask(self) -> int:
         return self.bitboard['X'] | self.bitboard['O']
 
@@ -36,6 +45,12 @@ class ConnectFour:
         opp = self.bitboard[self.opponent_symbol()]
         return c4f.find_best(cur, opp, depth)
 
+    def best_move_budget(self, max_nodes: int):
+        # Deepest fully searched iteration within max_nodes: (column, depth)
+        cur = self.bitboard[self.current_player]
+        opp = self.bitboard[self.opponent_symbol()]
+        return c4f.find_best_budget(cur, opp, max_nodes)
+
     def make_move(self, col: int):
         self.play_move(col, self.current_player)
         self.current_player = self.opponent_symbol()
@@ -17,6 +17,17 @@ for c in range(7):
 cdef int ORDER[7]
 ORDER[:] = [3, 2, 4, 1, 5, 0, 6]
 
+cdef uint64_t node_count = 0
+cdef uint64_t node_limit = 0  # stop once node_count passes this; 0 means no budget
+cdef bint out_of_nodes = False
+
+cpdef void reset_nodes():
+    global node_count
+    node_count = 0
+
+cpdef uint64_t get_nodes():
+    return node_count
+
 cpdef bint win(uint64_t bb):
     cdef uint64_t m
     m = bb & (bb >> bits)
@@ -94,7 +105,12 @@ cdef int eval_bb(uint64_t cur, uint64_t opp):
     return score
 
 cdef int nega(uint64_t cur, uint64_t opp, int depth, int alpha, int beta):
+    global node_count, out_of_nodes
     cdef int best = -1_000_000
+    node_count += 1
+    if node_limit and node_count > node_limit:
+        out_of_nodes = True
+        return 0
     if depth == 0 or win(cur) or win(opp):
         if win(cur):
             return  1_000_000 - (8 - depth)
@@ -109,6 +125,8 @@ cdef int nega(uint64_t cur, uint64_t opp, int depth, int alpha, int beta):
             continue
         mask = ((cur | opp) + BOTTOM_MASK[col]) & BOARD_MASK[col]
         score = -nega(opp, cur | mask, depth - 1, -beta, -alpha)
+        if out_of_nodes:
+            return 0
 
         if score > best:
             best = score
@@ -119,16 +137,45 @@ cdef int nega(uint64_t cur, uint64_t opp, int depth, int alpha, int beta):
     return best
 
 cpdef int find_best(uint64_t cur, uint64_t opp, int depth = 8):
+    global node_count
     cdef int best_col = -1
     cdef int best_score = -1_000_000
     cdef int i, col, score
+    node_count += 1
     for i in range(7):
         col = ORDER[i]
         if (cur | opp) & TOP_MASK[col]:
             continue
         mask = ((cur | opp) + BOTTOM_MASK[col]) & BOARD_MASK[col]
         score = -nega(opp, cur | mask, depth - 1, -1_000_000, 1_000_000)
+        if out_of_nodes:
+            break
         if score > best_score:
             best_score = score
             best_col = col
     return best_col
+
+cpdef tuple find_best_budget(uint64_t cur, uint64_t opp, uint64_t max_nodes, int max_depth = 42):
+    # Iterative deepening under a node budget: returns (column, depth) from
+    # the deepest iteration that finished within max_nodes nodes of this
+    # call, or the first legal column in move order (depth 0) if none did
+    global node_limit, out_of_nodes
+    cdef int best_col = -1
+    cdef int done_depth = 0
+    cdef int depth, col, i
+    cdef int empty = 42 - pop64(cur | opp)
+    for i in range(7):
+        if not (cur | opp) & TOP_MASK[ORDER[i]]:
+            best_col = ORDER[i]
+            break
+    node_limit = node_count + max_nodes
+    out_of_nodes = False
+    for depth in range(1, min(max_depth, empty) + 1):
+        col = find_best(cur, opp, depth)
+        if out_of_nodes:
+            break
+        best_col = col
+        done_depth = depth
+    node_limit = 0
+    out_of_nodes = False
+    return best_col, done_depth
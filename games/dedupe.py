@@ -0,0 +1,16 @@
+def distinct_starts(num_games, agents, draw_start=None):
+    #When every agent is deterministic (agent.deterministic), games from the
+    #same start replay the same moves, so a harness only needs to play each
+    #distinct start once and weight its result. Returns [(start, weight), ...]
+    #in first-seen order, with weights summing to num_games. draw_start() is
+    #still called once per game, so random setup (e.g. Connect4's first
+    #player) is drawn exactly as in the sampled games; None means every game
+    #starts alike. With any non-deterministic agent every game is its own
+    #entry with weight 1, i.e. the full sample is played.
+    starts = [draw_start() if draw_start is not None else None for _ in range(num_games)]
+    if not all(agent.deterministic for agent in agents):
+        return [(start, 1) for start in starts]
+    weights = {}
+    for start in starts:
+        weights[start] = weights.get(start, 0) + 1
+    return list(weights.items())
@@ -0,0 +1,216 @@
+from fractions import Fraction
+from collections import namedtuple
+
+import nim
+from Halving import HalvingGame
+from tic_tac_toe import TicTacToe, IS_WIN, FULL_MASK, CELL_MOVES, PLAYER_X, PLAYER_O
+from match import TicTacToeState, NimState, HalvingState
+from search import Searcher, TranspositionTable
+
+BUDGET_MAX_DEPTH = 64  # deepening cap for budgeted agents; the node budget binds first
+
+# Exact result of a matchup from one position: win/draw/loss are player 1's
+# probabilities, length the expected number of moves left and cost the
+# expected agent work (e.g. search nodes) over the rest of the game
+ExactOutcome = namedtuple('ExactOutcome', ['win', 'draw', 'loss', 'length', 'cost'])
+
+class Expectimax:
+    #Memoized exact evaluation of two agents against each other. An agent is
+    #a callable (state, player) -> (moves, cost) returning the moves it picks
+    #from uniformly (one move for a deterministic agent) and the work it did.
+    #rules supplies outcome(state, player) (None while the game goes on, else
+    #the winner, 0 for a draw), moves(state, player) and play(state, player, move).
+    #Values are Fractions, so results are exact rather than sampled.
+    def __init__(self, rules, agent1, agent2):
+        self.rules = rules
+        self.agents = {1: agent1, 2: agent2}
+        self.memo = {}
+
+    def evaluate(self, state, player=1):
+        key = (state, player)
+        result = self.memo.get(key)
+        if result is not None:
+            return result
+
+        winner = self.rules.outcome(state, player)
+        if winner is not None:
+            result = ExactOutcome(Fraction(winner == 1), Fraction(winner == 0), Fraction(winner == 2),
+                                  Fraction(0), Fraction(0))
+        else:
+            moves, cost = self.agents[player](state, player)
+            share = Fraction(1, len(moves))
+            win = draw = loss = length = Fraction(0)
+            total_cost = Fraction(cost)
+            for move in moves:
+                child = self.evaluate(self.rules.play(state, player, move), 3 - player)
+                win += share * child.win
+                draw += share * child.draw
+                loss += share * child.loss
+                length += share * (1 + child.length)
+                total_cost += share * child.cost
+            result = ExactOutcome(win, draw, loss, length, total_cost)
+        self.memo[key] = result
+        return result
+
+def random_agent(rules):
+    #Uniform over every legal move, no search
+    return lambda state, player: (rules.moves(state, player), 0)
+
+def rates(outcome):
+    #Percentages and averages in the shape the simulation summaries use
+    return {
+        'win_rate': float(outcome.win) * 100,
+        'draw_rate': float(outcome.draw) * 100,
+        'loss_rate': float(outcome.loss) * 100,
+        'avg_moves': float(outcome.length),
+        'avg_cost': float(outcome.cost),
+        'win_probability': str(outcome.win),
+        'exact': True
+    }
+
+# ---- Tic-Tac-Toe: state (x_bits, o_bits) ----
+class TicTacToeRules:
+    def outcome(self, state, player):
+        x_bits, o_bits = state
+        if IS_WIN[x_bits]:
+            return PLAYER_X
+        if IS_WIN[o_bits]:
+            return PLAYER_O
+        if x_bits | o_bits == FULL_MASK:
+            return 0
+        return None
+
+    def moves(self, state, player):
+        occupied = state[0] | state[1]
+        return [CELL_MOVES[k] for k in range(9) if not occupied >> k & 1]
+
+    def play(self, state, player, move):
+        bit = 1 << (move[0] * 3 + move[1])
+        return (state[0] | bit, state[1]) if player == PLAYER_X else (state[0], state[1] | bit)
+
+def tic_tac_toe_agent(state, player):
+    #TicTacToe.find_best_move on this position (deterministic)
+    game = TicTacToe()
+    game.x_bits, game.o_bits = state
+    game.player = player
+    game.cnt = bin(state[0] | state[1]).count('1')
+    return [game.find_best_move()], 1
+
+# ---- Nim: state is a tuple of piles ----
+class NimRules:
+    def outcome(self, state, player):
+        # The player to move with no stones left has lost
+        return None if any(state) else 3 - player
+
+    def moves(self, state, player):
+        return nim.NimGame(list(state)).generate_moves()
+
+    def play(self, state, player, move):
+        piles = list(state)
+        piles[move[0]] -= move[1]
+        return tuple(piles)
+
+def nim_sum_agent(state, player):
+    #find_best_move with the nim-sum: the winning move, or a uniformly random
+    #move (sample_move) in a lost position; one node either way
+    move = nim.NimGame(list(state)).optimal_move()
+    if move is not None:
+        return [move], 1
+    return nim.NimGame(list(state)).generate_moves(), 1
+
+def nim_minimax_agent(depth=8):
+    #Depth-limited minimax without the nim-sum, with a fresh table per
+    #position so the move and its cost depend on the position alone
+    #(deterministic); the cost is the nodes searched
+    def agent(state, player):
+        move, nodes = nim.find_best_move(nim.NimGame(list(state)), depth=depth, use_nim_sum=False,
+                                         table=TranspositionTable())
+        return [move], nodes
+    return agent
+
+# ---- Halving: state is the current number ----
+class HalvingRules:
+    def outcome(self, state, player):
+        # Whoever reaches 1 wins, so the player to move at 1 has lost
+        return 3 - player if state <= 1 else None
+
+    def moves(self, state, player):
+        return HalvingGame(state).get_moves(state)
+
+    def play(self, state, player, move):
+        return move
+
+def halving_agent(state, player):
+    #HalvingGame.minimax for this side (deterministic)
+    _, move = HalvingGame(state).minimax(state, player == 1)
+    return [move], 1
+
+# ---- node-budgeted search, the same engine for every game ----
+def _tic_tac_toe_state(state, player):
+    game = TicTacToe()
+    game.x_bits, game.o_bits = state
+    game.player = player
+    game.cnt = bin(state[0] | state[1]).count('1')
+    return TicTacToeState(game)
+
+def _nim_state(state, player):
+    return NimState(list(state))
+
+def _halving_state(state, player):
+    return HalvingState(state)
+
+def budget_agent(to_state, max_nodes):
+    #search.Searcher deepening from each position until max_nodes nodes are
+    #spent, with a fresh table per position so the move depends on the
+    #position alone (deterministic); the cost is the nodes searched
+    def agent(state, player):
+        game_state = to_state(state, player)
+        searcher = Searcher(TranspositionTable())
+        _, move, _ = searcher.iterative_deepening(game_state, BUDGET_MAX_DEPTH, max_nodes=max_nodes)
+        if move is None:
+            move = game_state.moves()[0]
+        return [move], searcher.stats.nodes
+    return agent
+
+def budget_efficiency(max_nodes=100, nim_piles=(3, 5, 7), halving_start=50):
+    #Exact win rate (%) of the budgeted agent moving first against random
+    #play in each game: strength per unit of compute on one scale, since
+    #every game gets the same engine and the same nodes per move
+    return {
+        'Tic-Tac-Toe': rates(tic_tac_toe_exact(budget_agent(_tic_tac_toe_state, max_nodes)))['win_rate'],
+        'Nim': rates(nim_exact(nim_piles, budget_agent(_nim_state, max_nodes)))['win_rate'],
+        'Halving': rates(halving_exact(halving_start, budget_agent(_halving_state, max_nodes)))['win_rate'],
+    }
+
+# ---- matchups ----
+def _agent(rules, agent):
+    return random_agent(rules) if agent == "random" else agent
+
+def tic_tac_toe_exact(agent1=tic_tac_toe_agent, agent2="random"):
+    rules = TicTacToeRules()
+    return Expectimax(rules, _agent(rules, agent1), _agent(rules, agent2)).evaluate((0, 0))
+
+def nim_exact(piles, agent1=nim_sum_agent, agent2="random"):
+    rules = NimRules()
+    return Expectimax(rules, _agent(rules, agent1), _agent(rules, agent2)).evaluate(tuple(piles))
+
+def halving_exact(initial_number, agent1=halving_agent, agent2="random"):
+    rules = HalvingRules()
+    return Expectimax(rules, _agent(rules, agent1), _agent(rules, agent2)).evaluate(initial_number)
+
+def main():
+    for name, outcome in [
+        ("Tic-Tac-Toe agent vs random", tic_tac_toe_exact()),
+        ("Tic-Tac-Toe random vs agent", tic_tac_toe_exact("random", tic_tac_toe_agent)),
+        ("Tic-Tac-Toe random vs random", tic_tac_toe_exact("random", "random")),
+        ("Nim [3, 5, 7] nim-sum vs random", nim_exact([3, 5, 7])),
+        ("Nim [3, 5, 7] random vs random", nim_exact([3, 5, 7], "random", "random")),
+        ("Halving 50 minimax vs random", halving_exact(50)),
+        ("Halving 50 random vs random", halving_exact(50, "random", "random")),
+    ]:
+        summary = rates(outcome)
+        print(f"{name:<34} win {summary['win_rate']:6.2f}%  draw {summary['draw_rate']:6.2f}%  "
+              f"loss {summary['loss_rate']:6.2f}%  length {summary['avg_moves']:.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import time
+import argparse
+
+import numpy as np
+
+from halving_tablebase import HalvingTablebase
+
+BUILD_LIMIT = 1 << 16  # table range the automaton is read off
+VERIFY_LIMIT = 1 << 22  # table range it is checked against (the build range and 64x beyond)
+MAX_WORD_BITS = 8  # longest low-bit suffix explored before the state set must close
+NO_POSITION = 4  # symbol for n = 0, which never occurs in a game
+
+def _symbols(tablebase, limit):
+    #Dense symbol per n in 0..limit: 2 * win + halve, NO_POSITION at 0
+    win = np.unpackbits(np.asarray(tablebase.win_bits[:limit // 8 + 1]), bitorder='little')[:limit + 1]
+    halve = np.unpackbits(np.asarray(tablebase.halve_bits[:limit // 8 + 1]), bitorder='little')[:limit + 1]
+    symbols = (2 * win + halve).astype(np.int8)
+    symbols[0] = NO_POSITION
+    return symbols
+
+class HalvingAutomaton:
+    #Outcome and chosen move for any n from its binary digits alone.
+    #Whether n is won depends only on its trailing zeros and whether the odd
+    #part is 1, and the chosen move on the same for n - 1 and n // 2, so the
+    #sequence of (win, halve) over n is 2-automatic: a small automaton
+    #reading n's bits from the least significant end ends in a state whose
+    #output is the answer. A run-length encoding over n is not sparse (odd n
+    #are all wins, so runs rarely pass two numbers), but this is: a handful
+    #of states replace the whole table, and a query costs one step per bit.
+    def __init__(self, transitions, outputs):
+        self.transitions = np.asarray(transitions, dtype=np.int64)  # state x bit -> state
+        self.outputs = np.asarray(outputs, dtype=np.int8)  # state -> symbol
+        self.verified_limit = 0
+
+    @classmethod
+    def from_table(cls, symbols, max_word_bits=MAX_WORD_BITS):
+        #Read the automaton off a dense symbol table. Each state is a 2-kernel
+        #subsequence m -> a(2^e * m + r) for a low-bit suffix r of e bits,
+        #identified by its first len(symbols) >> max_word_bits values; reading
+        #bit b moves to the subsequence m -> a(2^(e+1) * m + 2^e * b + r).
+        samples = len(symbols) >> max_word_bits
+        if samples < 2:
+            raise ValueError("table too short for the requested suffix length")
+        steps = np.arange(samples)
+        state_ids = {}
+        words = []  # state -> (e, r) of its first suffix
+        transitions = []
+
+        def state_for(e, r):
+            key = symbols[r + (steps << e)].tobytes()
+            if key not in state_ids:
+                if e > max_word_bits - 1 and words:
+                    raise RuntimeError(f"no closed automaton within {max_word_bits} suffix bits")
+                state_ids[key] = len(words)
+                words.append((e, r))
+                transitions.append([0, 0])
+            return state_ids[key]
+
+        state_for(0, 0)
+        i = 0
+        while i < len(words):
+            e, r = words[i]
+            for bit in (0, 1):
+                transitions[i][bit] = state_for(e + 1, r + (bit << e))
+            i += 1
+        outputs = [symbols[r] for _, r in words]
+        return cls(transitions, outputs)
+
+    @classmethod
+    def build(cls, build_limit=BUILD_LIMIT, verify_limit=VERIFY_LIMIT, tablebase=None):
+        #Read the automaton off 0..build_limit of the dense tablebase, then
+        #check every n in 1..verify_limit against it
+        if tablebase is None:
+            tablebase = HalvingTablebase(max(build_limit, verify_limit)).load()
+        automaton = cls.from_table(_symbols(tablebase, build_limit))
+        automaton.verify(tablebase, verify_limit)
+        return automaton
+
+    def verify(self, tablebase, limit, chunk=1 << 22):
+        #Raise if any n in 1..limit disagrees with the dense table
+        symbols = _symbols(tablebase, limit)
+        for start in range(1, limit + 1, chunk):
+            numbers = np.arange(start, min(start + chunk, limit + 1), dtype=np.uint64)
+            mismatch = np.flatnonzero(self._symbols(numbers) != symbols[numbers.astype(np.int64)])
+            if len(mismatch):
+                raise RuntimeError(f"automaton disagrees with the tablebase at n = {int(numbers[mismatch[0]])}")
+        self.verified_limit = limit
+        return True
+
+    @property
+    def num_states(self):
+        return len(self.outputs)
+
+    # ---- queries ----
+    def _state(self, n):
+        if n < 1:
+            raise ValueError("the Halving game starts from a positive number")
+        state = 0
+        while n:
+            state = self.transitions[state, n & 1]
+            n >>= 1
+        return state
+
+    def _symbols(self, numbers):
+        #Vectorized symbol lookup for an array of positive uint64 numbers,
+        #one table step per bit of the largest number
+        rest = np.array(numbers, dtype=np.uint64)
+        step = (2 * self.transitions).ravel()  # (2 * state + bit) -> 2 * next state
+        states = np.zeros(rest.shape, dtype=np.int64)
+        one = np.uint64(1)
+        while rest.any():
+            states = step[states + (rest & one).astype(np.int64)]
+            rest >>= one
+        return self.outputs[states // 2]
+
+    def is_win(self, n):
+        #True if the player to move at n wins with perfect play
+        return bool(self.outputs[self._state(n)] >> 1)
+
+    def outcome(self, n):
+        #+1 if the player to move at n wins, -1 if they lose
+        return 1 if self.is_win(n) else -1
+
+    def best_move(self, n):
+        #The move HalvingGame.minimax plays at n (None at 1)
+        symbol = self.outputs[self._state(n)]
+        if n == 1:
+            return None
+        return n // 2 if symbol & 1 else n - 1
+
+    def minimax(self, n, is_maximizing):
+        #Same (value, move) as HalvingGame.minimax, without searching
+        value = self.outcome(n)
+        return (value if is_maximizing else -value, self.best_move(n))
+
+    def win_mask(self, numbers):
+        #Vectorized is_win for an array of positive 64-bit numbers
+        return self._symbols(numbers) >> 1 == 1
+
+    def outcome_runs(self, lo, hi):
+        #Interval encoding of the outcome over lo..hi: a list of
+        #(first, last, win) runs of equal outcome
+        numbers = np.arange(lo, hi + 1, dtype=np.uint64)
+        wins = self.win_mask(numbers)
+        breaks = np.flatnonzero(wins[1:] != wins[:-1]) + 1
+        starts = np.concatenate(([0], breaks))
+        ends = np.concatenate((breaks, [len(wins)])) - 1
+        return [(lo + int(s), lo + int(e), bool(wins[s])) for s, e in zip(starts, ends)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and verify the Halving outcome automaton")
+    parser.add_argument('--build-limit', type=int, default=BUILD_LIMIT)
+    parser.add_argument('--verify-limit', type=int, default=VERIFY_LIMIT)
+    args = parser.parse_args()
+
+    start_time = time.time()
+    automaton = HalvingAutomaton.build(args.build_limit, args.verify_limit)
+    print(f"{automaton.num_states} states, verified for 1..{automaton.verified_limit:,} "
+          f"in {time.time() - start_time:.1f}s")
+    for n in (10, 10 ** 9, 2 ** 62, 2 ** 63 - 1, 2 ** 63, 3 * 2 ** 61):
+        print(f"  {n:>20,}: {'win' if automaton.is_win(n) else 'loss'} for the player to move, "
+              f"plays {automaton.best_move(n):,}")
+
+    rng = np.random.default_rng(0)
+    numbers = rng.integers(1, 2 ** 63, size=10 ** 6, dtype=np.uint64)
+    start_time = time.time()
+    wins = automaton.win_mask(numbers)
+    print(f"Random 64-bit starts won by the player to move: {wins.mean():.2%} "
+          f"({len(numbers) / (time.time() - start_time):,.0f} numbers/s)")
+
+if __name__ == "__main__":
+    main()
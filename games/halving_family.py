@@ -0,0 +1,302 @@
+import time
+import argparse
+
+import numpy as np
+
+CHUNK = 1 << 20  # numbers solved per vectorized pass at most
+MIN_BLOCK = 32  # shorter blocks are solved with a plain loop instead
+DEFAULT_LIMIT = 1 << 10  # first table size; tables double on demand
+
+_tables = {}  # rules -> (win, choice) arrays covering 0..limit
+_table_lookups = {}  # rules -> [hits, misses]
+
+class RuleSet:
+    #Rules for a Halving-family game on one number:
+    #  subtract - amounts a move may subtract
+    #  divisors - factors (>= 2) a move may divide by
+    #  rounding - 'floor' or 'ceil' for divisions
+    #  terminal - smallest number a move may reach (1 in Halving, or 0)
+    #  misere   - the player left without a move wins instead of losing
+    #A move must lower the number and stay at or above terminal; the game is
+    #over once no move is left. Moves are listed subtractions first, then
+    #divisions, so RuleSet() is the Halving game with moves [n - 1, n // 2].
+    def __init__(self, subtract=(1,), divisors=(2,), rounding='floor', terminal=1, misere=False):
+        self.subtract = tuple(subtract)
+        self.divisors = tuple(divisors)
+        if not self.subtract and not self.divisors:
+            raise ValueError("a rule set needs at least one subtraction or division")
+        if any(s < 1 for s in self.subtract):
+            raise ValueError("subtraction amounts must be positive")
+        if any(k < 2 for k in self.divisors):
+            raise ValueError("divisors must be at least 2")
+        if rounding not in ('floor', 'ceil'):
+            raise ValueError(f"rounding must be 'floor' or 'ceil', not {rounding!r}")
+        if terminal < 0:
+            raise ValueError("terminal must be 0 or more")
+        self.rounding = rounding
+        self.terminal = terminal
+        self.misere = misere
+
+    def key(self):
+        return (self.subtract, self.divisors, self.rounding, self.terminal, self.misere)
+
+    def to_dict(self):
+        #JSON-friendly keyword arguments that rebuild the rule set
+        return {'subtract': list(self.subtract), 'divisors': list(self.divisors), 'rounding': self.rounding,
+                'terminal': self.terminal, 'misere': self.misere}
+
+    def __eq__(self, other):
+        return isinstance(other, RuleSet) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return (f"RuleSet(subtract={self.subtract}, divisors={self.divisors}, "
+                f"rounding={self.rounding!r}, terminal={self.terminal}, misere={self.misere})")
+
+    def description(self):
+        parts = [f"-{s}" for s in self.subtract]
+        parts += [f"/{k}" + (" (ceil)" if self.rounding == 'ceil' else "") for k in self.divisors]
+        ending = "misère" if self.misere else "normal"
+        return f"moves {', '.join(parts)}; ends at {self.terminal}, {ending}"
+
+    def divide(self, n, k):
+        #Works on ints and NumPy arrays alike
+        return n // k if self.rounding == 'floor' else -(-n // k)
+
+    def children(self, n):
+        #Every move's result in move order, None where the move is illegal
+        results = [n - s if n - s >= self.terminal else None for s in self.subtract]
+        for k in self.divisors:
+            child = self.divide(n, k)
+            results.append(child if self.terminal <= child < n else None)
+        return results
+
+    def moves(self, n):
+        return [child for child in self.children(n) if child is not None]
+
+HALVING = RuleSet()
+
+def _solve_block(rules, numbers, win):
+    #Solve one block whose legal children all lie below it. Returns
+    #(win, choice): choice is the index (in move order) of the first move to
+    #a lost position, else of the first legal move, or -1 with no move.
+    lost = []
+    legal = []
+    for s in rules.subtract:
+        child = numbers - s
+        ok = child >= rules.terminal
+        legal.append(ok)
+        lost.append(ok & ~win[np.maximum(child, 0)])
+    for k in rules.divisors:
+        child = rules.divide(numbers, k)
+        ok = (child >= rules.terminal) & (child < numbers)
+        legal.append(ok)
+        lost.append(ok & ~win[np.minimum(child, numbers - 1)])
+    lost = np.array(lost)
+    legal = np.array(legal)
+    any_lost = lost.any(axis=0)
+    any_legal = legal.any(axis=0)
+    block_win = np.where(any_legal, any_lost, rules.misere)
+    choice = np.where(any_lost, np.argmax(lost, axis=0), np.where(any_legal, np.argmax(legal, axis=0), -1))
+    return block_win, choice
+
+def _solve_alternating(rules, numbers, win, prev_win):
+    #Subtract set {1}: n - 1 is always legal above terminal, so n is won if a
+    #division reaches a lost position, and otherwise exactly when n - 1 is
+    #lost. Won anchors from divisions are found in one pass and the results
+    #alternate between them (see halving_tablebase._solve_chunk).
+    start = numbers[0]
+    lost = []
+    for k in rules.divisors:
+        child = rules.divide(numbers, k)
+        ok = (child >= rules.terminal) & (child < numbers)
+        lost.append(ok & ~win[np.minimum(child, numbers - 1)])
+    lost = np.array(lost, dtype=bool).reshape(len(rules.divisors), len(numbers))
+    h = lost.any(axis=0)
+    anchor = np.maximum.accumulate(np.where(h, numbers, start - 1))
+    anchor_win = np.where(anchor >= start, True, prev_win)
+    block_win = np.where((numbers - anchor) % 2 == 0, anchor_win, ~anchor_win)
+
+    win_before = np.empty_like(block_win)
+    win_before[0] = prev_win
+    win_before[1:] = block_win[:-1]
+    # n - 1 (move 0) when it loses for the opponent or nothing wins
+    if not rules.divisors:
+        return block_win, np.zeros(len(numbers), dtype=np.int8)
+    choice = np.where(h & win_before, 1 + np.argmax(lost, axis=0), 0)
+    return block_win, choice
+
+def _solve_loop(rules, limit, win, choice):
+    #Number-by-number fallback for subtraction sets whose blocks would be
+    #too short for vectorized passes to pay off
+    results = win.tolist()
+    moves = choice.tolist()
+    for n in range(rules.terminal + 1, limit + 1):
+        first = -1
+        for i, child in enumerate(rules.children(n)):
+            if child is None:
+                continue
+            if not results[child]:
+                first = i
+                results[n] = True
+                break
+            if first < 0:
+                first = i
+        if first < 0:
+            results[n] = rules.misere
+        moves[n] = first
+    return np.array(results, dtype=bool), np.array(moves, dtype=np.int8)
+
+def check(rules, limit):
+    #Compare solve() with the number-by-number loop over 0..limit; returns
+    #the numbers where the outcome or the chosen move differs. Sets that
+    #solve() already hands to the loop always pass; tests/test_halving_family.py
+    #checks every path against an independent recursive solver.
+    win, choice = solve(rules, limit)
+    reference = np.zeros(limit + 1, dtype=bool)
+    if rules.terminal <= limit:
+        reference[rules.terminal] = rules.misere
+    ref_win, ref_choice = _solve_loop(rules, limit, reference, np.full(limit + 1, -1, dtype=np.int8))
+    return np.flatnonzero((win != ref_win) | (choice != ref_choice)).tolist()
+
+def solve(rules, limit):
+    #Outcome and chosen move for every number 0..limit, bottom-up in
+    #vectorized blocks. A block may only reach numbers below its start: with
+    #smallest subtraction s it spans at most s numbers, and with smallest
+    #divisor k it ends before k times its start. The Halving-style subtract
+    #set {1} instead alternates between anchors, so its blocks only obey the
+    #division bound, and other sets with a smallest subtraction below
+    #MIN_BLOCK fall back to a plain loop. Returns (win, choice) arrays
+    #indexed by number: win for the player to move, choice the index of the
+    #chosen move in move order.
+    win = np.zeros(limit + 1, dtype=bool)
+    choice = np.full(limit + 1, -1, dtype=np.int8)
+    if rules.terminal <= limit:
+        win[rules.terminal] = rules.misere
+    alternating = rules.subtract == (1,)
+    if not alternating and min(rules.subtract, default=CHUNK) < MIN_BLOCK:
+        return _solve_loop(rules, limit, win, choice)
+    min_divisor = min(rules.divisors) if rules.divisors else None
+
+    start = rules.terminal + 1
+    while start <= limit:
+        end = min(start + CHUNK, limit + 1)
+        if not alternating:
+            end = min(end, start + min(rules.subtract, default=CHUNK))
+        if min_divisor is not None:
+            bound = min_divisor * start if rules.rounding == 'floor' else min_divisor * (start - 1) + 1
+            end = min(end, max(bound, start + 1))
+        numbers = np.arange(start, end, dtype=np.int64)
+        if alternating:
+            win[start:end], choice[start:end] = _solve_alternating(rules, numbers, win, win[start - 1])
+        else:
+            win[start:end], choice[start:end] = _solve_block(rules, numbers, win)
+        start = end
+    return win, choice
+
+def family_table(rules, limit):
+    #(win, choice) arrays for rules covering at least 0..limit, kept in
+    #memory and regrown by doubling when a larger number is asked for
+    table = _tables.get(rules)
+    lookups = _table_lookups.setdefault(rules, [0, 0])
+    if table is not None and len(table[0]) > limit:
+        lookups[0] += 1
+        return table
+    lookups[1] += 1
+    size = DEFAULT_LIMIT
+    while size < limit:
+        size *= 2
+    table = solve(rules, size)
+    _tables[rules] = table
+    return table
+
+class HalvingFamilyGame:
+    #HalvingGame-compatible game for any RuleSet: get_moves, minimax and the
+    #end-of-game helpers the Halving simulation scripts call, answered from
+    #the solved table instead of a search
+    def __init__(self, initial_number, rules=HALVING):
+        self.initial_number = initial_number
+        self.rules = rules
+
+    def get_moves(self, current_number):
+        return self.rules.moves(current_number)
+
+    def is_game_over(self, current_number):
+        return not self.get_moves(current_number)
+
+    def winner(self, current_player):
+        #Winner once the game is over with current_player to move
+        return current_player if self.rules.misere else 3 - current_player
+
+    def operation(self, current_number, move):
+        #Label of the move from current_number to move, e.g. "-1" or "/2"
+        for k in self.rules.divisors:
+            if move == self.rules.divide(current_number, k):
+                return f"/{k}"
+        return f"-{current_number - move}"
+
+    def is_win(self, current_number):
+        win, _ = family_table(self.rules, current_number)
+        return bool(win[current_number])
+
+    def minimax(self, current_number, is_maximizing, depth=0, alpha=float('-inf'), beta=float('inf')):
+        #Same (value, move) contract as HalvingGame.minimax: +1 if the
+        #maximizer wins, and the first move reaching that value
+        win, choice = family_table(self.rules, current_number)
+        value = 1 if win[current_number] else -1
+        index = choice[current_number]
+        move = self.rules.children(current_number)[index] if index >= 0 else None
+        return (value if is_maximizing else -value, move)
+
+    def clear_cache(self):
+        _tables.pop(self.rules, None)
+        _table_lookups.pop(self.rules, None)
+
+    def cache_stats(self):
+        #Same keys as HalvingGame.cache_stats; a miss is a table (re)solve
+        table = _tables.get(self.rules)
+        hits, misses = _table_lookups.get(self.rules, [0, 0])
+        return {
+            'size': 0 if table is None else len(table[0]),
+            'max_size': None,
+            'hits': hits,
+            'misses': misses,
+            'evictions': 0,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve Halving-family games")
+    parser.add_argument('--limit', type=int, default=10 ** 6)
+    parser.add_argument('--check', action='store_true',
+                        help="compare every rule set against the number-by-number solver up to --limit")
+    args = parser.parse_args()
+
+    rule_sets = [
+        HALVING,
+        RuleSet(divisors=(3,)),
+        RuleSet(divisors=(2,), rounding='ceil'),
+        RuleSet(subtract=(1, 2), divisors=(2, 3)),
+        RuleSet(subtract=(2, 3)),
+        RuleSet(subtract=(1,), divisors=()),
+        RuleSet(terminal=0),
+        RuleSet(misere=True),
+    ]
+    if args.check:
+        for rules in rule_sets:
+            mismatches = check(rules, args.limit)
+            status = "ok" if not mismatches else f"{len(mismatches)} mismatches, first at {mismatches[0]}"
+            print(f"{rules.description():<40} {status}")
+        return
+    for rules in rule_sets:
+        start_time = time.time()
+        win, _ = solve(rules, args.limit)
+        elapsed = time.time() - start_time
+        positions = win[rules.terminal + 1:]
+        print(f"{rules.description():<40} {positions.mean():6.2%} of starts won by the mover, "
+              f"solved 1..{args.limit:,} in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
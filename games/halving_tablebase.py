@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import argparse
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+TABLEBASE_VERSION = 1
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'output', 'cache',
+                           'halving_tablebase')
+IN_MEMORY_LIMIT = 1 << 20  # numbers below this are solved in one pass
+CHUNK = 1 << 22  # later numbers are solved at most this many at a time (a multiple of 8)
+
+def _solve_chunk(start, end, prev_win, prev_dte, half_win, half_dte):
+    #Solve n in [start, end), given the results for start - 1 and for every
+    #n // 2 in the chunk (all below start). Returns (win, halve, dte) arrays.
+    #
+    #With h = "n // 2 is lost for the mover there", n is won if h holds, and
+    #otherwise n is won exactly when n - 1 is lost. So every h position is a
+    #won anchor and results alternate after it until the next anchor; before
+    #the first anchor they alternate from start - 1. Likewise dte counts up
+    #by one along -1 moves from each position whose chosen move is a halving.
+    numbers = np.arange(start, end, dtype=np.int64)
+    h = ~half_win
+    anchor = np.maximum.accumulate(np.where(h, numbers, start - 1))
+    anchor_win = np.where(anchor >= start, True, prev_win)
+    win = np.where((numbers - anchor) % 2 == 0, anchor_win, ~anchor_win)
+
+    # HalvingGame plays n - 1 unless only n // 2 wins
+    win_before = np.empty_like(win)
+    win_before[0] = prev_win
+    win_before[1:] = win[:-1]
+    halve = h & win_before
+
+    halve_anchor = np.maximum.accumulate(np.where(halve, numbers, start - 1))
+    offset = halve_anchor - start
+    anchor_dte = np.where(halve_anchor >= start,
+                          half_dte[np.maximum(offset, 0)].astype(np.int64) + 1, prev_dte)
+    dte = anchor_dte + (numbers - halve_anchor)
+    return win, halve, dte
+
+class HalvingTablebase:
+    #Win/loss, chosen move and distance to the end of the game for every
+    #number 1..limit, solved bottom-up with NumPy and stored on disk:
+    #  win.npy   - bit-packed: the player to move at n wins
+    #  halve.npy - bit-packed: the chosen move at n is n // 2 (else n - 1)
+    #  dte.npy   - uint16 moves left until 1 when both sides play the chosen moves
+    #Moves are the ones HalvingGame.minimax picks: n - 1 unless only n // 2
+    #wins. Files are opened as memory maps, so queries read single entries.
+    def __init__(self, limit, directory=DEFAULT_DIR):
+        self.limit = limit
+        self.directory = directory
+        self.win_bits = None
+        self.halve_bits = None
+        self.dte = None
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def exists(self):
+        meta_file = self._path('meta.json')
+        if not os.path.exists(meta_file):
+            return False
+        with open(meta_file, 'r') as f:
+            meta = json.load(f)
+        return meta.get('version') == TABLEBASE_VERSION and meta.get('limit', 0) >= self.limit
+
+    def load(self):
+        #Open an existing tablebase covering at least `limit`, building it if needed
+        if not self.exists():
+            self.build()
+        with open(self._path('meta.json'), 'r') as f:
+            self.limit = json.load(f)['limit']
+        self.win_bits = np.load(self._path('win.npy'), mmap_mode='r')
+        self.halve_bits = np.load(self._path('halve.npy'), mmap_mode='r')
+        self.dte = np.load(self._path('dte.npy'), mmap_mode='r')
+        return self
+
+    def build(self, verbose=False):
+        #Solve 1..limit. Numbers below IN_MEMORY_LIMIT are solved one power
+        #of two at a time in memory; after that in pieces of at most CHUNK,
+        #each reading its n // 2 results back from the files already written.
+        os.makedirs(self.directory, exist_ok=True)
+        size = self.limit + 1
+        packed = (size + 7) // 8
+        win_file = open_memmap(self._path('win.npy'), mode='w+', dtype=np.uint8, shape=(packed,))
+        halve_file = open_memmap(self._path('halve.npy'), mode='w+', dtype=np.uint8, shape=(packed,))
+        dte_file = open_memmap(self._path('dte.npy'), mode='w+', dtype=np.uint16, shape=(size,))
+        start_time = time.time()
+
+        # 0 is never reached; 1 is lost with no moves left
+        head = min(size, IN_MEMORY_LIMIT)
+        win = np.zeros(head, dtype=bool)
+        halve = np.zeros(head, dtype=bool)
+        dte = np.zeros(head, dtype=np.int64)
+        start = 2
+        while start < head:
+            end = min(2 * start, head)
+            half = np.arange(start, end) // 2
+            win[start:end], halve[start:end], dte[start:end] = _solve_chunk(
+                start, end, win[start - 1], dte[start - 1], win[half], dte[half])
+            start = end
+        self._write(win_file, halve_file, dte_file, 0, win, halve, dte)
+
+        prev_win, prev_dte = win[-1], dte[-1]
+        start = head
+        while start < size:
+            end = min(start + CHUNK, 2 * start, size)  # keep every n // 2 below start
+            lo, hi = start // 2, (end - 1) // 2 + 1
+            half_win = np.unpackbits(win_file[lo // 8:(hi + 7) // 8], bitorder='little')
+            half_win = half_win[lo % 8:lo % 8 + hi - lo].astype(bool)
+            half_dte = np.asarray(dte_file[lo:hi], dtype=np.int64)
+            numbers = np.arange(start, end) // 2 - lo
+            win, halve, dte = _solve_chunk(start, end, prev_win, prev_dte,
+                                           half_win[numbers], half_dte[numbers])
+            self._write(win_file, halve_file, dte_file, start, win, halve, dte)
+            prev_win, prev_dte = win[-1], dte[-1]
+            if verbose:
+                print(f"  solved up to {end - 1:,} ({time.time() - start_time:.1f}s)")
+            start = end
+
+        for memmap in (win_file, halve_file, dte_file):
+            memmap.flush()
+        with open(self._path('meta.json'), 'w') as f:
+            json.dump({'version': TABLEBASE_VERSION, 'limit': self.limit,
+                       'build_seconds': time.time() - start_time}, f)
+        return self
+
+    @staticmethod
+    def _write(win_file, halve_file, dte_file, start, win, halve, dte):
+        #start is a multiple of 8, so the packed bytes line up
+        if dte.max() > np.iinfo(np.uint16).max:
+            raise OverflowError("distance to end no longer fits in uint16")
+        win_file[start // 8:start // 8 + (len(win) + 7) // 8] = np.packbits(win, bitorder='little')
+        halve_file[start // 8:start // 8 + (len(halve) + 7) // 8] = np.packbits(halve, bitorder='little')
+        dte_file[start:start + len(dte)] = dte
+
+    # ---- queries ----
+    def _check(self, n):
+        if self.win_bits is None:
+            self.load()
+        if not 1 <= n <= self.limit:
+            raise ValueError(f"{n} is outside the tablebase range 1..{self.limit}")
+
+    def is_win(self, n):
+        #True if the player to move at n wins with perfect play
+        self._check(n)
+        return bool(self.win_bits[n >> 3] >> (n & 7) & 1)
+
+    def best_move(self, n):
+        #The move HalvingGame.minimax plays at n (None at 1)
+        self._check(n)
+        if n == 1:
+            return None
+        return n // 2 if self.halve_bits[n >> 3] >> (n & 7) & 1 else n - 1
+
+    def distance_to_end(self, n):
+        self._check(n)
+        return int(self.dte[n])
+
+    def minimax(self, n, is_maximizing):
+        #Same (value, move) as HalvingGame.minimax, read from the table
+        value = 1 if self.is_win(n) else -1
+        return (value if is_maximizing else -value, self.best_move(n))
+
+    def trajectory(self, n):
+        #Every number of the game from n down to 1 under the chosen moves
+        numbers = [n]
+        while n > 1:
+            n = self.best_move(n)
+            numbers.append(n)
+        return numbers
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Halving game tablebase")
+    parser.add_argument('limit', type=int, help="largest starting number to solve")
+    parser.add_argument('--directory', default=DEFAULT_DIR)
+    args = parser.parse_args()
+
+    tablebase = HalvingTablebase(args.limit, args.directory)
+    start_time = time.time()
+    tablebase.build(verbose=True)
+    tablebase.load()
+    print(f"Solved 1..{args.limit:,} in {time.time() - start_time:.1f}s")
+    for n in (10, 100, 10 ** 4, args.limit):
+        if n <= args.limit:
+            print(f"  {n:>12,}: {'win' if tablebase.is_win(n) else 'loss'} for the player to move, "
+                  f"plays {tablebase.best_move(n):,}, game ends in {tablebase.distance_to_end(n)} moves")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+import os
+import sys
+import random
+import time
+from collections import namedtuple
+
+import nim
+from Halving import HalvingGame
+from tic_tac_toe import TicTacToe, IS_WIN, FULL_MASK, EMPTY, PLAYER_X, PLAYER_O
+from mnk_game import MNKGame
+from search import Searcher, SearchStats, TranspositionTable
+
+# Result of one match: winner is 1 or 2 (0 for a draw), length the number of
+# moves played, times each player's total thinking time in seconds, stats
+# each agent's stats() once the game is over, moves the (player, move) pairs
+# in play order and move_times each player's per-move times (empty lists
+# when the match is not timed)
+MatchResult = namedtuple('MatchResult', ['winner', 'length', 'times', 'stats', 'moves', 'move_times'])
+
+class GameState:
+    #What the match loop and agents see of a game:
+    #  player     - 1 or 2, the side to move
+    #  moves()    - legal moves in the game's own move format
+    #  apply(m)   - play m for the side to move
+    #  undo()     - take back the last applied move
+    #  terminal() - None while the game goes on, else the winner (0 for a draw)
+    #  key()      - hashable position key, e.g. for transposition tables
+    #Adapters below wrap the existing game classes without copying them; the
+    #wrapped object stays available as .game for game-specific agents.
+    player = 1
+
+    def moves(self):
+        raise NotImplementedError
+
+    def apply(self, move):
+        raise NotImplementedError
+
+    def undo(self):
+        raise NotImplementedError
+
+    def terminal(self):
+        raise NotImplementedError
+
+    def key(self):
+        raise NotImplementedError
+
+    def sample(self, rng=random):
+        #Uniformly random legal move; adapters override it when the game can
+        #draw one without listing every move
+        return rng.choice(self.moves())
+
+class Agent:
+    #A player: select(state) returns a move for state.player. reset() is
+    #called before every match and stats() read after it; the defaults
+    #suit agents that keep no counters. deterministic marks agents that
+    #always answer a position with the same move, whatever they played
+    #before; harnesses may then replay a game once instead of repeating it
+    #(dedupe.distinct_starts).
+    deterministic = False
+
+    def select(self, state):
+        raise NotImplementedError
+
+    def reset(self):
+        pass
+
+    def stats(self):
+        return {}
+
+# ---- game adapters ----
+class TicTacToeState(GameState):
+    def __init__(self, game=None):
+        self.game = game if game is not None else TicTacToe()
+        self.history = []
+
+    @property
+    def player(self):
+        # TicTacToe keeps the last mover as player once the game is over, so
+        # take the side to move from the move count instead
+        return PLAYER_X if self.game.cnt % 2 == 0 else PLAYER_O
+
+    def moves(self):
+        return self.game.get_available_moves()
+
+    def apply(self, move):
+        game = self.game
+        self.history.append((game.x_bits, game.o_bits, game.player, game.cnt, game.game_over, game.winner))
+        game.make_move(*move)
+
+    def undo(self):
+        game = self.game
+        game.x_bits, game.o_bits, game.player, game.cnt, game.game_over, game.winner = self.history.pop()
+
+    def terminal(self):
+        game = self.game
+        if IS_WIN[game.x_bits]:
+            return PLAYER_X
+        if IS_WIN[game.o_bits]:
+            return PLAYER_O
+        if game.x_bits | game.o_bits == FULL_MASK:
+            return 0
+        return None
+
+    def key(self):
+        return (self.game.x_bits, self.game.o_bits)
+
+class MNKState(GameState):
+    #MNKGame on any board; like TicTacToeState, the side to move comes from
+    #the move count because MNKGame keeps the last mover once the game ends
+    def __init__(self, game=None):
+        self.game = game if game is not None else MNKGame()
+        self.history = []
+
+    @property
+    def player(self):
+        return PLAYER_X if self.game.cnt % 2 == 0 else PLAYER_O
+
+    def moves(self):
+        return self.game.get_available_moves()
+
+    def apply(self, move):
+        game = self.game
+        self.history.append((game.x_bits, game.o_bits, game.player, game.cnt, game.game_over, game.winner))
+        game.make_move(*move)
+
+    def undo(self):
+        game = self.game
+        game.x_bits, game.o_bits, game.player, game.cnt, game.game_over, game.winner = self.history.pop()
+
+    def terminal(self):
+        game = self.game
+        if game.has_line(game.x_bits):
+            return PLAYER_X
+        if game.has_line(game.o_bits):
+            return PLAYER_O
+        if game.x_bits | game.o_bits == game.full_mask:
+            return 0
+        return None
+
+    def key(self):
+        return (self.game.x_bits, self.game.o_bits)
+
+class NimState(GameState):
+    def __init__(self, piles):
+        self.game = piles if isinstance(piles, nim.NimGame) else nim.NimGame(list(piles))
+        self.player = 1
+
+    def moves(self):
+        return self.game.generate_moves()
+
+    def apply(self, move):
+        self.game.make_move(*move)
+        self.player = 3 - self.player
+
+    def undo(self):
+        self.game.unmake_move()
+        self.player = 3 - self.player
+
+    def terminal(self):
+        # The player to move with no stones left has lost
+        return 3 - self.player if self.game.stones_left == 0 else None
+
+    def key(self):
+        return nim.canonical_key(self.game.piles)
+
+    def sample(self, rng=random):
+        return self.game.sample_move(rng)
+
+class HalvingState(GameState):
+    def __init__(self, number, game=None):
+        self.game = game if game is not None else HalvingGame(number)
+        self.number = number
+        self.player = 1
+        self.history = []
+
+    def moves(self):
+        return self.game.get_moves(self.number)
+
+    def apply(self, move):
+        self.history.append(self.number)
+        self.number = move
+        self.player = 3 - self.player
+
+    def undo(self):
+        self.number = self.history.pop()
+        self.player = 3 - self.player
+
+    def terminal(self):
+        if self.game.is_game_over(self.number):
+            return self.game.winner(self.player)
+        return None
+
+    def key(self):
+        return self.number
+
+class ConnectFourState(GameState):
+    #X is player 1. The Cython extension is only imported here, so the other
+    #adapters work without a compiled Connect4 build.
+    def __init__(self, game=None):
+        connect4_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'connect4')
+        if connect4_dir not in sys.path:
+            sys.path.append(connect4_dir)
+        from connect4 import ConnectFour
+        import test as c4f
+        self.c4f = c4f
+        self.game = game if game is not None else ConnectFour()
+        self.history = []
+
+    @property
+    def player(self):
+        return 1 if self.game.current_player == 'X' else 2
+
+    def moves(self):
+        return self.game.get_valid_moves()
+
+    def apply(self, move):
+        game = self.game
+        self.history.append((game.bitboard['X'], game.bitboard['O'], game.current_player))
+        game.make_move(move)
+
+    def undo(self):
+        game = self.game
+        game.bitboard['X'], game.bitboard['O'], game.current_player = self.history.pop()
+
+    def terminal(self):
+        bitboard = self.game.bitboard
+        if self.c4f.win(bitboard['X']):
+            return 1
+        if self.c4f.win(bitboard['O']):
+            return 2
+        if not self.game.get_valid_moves():
+            return 0
+        return None
+
+    def key(self):
+        return (self.game.bitboard['X'], self.game.bitboard['O'], self.game.current_player)
+
+# ---- agents ----
+class RandomAgent(Agent):
+    def __init__(self, rng=random):
+        self.rng = rng
+
+    def select(self, state):
+        return state.sample(self.rng)
+
+class TicTacToeAgent(Agent):
+    #TicTacToe.find_best_move, a lookup-table read
+    deterministic = True
+
+    def select(self, state):
+        return state.game.find_best_move()
+
+class TicTacToeSearchAgent(Agent):
+    #Depth-limited Tic-Tac-Toe player on the shared negamax engine: its move
+    #plus depth replies, taking the centre on the empty board. Every move
+    #searches on a fresh table, so its time and nodes are that search's own
+    #rather than hits left by earlier moves and matches; totals its nodes
+    #and table hits per match.
+    deterministic = True
+
+    def __init__(self, depth, table_size=1 << 20):
+        self.depth = depth
+        self.table_size = table_size
+        self.reset()
+
+    def select(self, state):
+        game = state.game
+        if game.cnt == 0 and game.get_cell(1, 1) == EMPTY:
+            return (1, 1)
+        _, move = Searcher(TranspositionTable(self.table_size), stats=self.search_stats).search(state, self.depth + 1)
+        self.searches += 1
+        return move
+
+    def reset(self):
+        self.search_stats = SearchStats()
+        self.searches = 0
+
+    def stats(self):
+        return {'nodes': self.search_stats.nodes, 'tt_hits': self.search_stats.tt_hits, 'searches': self.searches}
+
+class MNKAgent(Agent):
+    #MNKGame.find_best_move: iterative deepening to depth on the game's own
+    #symmetry-aware table; totals its nodes and table hits per match
+    def __init__(self, depth=None, time_limit=None):
+        self.depth = depth
+        self.time_limit = time_limit
+        self.deterministic = time_limit is None  # Each game has its own table
+        self.reset()
+
+    def select(self, state):
+        game = state.game
+        move = game.find_best_move(max_depth=self.depth, time_limit=self.time_limit)
+        self.nodes += game.nodes
+        self.tt_hits += game.tt_hits
+        self.searches += 1
+        return move
+
+    def reset(self):
+        self.nodes = 0
+        self.tt_hits = 0
+        self.searches = 0
+
+    def stats(self):
+        return {'nodes': self.nodes, 'tt_hits': self.tt_hits, 'searches': self.searches}
+
+class NimAgent(Agent):
+    #nim.find_best_move: the nim-sum move when use_nim_sum is set, else
+    #depth-limited minimax, or with max_nodes iterative deepening up to depth
+    #within that many nodes a move. Search counters are kept per match.
+    def __init__(self, depth=8, use_nim_sum=True, max_nodes=None):
+        self.depth = depth
+        self.use_nim_sum = use_nim_sum
+        self.max_nodes = max_nodes
+        # Minimax reuses nim's module-level table across searches, and the
+        # nim-sum move in a lost position is a random one (sample_move)
+        self.deterministic = False
+        self.context = nim.SearchContext()
+
+    def select(self, state):
+        move, _ = nim.find_best_move(state.game, self.depth, use_nim_sum=self.use_nim_sum, ctx=self.context,
+                                     max_nodes=self.max_nodes)
+        return move
+
+    def reset(self):
+        self.context = nim.SearchContext()
+
+    def stats(self):
+        return self.context.to_dict()
+
+class HalvingAgent(Agent):
+    #HalvingGame.minimax for the side to move; its cache holds exact values
+    deterministic = True
+
+    def select(self, state):
+        _, move = state.game.minimax(state.number, state.player == 1)
+        return move
+
+class ConnectFourAgent(Agent):
+    #ConnectFour.best_move at a fixed depth, or with max_nodes the deepest
+    #iteration the extension finishes within that many nodes a move;
+    #counts the extension's nodes
+    def __init__(self, depth=8, max_nodes=None):
+        self.depth = depth
+        self.max_nodes = max_nodes
+        self.deterministic = True  # The extension keeps no table between searches
+        self.nodes = 0
+        self.completed_depth = 0
+
+    def select(self, state):
+        c4f = state.c4f
+        c4f.reset_nodes()
+        if self.max_nodes is not None:
+            move, self.completed_depth = state.game.best_move_budget(self.max_nodes)
+        else:
+            move = state.game.best_move(self.depth)
+        self.nodes += c4f.get_nodes()
+        return move
+
+    def reset(self):
+        self.nodes = 0
+        self.completed_depth = 0
+
+    def stats(self):
+        return {'nodes': self.nodes, 'completed_depth': self.completed_depth}
+
+class SearchAgent(Agent):
+    #Game-agnostic negamax from the search package for any GameState:
+    #iterative deepening to depth within time_limit seconds and max_nodes
+    #nodes a move, with a transposition table kept across moves and
+    #matches (so not deterministic: earlier searches can change the move).
+    #evaluate and order are the Searcher hooks.
+    def __init__(self, depth=8, time_limit=None, evaluate=None, order=None, table_size=1 << 20,
+                 max_nodes=None):
+        self.depth = depth
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.table = TranspositionTable(table_size)
+        self.searcher = Searcher(self.table, evaluate, order)
+
+    def select(self, state):
+        _, move, _ = self.searcher.iterative_deepening(state, self.depth, self.time_limit, self.max_nodes)
+        if move is None:
+            move = state.moves()[0]  # Not even depth 1 finished within the limits
+        return move
+
+    def reset(self):
+        self.searcher.stats = SearchStats()
+
+    def stats(self):
+        return self.searcher.stats.to_dict()
+
+# Leaf score for a NimState, the one nim.minimax searches with
+nim_sum_evaluate = nim.nim_sum_evaluate
+
+# ---- match loop ----
+def play_match(state, agent1, agent2, timed=True):
+    #Play state out between two agents and return a MatchResult. The loop
+    #keeps everything in locals and reads the clock once per move: each
+    #reading ends one move's timing and starts the next.
+    agents = (None, agent1, agent2)
+    agent1.reset()
+    agent2.reset()
+    times = [0.0, 0.0, 0.0]
+    move_times = (None, [], [])
+    moves = []
+    record = moves.append
+    terminal = state.terminal
+    apply = state.apply
+    clock = time.perf_counter
+    length = 0
+    winner = terminal()
+    last = clock() if timed else 0.0
+    while winner is None:
+        player = state.player
+        move = agents[player].select(state)
+        apply(move)
+        if timed:
+            now = clock()
+            times[player] += now - last
+            move_times[player].append(now - last)
+            last = now
+        record((player, move))
+        length += 1
+        winner = terminal()
+    return MatchResult(winner, length, (times[1], times[2]), (agent1.stats(), agent2.stats()), moves,
+                       (move_times[1], move_times[2]))
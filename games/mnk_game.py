@@ -0,0 +1,323 @@
+import time
+
+from tic_tac_toe import EMPTY, PLAYER_X, PLAYER_O, DRAW, BOARD
+
+WIN_SCORE = 1000000
+WIN_THRESHOLD = WIN_SCORE - 1000  # Scores beyond this are forced wins/losses
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class _SearchTimeout(Exception):
+    pass
+
+class MNKGame:
+    #Generalized tic-tac-toe: an m x n board where k in a row wins.
+    #Exposes the TicTacToe API (board, player, make_move, get_available_moves,
+    #check_game_over, evaluate_board, find_best_move, ...) on top of one
+    #m*n-bit integer per player. Cell (row, col) is bit row * n + col.
+    def __init__(self, m=3, n=3, k=3, tt_size=1 << 20):
+        if not 1 <= k <= max(m, n):
+            raise ValueError(f"k={k} cannot fit on a {m}x{n} board")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.x_bits = 0
+        self.o_bits = 0
+        self.player = PLAYER_X  # X (Player 1) goes first
+        self.game_over = False
+        self.winner = None
+        self.cnt = 0  # Track number of moves (game turns)
+        self.full_mask = (1 << (m * n)) - 1
+        self.tt_size = tt_size
+        self.tt = {}
+        self.nodes = 0
+        self.tt_hits = 0
+        self.completed_depth = 0
+        self._build_lines()
+        self._build_symmetries()
+        # Search centre cells first; they take part in the most lines
+        self.move_order = sorted(range(m * n), key=lambda c: (abs(c // n - (m - 1) / 2) +
+                                                             abs(c % n - (n - 1) / 2), c))
+
+    def _build_lines(self):
+        #Precompute every k-in-a-row mask and, per cell, the masks through it
+        m, n, k = self.m, self.n, self.k
+        self.win_masks = []
+        for r in range(m):
+            for c in range(n):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= end_r < m and 0 <= end_c < n:
+                        mask = 0
+                        for i in range(k):
+                            mask |= 1 << ((r + dr * i) * n + c + dc * i)
+                        self.win_masks.append(mask)
+        self.cell_masks = [[mask for mask in self.win_masks if mask >> cell & 1]
+                           for cell in range(m * n)]
+
+    def _build_symmetries(self):
+        #Cell permutations for the board's symmetry group (8 if square, else 4)
+        #plus per-row lookup tables that apply a permutation to a whole bitboard
+        m, n = self.m, self.n
+        transforms = [lambda r, c: (r, c),
+                      lambda r, c: (m - 1 - r, c),
+                      lambda r, c: (r, n - 1 - c),
+                      lambda r, c: (m - 1 - r, n - 1 - c)]
+        if m == n:
+            transforms += [lambda r, c: (c, r),
+                           lambda r, c: (n - 1 - c, r),
+                           lambda r, c: (c, m - 1 - r),
+                           lambda r, c: (n - 1 - c, m - 1 - r)]
+        self.perms = []
+        for transform in transforms:
+            perm = []
+            for cell in range(m * n):
+                r, c = transform(cell // n, cell % n)
+                perm.append(r * n + c)
+            self.perms.append(perm)
+        self.inverse_perms = [[perm.index(cell) for cell in range(m * n)] for perm in self.perms]
+        self.row_tables = []
+        for perm in self.perms:
+            tables = []
+            for r in range(m):
+                table = []
+                for pattern in range(1 << n):
+                    bits = 0
+                    for c in range(n):
+                        if pattern >> c & 1:
+                            bits |= 1 << perm[r * n + c]
+                    table.append(bits)
+                tables.append(table)
+            self.row_tables.append(tables)
+
+    def _transform(self, sym, bits):
+        tables = self.row_tables[sym]
+        row_mask = (1 << self.n) - 1
+        out = 0
+        for r in range(self.m):
+            out |= tables[r][(bits >> (r * self.n)) & row_mask]
+        return out
+
+    def canonical_key(self, me, opp):
+        #Smallest encoding of (side to move, opponent) over all board symmetries.
+        #Returns (key, symmetry index that produced it).
+        shift = self.m * self.n
+        best_key = None
+        best_sym = 0
+        for sym in range(len(self.perms)):
+            key = (self._transform(sym, me) << shift) | self._transform(sym, opp)
+            if best_key is None or key < best_key:
+                best_key = key
+                best_sym = sym
+        return best_key, best_sym
+
+    @property
+    def board(self):
+        #Nested-list view of the bitboards for printing and inspection
+        return [[self.get_cell(i, j) for j in range(self.n)] for i in range(self.m)]
+
+    def get_cell(self, row, col):
+        bit = 1 << (row * self.n + col)
+        if self.x_bits & bit:
+            return PLAYER_X
+        if self.o_bits & bit:
+            return PLAYER_O
+        return EMPTY
+
+    def print_board(self):
+        #Display the current board state with coordinates
+        board = self.board
+        print("  " + " ".join(str(j) for j in range(self.n)))
+        for i in range(self.m):
+            print(f"{i} {'|'.join(BOARD[cell] for cell in board[i])}")
+            if i < self.m - 1:
+                print("  " + "-" * (2 * self.n - 1))
+        print()
+
+    def is_valid_move(self, row, col):
+        return (0 <= row < self.m and 0 <= col < self.n and
+                not (self.x_bits | self.o_bits) >> (row * self.n + col) & 1)
+
+    def make_move(self, row, col):
+        if self.game_over or not self.is_valid_move(row, col):
+            return False
+        if self.player == PLAYER_X:
+            self.x_bits |= 1 << (row * self.n + col)
+        else:
+            self.o_bits |= 1 << (row * self.n + col)
+        self.cnt += 1
+        self.check_game_over()
+        if not self.game_over:
+            self.player = PLAYER_O if self.player == PLAYER_X else PLAYER_X
+        return True
+
+    def get_available_moves(self):
+        #Get all available (empty) positions on the board, in row-major order
+        moves = []
+        empty = ~(self.x_bits | self.o_bits) & self.full_mask
+        while empty:
+            low = empty & -empty
+            cell = low.bit_length() - 1
+            moves.append((cell // self.n, cell % self.n))
+            empty ^= low
+        return moves
+
+    def has_line(self, bits):
+        return any(bits & mask == mask for mask in self.win_masks)
+
+    def check_game_over(self):
+        #Check if the game is over and determine the winner
+        if self.has_line(self.x_bits):
+            self.game_over = True
+            self.winner = PLAYER_X
+        elif self.has_line(self.o_bits):
+            self.game_over = True
+            self.winner = PLAYER_O
+        elif self.x_bits | self.o_bits == self.full_mask:
+            self.game_over = True
+            self.winner = DRAW
+
+    def evaluate_board(self):
+        #Returns: 10 for X win, -10 for O win, 0 for draw or ongoing game
+        if self.has_line(self.x_bits):
+            return 10
+        if self.has_line(self.o_bits):
+            return -10
+        return 0
+
+    def heuristic(self, me, opp):
+        #Line-counting evaluation from the side to move's point of view:
+        #every line still open to one side scores 10^(stones in it - 1)
+        score = 0
+        for mask in self.win_masks:
+            mine = me & mask
+            theirs = opp & mask
+            if mine and not theirs:
+                score += 10 ** (bin(mine).count('1') - 1)
+            elif theirs and not mine:
+                score -= 10 ** (bin(theirs).count('1') - 1)
+        return score
+
+    def negamax(self, me, opp, depth, alpha, beta, deadline=None):
+        #Depth-limited negamax with alpha-beta and a symmetry-canonical
+        #transposition table. Scores are from the side to move's view and
+        #relative to this node, so a win in d plies scores WIN_SCORE - d.
+        self.nodes += 1
+        if deadline is not None and self.nodes & 1023 == 0 and time.time() > deadline:
+            raise _SearchTimeout()
+
+        occupied = me | opp
+        if occupied == self.full_mask:
+            return 0
+        if depth == 0:
+            return self.heuristic(me, opp)
+
+        alpha_orig = alpha
+        key, sym = self.canonical_key(me, opp)
+        entry = self.tt.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, value, flag, canonical_move = entry
+            tt_move = self.inverse_perms[sym][canonical_move]
+            if entry_depth >= depth:
+                self.tt_hits += 1
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                elif flag == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        order = self.move_order
+        if tt_move is not None:
+            order = [tt_move] + [cell for cell in order if cell != tt_move]
+
+        best = -WIN_SCORE - 1
+        best_cell = None
+        for cell in order:
+            bit = 1 << cell
+            if occupied & bit:
+                continue
+            mine = me | bit
+            if any(mine & mask == mask for mask in self.cell_masks[cell]):
+                value = WIN_SCORE - 1
+            else:
+                value = -self.negamax(opp, mine, depth - 1, -beta, -alpha, deadline)
+                # Forced results get one ply further away at every level
+                if value > WIN_THRESHOLD:
+                    value -= 1
+                elif value < -WIN_THRESHOLD:
+                    value += 1
+            if value > best:
+                best = value
+                best_cell = cell
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        if len(self.tt) >= self.tt_size:
+            self.tt.clear()
+        flag = UPPER if best <= alpha_orig else LOWER if best >= beta else EXACT
+        self.tt[key] = (depth, best, flag, self.perms[sym][best_cell])
+        return best
+
+    def find_best_move(self, max_depth=None, time_limit=None):
+        #Iterative deepening search; returns the best (row, col) from the
+        #deepest fully searched iteration within max_depth / time_limit.
+        if self.player == PLAYER_X:
+            me, opp = self.x_bits, self.o_bits
+        else:
+            me, opp = self.o_bits, self.x_bits
+        empties = self.m * self.n - bin(me | opp).count('1')
+        if empties == 0:
+            return (-1, -1)
+        if max_depth is None:
+            max_depth = empties
+        deadline = time.time() + time_limit if time_limit is not None else None
+
+        self.nodes = 0
+        self.tt_hits = 0
+        self.completed_depth = 0
+        best_cell = None
+        for depth in range(1, min(max_depth, empties) + 1):
+            try:
+                value = self.negamax(me, opp, depth, -WIN_SCORE - 1, WIN_SCORE + 1, deadline)
+            except _SearchTimeout:
+                break
+            key, sym = self.canonical_key(me, opp)
+            best_cell = self.inverse_perms[sym][self.tt[key][3]]
+            self.completed_depth = depth
+            if abs(value) > WIN_THRESHOLD:
+                break  # Result is forced; deeper search cannot change it
+
+        if best_cell is None:
+            # Not even depth 1 finished in time: play the most central free cell
+            best_cell = next(cell for cell in self.move_order if not (me | opp) >> cell & 1)
+        return (best_cell // self.n, best_cell % self.n)
+
+    def play_agent_vs_agent(self, max_depth=None, time_limit=None):
+        """Agent vs agent simulation for testing"""
+        print(f"Agent vs agent simulation on a {self.m}x{self.n} board, {self.k} in a row")
+        while not self.game_over:
+            self.print_board()
+            print(f"{BOARD[self.player]} player thinking...")
+            row, col = self.find_best_move(max_depth, time_limit)
+            self.make_move(row, col)
+            print(f"  searched depth {self.completed_depth}, {self.nodes} nodes, {self.tt_hits} TT hits")
+        self.print_board()
+        if self.winner == DRAW:
+            print("It's a draw!")
+        else:
+            print(f"Game over, {BOARD[self.winner]} player wins!")
+
+def main():
+    m = int(input("Rows (m): "))
+    n = int(input("Columns (n): "))
+    k = int(input("In a row to win (k): "))
+    game = MNKGame(m, n, k)
+    game.play_agent_vs_agent(time_limit=5.0)
+
+if __name__ == "__main__":
+    main()
@@ -4,38 +4,154 @@ import time
 import json
 from datetime import datetime
 
+from search import Searcher, SearchStats, TranspositionTable
+
+FENWICK_MIN_PILES = 64  # below this a linear scan samples moves faster
+LARGE_SCALE_PILES = 1000  # batches this wide skip per-game move logs
+
 class NimGame:
     def __init__(self, initial_piles=[3, 4, 5]):
         self.piles = initial_piles.copy()
-        self.visited_nodes = 0  # For performance tracking
         self.move_history = []  # Track game moves
+        # Kept up to date by make_move/unmake_move:
+        self.nim_sum = 0
+        self.stones_left = 0
+        # bit_piles[b]: indices of the piles with bit b set (piles never grow
+        # past their initial size, so the largest one fixes the bit count)
+        self.bit_piles = [set() for _ in range(max(self.piles, default=0).bit_length())]
+        self._fenwick = None  # prefix sums of piles, built on first large sample_move
+        for idx, stones in enumerate(self.piles):
+            self._update_index(idx, 0, stones)
+    
+    def _update_index(self, idx, old, new):
+        #Pile idx went from old to new stones: touch only the bits that changed
+        changed = old ^ new
+        self.nim_sum ^= changed
+        self.stones_left += new - old
+        bit_piles = self.bit_piles
+        while changed:
+            low = changed & -changed
+            if new & low:
+                bit_piles[low.bit_length() - 1].add(idx)
+            else:
+                bit_piles[low.bit_length() - 1].discard(idx)
+            changed ^= low
+        tree = self._fenwick
+        if tree is not None:
+            i = idx + 1
+            size = len(tree)
+            delta = new - old
+            while i < size:
+                tree[i] += delta
+                i += i & -i
         
     def make_move(self, idx, stones):
         # Validate and execute a move
         if 0 <= idx < len(self.piles) and 1 <= stones <= self.piles[idx]:
-            move = (idx, stones, self.piles[idx])
-            self.piles[idx] -= stones
-            self.move_history.append(move)
+            old = self.piles[idx]
+            self.piles[idx] = old - stones
+            self.move_history.append((idx, stones, old))
+            self._update_index(idx, old, old - stones)
             return True
         return False
     
+    def unmake_move(self):
+        # Undo the most recent move in place (inverse of make_move)
+        idx, stones, old = self.move_history.pop()
+        self.piles[idx] = old
+        self._update_index(idx, old - stones, old)
+    
     def is_game_over(self):
         #Check if all piles are empty
-        return all(pile == 0 for pile in self.piles)
+        return self.stones_left == 0
+    
+    def optimal_move(self):
+        #optimal_nim_move in O(bits): any pile holding the nim-sum's highest
+        #set bit shrinks when XORed with the nim-sum
+        if self.nim_sum == 0:
+            return None
+        # pop/add rather than next(iter()): iterating a set that has had many
+        # discards walks its dead slots, pop resumes where it left off
+        candidates = self.bit_piles[self.nim_sum.bit_length() - 1]
+        idx = candidates.pop()
+        candidates.add(idx)
+        pile = self.piles[idx]
+        return (idx, pile - (pile ^ self.nim_sum))
     
     def generate_moves(self):
         #Generate all legal moves
-        moves = []
-        for pile_idx, stones in enumerate(self.piles):
+        return list(self.iter_moves(order_by_nim_sum=False))
+    
+    def iter_moves(self, order_by_nim_sum=True):
+        #Lazily yield legal moves without building the sum(piles) list.
+        #With order_by_nim_sum the moves that leave a zero nim-sum come first,
+        #then the rest in pile order.
+        piles = self.piles
+        winning = {}  # pile index -> winning take
+        if order_by_nim_sum:
+            nim_sum = self.nim_sum
+            if nim_sum:
+                for pile_idx, stones in enumerate(piles):
+                    target = stones ^ nim_sum
+                    if target < stones:
+                        winning[pile_idx] = stones - target
+                        yield (pile_idx, stones - target)
+        for pile_idx, stones in enumerate(piles):
+            skip = winning.get(pile_idx)
             for take in range(1, stones + 1):
-                moves.append((pile_idx, take))
-        return moves
+                if take != skip:
+                    yield (pile_idx, take)
+    
+    def is_legal_move(self, idx, stones):
+        #O(1) check that make_move(idx, stones) would succeed
+        return 0 <= idx < len(self.piles) and 1 <= stones <= self.piles[idx]
+    
+    def sample_move(self, rng=random):
+        #Uniformly random legal move: pile i holds piles[i] of the
+        #sum(piles) moves, so one draw picks the pile and the take together.
+        #Draws the same move random.choice(generate_moves()) would.
+        #O(piles) for few piles; with many, a Fenwick tree of pile sizes
+        #makes it O(log piles).
+        if self.stones_left == 0:
+            return None
+        r = rng.randrange(self.stones_left)
+        if len(self.piles) < FENWICK_MIN_PILES:
+            for pile_idx, stones in enumerate(self.piles):
+                if r < stones:
+                    return (pile_idx, r + 1)
+                r -= stones
+        if self._fenwick is None:
+            self._build_fenwick()
+        tree = self._fenwick
+        size = len(tree)
+        pos = 0
+        step = 1 << (size - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < size and tree[nxt] <= r:
+                pos = nxt
+                r -= tree[nxt]
+            step >>= 1
+        return (pos, r + 1)  # tree position pos + 1 is pile index pos
+    
+    def _build_fenwick(self):
+        tree = [0] + self.piles
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._fenwick = tree
     
     def copy(self):
-        #Copy current state
-        new_game = NimGame(self.piles)
-        new_game.visited_nodes = self.visited_nodes
+        #Copy current state, including the index: it is sized for the
+        #initial piles, which unmake_move can restore from the copied history
+        new_game = NimGame.__new__(NimGame)
+        new_game.piles = self.piles.copy()
         new_game.move_history = self.move_history.copy()
+        new_game.nim_sum = self.nim_sum
+        new_game.stones_left = self.stones_left
+        new_game.bit_piles = [indices.copy() for indices in self.bit_piles]
+        new_game._fenwick = None if self._fenwick is None else self._fenwick.copy()
         return new_game
     
     def display(self):
@@ -65,86 +181,128 @@ def optimal_nim_move(piles):
             return (i, pile - target)
     return None
 
-def minimax(game_state, depth, is_maximizing, alpha=float('-inf'), beta=float('inf')):
-    #Minimax algorithm with alpha-beta pruning and depth limiting
-    game_state.visited_nodes += 1
-    
-    # Base case: terminal state
-    if game_state.is_game_over():
-        return 1 if not is_maximizing else -1  # Previous mover wins
-    
-    # Depth limit reached - use heuristic evaluation
-    if depth == 0:
-        nim_sum = calculate_nim_sum(game_state.piles)
-        return 1 if nim_sum != 0 else -1
-    
-    if is_maximizing:
-        max_eval = float('-inf')
-        for move in game_state.generate_moves():
-            new_state = game_state.copy()
-            new_state.make_move(*move)
-            eval = minimax(new_state, depth-1, False, alpha, beta)
-            max_eval = max(max_eval, eval)
-            alpha = max(alpha, eval)
-            if beta <= alpha:
-                break
-        return max_eval
-    else:
-        min_eval = float('inf')
-        for move in game_state.generate_moves():
-            new_state = game_state.copy()
-            new_state.make_move(*move)
-            eval = minimax(new_state, depth-1, True, alpha, beta)
-            min_eval = min(min_eval, eval)
-            beta = min(beta, eval)
-            if beta <= alpha:
-                break
-        return min_eval
+def canonical_key(piles):
+    #Pile order and empty piles don't matter in Nim: key on the sorted non-zero piles
+    return tuple(sorted(pile for pile in piles if pile))
+
+# Shared table used by find_best_move: the search package's table, keyed on
+# canonical_key (NimState.key()), so permutations and transpositions of a
+# position searched before are reused
+transposition_table = TranspositionTable()
+
+class SearchContext(SearchStats):
+    #Counters for the work done by one or more searches. Pass the same
+    #context to several find_best_move calls to total a whole game.
+    #The shared engine's SearchStats under Nim's names: memo_hits counts the
+    #positions answered by the transposition table (tt_hits).
+    @property
+    def memo_hits(self):
+        return self.tt_hits
+    
+    def to_dict(self):
+        return {
+            'nodes': self.nodes,
+            'cutoffs': self.cutoffs,
+            'max_depth': self.max_depth,
+            'memo_hits': self.tt_hits,
+            'completed_depth': self.completed_depth
+        }
+
+def nim_sum_evaluate(state):
+    #Leaf score for a NimState at the depth limit: the side to move wins
+    #exactly when the nim-sum is non-zero
+    return 1 if state.game.nim_sum else -1
+
+def nim_sum_order(state, moves):
+    #Search order for a NimState: moves that leave a zero nim-sum first, so
+    #a winning side cuts off at its first child (NimGame.iter_moves)
+    return list(state.game.iter_moves())
 
-def find_best_move(game_state, depth=8, use_nim_sum=True):
+def _search(game_state, table, ctx):
+    #Searcher on the shared negamax engine and the NimState it searches;
+    #the adapter plays and takes back moves on game_state itself
+    from match import NimState  # match imports this module
+    return Searcher(table, nim_sum_evaluate, nim_sum_order, ctx), NimState(game_state)
+
+def minimax(game_state, depth, is_maximizing, alpha=float('-inf'), beta=float('inf'), table=None, ctx=None):
+    #Depth-limited search of game_state on the shared negamax engine
+    #(search.Searcher) with nim-sum move ordering and leaf scores, in place
+    #with make_move/unmake_move. Returns +1 if the maximizer wins, else -1;
+    #is_maximizing says whether the maximizer is the side to move. With a
+    #table, positions that are permutations or transpositions of one already
+    #searched are reused. Work is counted in ctx (a SearchContext). The
+    #search always uses a full window, so alpha/beta are accepted for
+    #compatibility but not needed.
+    searcher, state = _search(game_state, table, ctx if ctx is not None else SearchContext())
+    score, _ = searcher.search(state, depth)
+    value = 1 if score > 0 else -1
+    return value if is_maximizing else -value
+
+def find_best_move(game_state, depth=8, use_nim_sum=True, table=transposition_table, ctx=None,
+                   max_nodes=None):
     #Find the best move using Nim-sum strategy if possible,
-    #otherwise fall back to depth-limited minimax.
+    #otherwise fall back to depth-limited search on the shared engine.
+    #Pass table=None to search without the shared transposition table.
+    #Returns (move, nodes searched by this call); pass a SearchContext as ctx
+    #to also collect cutoffs, depth reached and memo hits.
+    #With max_nodes the search deepens one ply at a time up to depth and
+    #stops at the node budget, returning the move of the deepest iteration
+    #it finished (ctx.completed_depth), or the first legal move.
+    if ctx is None:
+        ctx = SearchContext()
+    start_nodes = ctx.nodes
+    
     # First try mathematical optimal strategy if enabled
     if use_nim_sum:
-        math_move = optimal_nim_move(game_state.piles)
-        if math_move and math_move in game_state.generate_moves():
-            return math_move, 1  # Only 1 node evaluated
+        math_move = game_state.optimal_move()
+        if math_move and game_state.is_legal_move(*math_move):
+            ctx.nodes += 1  # the root position
+            return math_move, ctx.nodes - start_nodes
         elif math_move is None:
             # We're in a losing position - all moves are equally bad
             # Return a random move since we can't win anyway
-            import random
-            moves = game_state.generate_moves()
-            if moves:
-                return random.choice(moves), 1
-    
-    # Use minimax with depth limiting
-    best_move = None
-    best_value = float('-inf')
-    game_state.visited_nodes = 0
-    
-    for move in game_state.generate_moves():
-        new_state = game_state.copy()
-        new_state.make_move(*move)
-        move_value = minimax(new_state, depth-1, is_maximizing=False)
-        
-        if move_value > best_value or (move_value == best_value and best_move is None):
-            best_value = move_value
-            best_move = move
+            move = game_state.sample_move()
+            if move is not None:
+                ctx.nodes += 1
+                return move, ctx.nodes - start_nodes
+    
+    searcher, state = _search(game_state, table, ctx)
+    if max_nodes is not None:
+        _, best_move, _ = searcher.iterative_deepening(state, depth, max_nodes=max_nodes)
+        if best_move is None:
+            best_move = next(game_state.iter_moves(), None)
+    else:
+        _, best_move = searcher.search(state, depth)
     
-    return best_move, game_state.visited_nodes
+    return best_move, ctx.nodes - start_nodes
+
+def solve_position(piles, table=transposition_table):
+    #Solve a position exactly with pure search (no nim-sum shortcut): the
+    #search depth covers every remaining stone and the transposition table
+    #collapses permutations. Returns (+1 win / -1 loss for the side to move, best move)
+    game = NimGame(piles)
+    if game.is_game_over():
+        return -1, None
+    searcher, state = _search(game, table, SearchContext())
+    score, best_move = searcher.search(state, sum(piles))
+    return (1 if score > 0 else -1), best_move
 
 def random_move(game_state):
-    #Select a random valid move
-    moves = game_state.generate_moves()
-    return random.choice(moves) if moves else None
+    #Select a random valid move without enumerating them
+    return game_state.sample_move()
 
 def simulate_game(agent1_type="minimax", agent2_type="random", initial_piles=[3, 4, 5], 
-                  depth=8, verbose=False):
+                  depth=8, verbose=False, stats=None):
     #Simulate a single game between two agents
+    #"minimax" searches to depth; "nim_sum" plays the nim-sum move and only
+    #searches when it has none. Random moves search nothing.
+    #Pass a SearchContext as stats to collect the full search counters.
     #Returns: (winner, game_length, moves_history, nodes_evaluated)
     game = NimGame(initial_piles)
     current_player = 1
-    total_nodes = 0
+    if stats is None:
+        stats = SearchContext()
+    start_nodes = stats.nodes
     game_moves = []
     
     while not game.is_game_over():
@@ -155,16 +313,12 @@ def simulate_game(agent1_type="minimax", agent2_type="random", initial_piles=[3,
         # Determine move based on agent type
         if (current_player == 1 and agent1_type == "minimax") or \
            (current_player == 2 and agent2_type == "minimax"):
-            best_move, nodes = find_best_move(game, depth)
-            total_nodes += nodes
+            best_move, _ = find_best_move(game, depth, use_nim_sum=False, ctx=stats)
         elif (current_player == 1 and agent1_type == "nim_sum") or \
              (current_player == 2 and agent2_type == "nim_sum"):
-            best_move, nodes = find_best_move(game, depth, use_nim_sum=True)
-            total_nodes += nodes
+            best_move, _ = find_best_move(game, depth, use_nim_sum=True, ctx=stats)
         else:  # random player
             best_move = random_move(game)
-            nodes = 1
-            total_nodes += nodes
         
         if best_move is None:
             break
@@ -183,27 +337,46 @@ def simulate_game(agent1_type="minimax", agent2_type="random", initial_piles=[3,
         game.display()
         print(f"\nPlayer {winner} wins!")
     
-    return winner, len(game_moves), game_moves, total_nodes
+    return winner, len(game_moves), game_moves, stats.nodes - start_nodes
+
+def random_piles(num_piles, max_pile, seed=None):
+    #Random configuration for large-scale runs: num_piles piles of 1..max_pile stones
+    rng = random.Random(seed)
+    return [rng.randint(1, max_pile) for _ in range(num_piles)]
+
+def describe_piles(piles):
+    #Piles as printed in reports; large configurations are summarised
+    if len(piles) <= 20:
+        return str(piles)
+    return f"{len(piles)} piles, {sum(piles)} stones, largest {max(piles)}"
 
 def run_simulation_batch(num_games=100, agent1_type="minimax", agent2_type="random", 
-                        initial_piles=[3, 4, 5], depth=8):
+                        initial_piles=[3, 4, 5], depth=8, keep_details=None):
     #Run a batch of simulations and collect statistics
+    #keep_details stores every game's move list; by default only for
+    #configurations under LARGE_SCALE_PILES piles
+    if keep_details is None:
+        keep_details = len(initial_piles) < LARGE_SCALE_PILES
     results = {
         'agent1_wins': 0,
         'agent2_wins': 0,
         'game_lengths': [],
         'total_nodes': 0,
+        'total_cutoffs': 0,
+        'total_memo_hits': 0,
+        'max_depth_reached': 0,
         'game_details': []
     }
     
     print(f"Running {num_games} simulations: {agent1_type} vs {agent2_type}")
-    print(f"Initial piles: {initial_piles}, Search depth: {depth}")
+    print(f"Initial piles: {describe_piles(initial_piles)}, Search depth: {depth}")
     
     start_time = time.time()
     
     for i in range(num_games):
+        stats = SearchContext()
         winner, length, moves, nodes = simulate_game(
-            agent1_type, agent2_type, initial_piles, depth
+            agent1_type, agent2_type, initial_piles, depth, stats=stats
         )
         
         if winner == 1:
@@ -213,13 +386,18 @@ def run_simulation_batch(num_games=100, agent1_type="minimax", agent2_type="rand
         
         results['game_lengths'].append(length)
         results['total_nodes'] += nodes
-        results['game_details'].append({
-            'game_id': i+1,
-            'winner': winner,
-            'length': length,
-            'moves': moves,
-            'nodes_evaluated': nodes
-        })
+        results['total_cutoffs'] += stats.cutoffs
+        results['total_memo_hits'] += stats.memo_hits
+        results['max_depth_reached'] = max(results['max_depth_reached'], stats.max_depth)
+        if keep_details:
+            results['game_details'].append({
+                'game_id': i+1,
+                'winner': winner,
+                'length': length,
+                'moves': moves,
+                'nodes_evaluated': nodes,
+                'search_stats': stats.to_dict()
+            })
         
         if (i + 1) % 20 == 0:
             print(f"Completed {i + 1}/{num_games} games...")
@@ -231,6 +409,8 @@ def run_simulation_batch(num_games=100, agent1_type="minimax", agent2_type="rand
     results['agent2_win_rate'] = (results['agent2_wins'] / num_games) * 100
     results['avg_game_length'] = sum(results['game_lengths']) / len(results['game_lengths'])
     results['avg_nodes_per_game'] = results['total_nodes'] / num_games
+    results['avg_cutoffs_per_game'] = results['total_cutoffs'] / num_games
+    results['avg_memo_hits_per_game'] = results['total_memo_hits'] / num_games
     results['total_time'] = end_time - start_time
     results['games_per_second'] = num_games / results['total_time']
     
@@ -254,11 +434,40 @@ def analyze_depth_performance(depths=[2, 4, 6, 8, 10], num_games=50, initial_pil
             'win_rate': results['agent1_win_rate'],
             'avg_length': results['avg_game_length'],
             'avg_nodes': results['avg_nodes_per_game'],
+            'avg_cutoffs': results['avg_cutoffs_per_game'],
+            'avg_memo_hits': results['avg_memo_hits_per_game'],
+            'max_depth_reached': results['max_depth_reached'],
             'avg_time_per_game': results['total_time'] / num_games
         }
     
     return depth_results
 
+def analyze_large_scale(pile_counts=[1000, 10000, 100000], max_pile=1000, num_games=3, seed=0):
+    #Nim-sum vs random on wide random configurations; make_move keeps the
+    #nim-sum and per-bit pile index current, so each move costs O(bits)
+    scale_results = {}
+    
+    for num_piles in pile_counts:
+        print(f"\nTesting {num_piles} piles...")
+        piles = random_piles(num_piles, max_pile, seed)
+        results = run_simulation_batch(
+            num_games=num_games,
+            agent1_type="nim_sum",
+            agent2_type="random",
+            initial_piles=piles,
+            depth=1
+        )
+        
+        scale_results[num_piles] = {
+            'total_stones': sum(piles),
+            'win_rate': results['agent1_win_rate'],
+            'avg_length': results['avg_game_length'],
+            'avg_time_per_game': results['total_time'] / num_games,
+            'moves_per_second': sum(results['game_lengths']) / results['total_time']
+        }
+    
+    return scale_results
+
 def save_simulation_results(results, filename=None):
     #Save results
     if filename is None:
@@ -323,27 +532,15 @@ def comprehensive_nim_analysis():
     )
     results['depth_analysis'] = depth_results
     
-    # 3. Different initial configurations
+    # 3. Every initial configuration, solved exactly
     print("\n3. INITIAL CONFIGURATION ANALYSIS")
     print("-" * 40)
-    configurations = [
-        [1, 2, 3],
-        [3, 4, 5],
-        [2, 4, 6],
-        [1, 3, 5, 7]
-    ]
-    
-    config_results = {}
-    for config in configurations:
-        print(f"Testing configuration {config}...")
-        config_result = run_simulation_batch(
-            num_games=50,
-            agent1_type="nim_sum",
-            agent2_type="random",
-            initial_piles=config,
-            depth=8
-        )
-        config_results[str(config)] = config_result
+    from nim_census import run_census, summarize_census
+    census_rows = run_census(num_piles=4, max_pile=7)
+    config_results = summarize_census(census_rows)
+    for group in config_results.values():
+        print(f"{group['description']}: {group['configurations']} configurations, "
+              f"{group['p_positions']} P positions, {group['win_rate']:.1f}% exact win rate")
     
     results['configuration_analysis'] = config_results
     
@@ -357,6 +554,11 @@ def comprehensive_nim_analysis():
     }
     results['agent_comparison'] = agent_comparisons
     
+    # 5. Large-scale configurations
+    print("\n5. LARGE-SCALE ANALYSIS")
+    print("-" * 40)
+    results['large_scale_analysis'] = analyze_large_scale()
+    
     # Save comprehensive results
     filename = save_simulation_results(results, "output/text/nim_comprehensive_analysis.json")
     
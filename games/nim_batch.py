@@ -0,0 +1,123 @@
+import time
+
+import numpy as np
+
+BATCH_AGENTS = ("nim_sum", "random")
+CHUNK_GAMES = 1 << 18  # games held in memory at once
+
+def _nim_sum_moves(piles, rng):
+    #Vectorized optimal_nim_move: XOR-reduce each row, then take from the
+    #first pile that shrinks when XORed with the nim-sum. Rows already at
+    #nim-sum 0 are lost and play a random move, as find_best_move does.
+    nim_sum = np.bitwise_xor.reduce(piles, axis=1)
+    targets = piles ^ nim_sum[:, None]
+    shrinks = targets < piles
+    cols = np.argmax(shrinks, axis=1)
+    rows = np.arange(len(piles))
+    takes = piles[rows, cols] - targets[rows, cols]
+
+    lost = nim_sum == 0
+    if lost.any():
+        rand_cols, rand_takes = _random_moves(piles[lost], rng)
+        cols[lost] = rand_cols
+        takes[lost] = rand_takes
+    return cols, takes
+
+def _random_moves(piles, rng):
+    #Vectorized NimGame.sample_move: one uniform draw over each row's
+    #sum(piles) moves picks the pile (weighted by its size) and the take
+    totals = piles.sum(axis=1)
+    draws = rng.integers(0, totals)
+    ends = np.cumsum(piles, axis=1)
+    cols = (ends <= draws[:, None]).sum(axis=1)
+    rows = np.arange(len(piles))
+    takes = draws - (ends[rows, cols] - piles[rows, cols]) + 1
+    return cols, takes
+
+_MOVERS = {"nim_sum": _nim_sum_moves, "random": _random_moves}
+
+def _play_chunk(initial_piles, num_games, agents, rng):
+    #Play num_games games from the same start; returns (winners, lengths)
+    piles = np.tile(np.asarray(initial_piles, dtype=np.int64), (num_games, 1))
+    winners = np.zeros(num_games, dtype=np.int8)
+    lengths = np.zeros(num_games, dtype=np.int64)
+    active = np.flatnonzero(piles.sum(axis=1) > 0)
+    # An empty start is lost by the player to move
+    winners[piles.sum(axis=1) == 0] = 2
+
+    step = 0
+    while len(active):
+        player = 1 + step % 2
+        state = piles[active]
+        cols, takes = _MOVERS[agents[player - 1]](state, rng)
+        state[np.arange(len(active)), cols] -= takes
+        piles[active] = state
+
+        finished = state.sum(axis=1) == 0
+        done = active[finished]
+        winners[done] = player  # took the last stone
+        lengths[done] = step + 1
+        active = active[~finished]
+        step += 1
+    return winners, lengths
+
+def simulate_batch(num_games=1000000, agent1_type="nim_sum", agent2_type="random",
+                   initial_piles=[3, 4, 5], seed=None, verbose=True):
+    #Play num_games Nim games at once as an (N x piles) matrix, advancing
+    #every unfinished game by one move per step. Agent 1 moves first.
+    #Supports the "nim_sum" and "random" agents; returns statistics in the
+    #same shape as run_simulation_batch, without per-game move logs.
+    for agent in (agent1_type, agent2_type):
+        if agent not in BATCH_AGENTS:
+            raise ValueError(f"Batch simulation supports {BATCH_AGENTS}, not {agent!r}")
+    rng = np.random.default_rng(seed)
+    agents = (agent1_type, agent2_type)
+
+    if verbose:
+        print(f"Running {num_games} batch simulations: {agent1_type} vs {agent2_type}")
+        print(f"Initial piles: {initial_piles}")
+
+    start_time = time.time()
+    agent1_wins = 0
+    length_counts = np.zeros(0, dtype=np.int64)
+    for start in range(0, num_games, CHUNK_GAMES):
+        count = min(CHUNK_GAMES, num_games - start)
+        winners, lengths = _play_chunk(initial_piles, count, agents, rng)
+        agent1_wins += int((winners == 1).sum())
+        counts = np.bincount(lengths)
+        if len(counts) > len(length_counts):
+            counts[:len(length_counts)] += length_counts
+            length_counts = counts
+        else:
+            length_counts[:len(counts)] += counts
+    end_time = time.time()
+
+    win_rate = agent1_wins / num_games
+    # 95% normal-approximation interval on agent 1's win rate
+    margin = 1.96 * (win_rate * (1 - win_rate) / num_games) ** 0.5
+    total_time = end_time - start_time
+    return {
+        'agent1_wins': agent1_wins,
+        'agent2_wins': num_games - agent1_wins,
+        'agent1_win_rate': win_rate * 100,
+        'agent2_win_rate': (1 - win_rate) * 100,
+        'win_rate_ci95': (max(0.0, win_rate - margin) * 100, min(1.0, win_rate + margin) * 100),
+        'game_length_counts': length_counts.tolist(),
+        'avg_game_length': float((np.arange(len(length_counts)) * length_counts).sum() / num_games),
+        'total_time': total_time,
+        'games_per_second': num_games / total_time if total_time > 0 else 0
+    }
+
+def main():
+    for agents, piles in [(("nim_sum", "random"), [3, 4, 5]),
+                          (("random", "nim_sum"), [3, 4, 5]),
+                          (("random", "random"), [3, 4, 5]),
+                          (("nim_sum", "random"), [1, 2, 3])]:
+        results = simulate_batch(1000000, *agents, initial_piles=piles, seed=0, verbose=False)
+        low, high = results['win_rate_ci95']
+        print(f"{agents[0]:>7} vs {agents[1]:<7} {str(piles):<10} "
+              f"{results['agent1_win_rate']:6.2f}% [{low:.2f}, {high:.2f}]  "
+              f"{results['games_per_second']:,.0f} games/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import os
+import csv
+import argparse
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'output', 'text')
+
+def census_filename(num_piles, max_pile):
+    return os.path.join(OUTPUT_DIR, f'nim_census_k{num_piles}_s{max_pile}.csv')
+
+def pile_grids(num_piles, max_pile):
+    #One broadcastable index array per pile over the (max_pile + 1)^num_piles grid
+    return np.ix_(*[np.arange(max_pile + 1)] * num_piles)
+
+def _sum_over_moves(values):
+    #For every position x, the sum of values over all positions reachable in
+    #one move: along each pile axis that is an exclusive prefix sum, since
+    #taking 1..x_i stones reaches indices 0..x_i - 1
+    total = np.zeros_like(values)
+    for axis in range(values.ndim):
+        prefix = np.cumsum(values, axis=axis)
+        shifted = np.zeros_like(values)
+        dest = [slice(None)] * values.ndim
+        src = [slice(None)] * values.ndim
+        dest[axis] = slice(1, None)
+        src[axis] = slice(None, -1)
+        shifted[tuple(dest)] = prefix[tuple(src)]
+        total += shifted
+    return total
+
+def solve_census(num_piles, max_pile):
+    #Classify every ordered configuration of num_piles piles of 0..max_pile
+    #stones and compute the exact probability that the nim-sum agent beats a
+    #uniformly random opponent (both pick uniformly among all legal moves
+    #when they have nothing better; the nim-sum agent does so only when lost).
+    #Returns (nim_sum, win_first, win_second) arrays indexed by pile sizes:
+    #win_first with the nim-sum agent to move, win_second with random to move.
+    #  N position, agent to move:  1 (it moves to a P position and keeps doing so)
+    #  P position, random to move: 1 (every move leaves an N position)
+    #  P position, agent to move:  mean of win_second over its moves
+    #  N position, random to move: mean of win_first over its moves
+    #  empty board: the side to move has lost
+    grids = pile_grids(num_piles, max_pile)
+    nim_sum = np.zeros((max_pile + 1,) * num_piles, dtype=np.int64)
+    totals = np.zeros_like(nim_sum)
+    for grid in grids:
+        nim_sum = nim_sum ^ grid
+        totals = totals + grid
+    is_p = nim_sum == 0
+    moves = np.maximum(totals, 1)
+
+    win_first = np.where(is_p, 0.0, 1.0)
+    win_second = np.where(is_p, 1.0, 0.0)
+    open_p = is_p & (totals > 0)
+    # Jacobi sweeps: after m sweeps every position within m moves of the end
+    # is exact, so the values stop changing within num_piles * max_pile sweeps
+    for _ in range(num_piles * max_pile + 1):
+        new_first = np.where(open_p, _sum_over_moves(win_second) / moves, win_first)
+        new_second = np.where(is_p, win_second, _sum_over_moves(win_first) / moves)
+        if np.array_equal(new_first, win_first) and np.array_equal(new_second, win_second):
+            break
+        win_first, win_second = new_first, new_second
+    return nim_sum, win_first, win_second
+
+def run_census(num_piles=4, max_pile=7, filename=None):
+    #Every configuration of up to num_piles piles of at most max_pile stones,
+    #listed once as sorted non-zero piles. Writes one CSV row per
+    #configuration and returns the rows.
+    nim_sum, win_first, win_second = solve_census(num_piles, max_pile)
+    rows = []
+    for config in combinations_with_replacement(range(max_pile + 1), num_piles):
+        piles = [p for p in config if p]
+        if not piles:
+            continue
+        rows.append({
+            'piles': ' '.join(str(p) for p in piles),
+            'num_piles': len(piles),
+            'total_stones': sum(piles),
+            'nim_sum': int(nim_sum[config]),
+            'outcome': 'P' if nim_sum[config] == 0 else 'N',
+            'win_first': float(win_first[config]),
+            'win_second': float(win_second[config])
+        })
+
+    if filename is None:
+        filename = census_filename(num_piles, max_pile)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({**row, 'win_first': f"{row['win_first']:.6f}",
+                             'win_second': f"{row['win_second']:.6f}"})
+    print(f"Census of {len(rows)} configurations saved to {filename}")
+    return rows
+
+def summarize_census(rows):
+    #Per pile count: configurations, P positions and the nim-sum agent's
+    #exact win rate (moving first) averaged over and bounded across them
+    summary = {}
+    for row in rows:
+        group = summary.setdefault(row['num_piles'], {
+            'description': f"{row['num_piles']} pile{'s' if row['num_piles'] > 1 else ''}",
+            'configurations': 0,
+            'p_positions': 0,
+            'win_rates': []
+        })
+        group['configurations'] += 1
+        group['p_positions'] += row['outcome'] == 'P'
+        group['win_rates'].append(row['win_first'] * 100)
+    for group in summary.values():
+        rates = group.pop('win_rates')
+        group['win_rate'] = sum(rates) / len(rates)
+        group['min_win_rate'] = min(rates)
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Exhaustive Nim P/N census")
+    parser.add_argument('--piles', type=int, default=4, help="maximum number of piles")
+    parser.add_argument('--max-pile', type=int, default=7, help="maximum stones per pile")
+    args = parser.parse_args()
+
+    rows = run_census(args.piles, args.max_pile)
+    for num_piles, group in summarize_census(rows).items():
+        print(f"{group['description']:<8} {group['configurations']:>6} configurations, "
+              f"{group['p_positions']:>5} P positions, nim-sum vs random "
+              f"{group['win_rate']:.2f}% (min {group['min_win_rate']:.2f}%)")
+
+if __name__ == "__main__":
+    main()
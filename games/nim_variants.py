@@ -0,0 +1,340 @@
+import os
+import random
+import hashlib
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'output', 'cache')
+TABLE_VERSION = 1
+DEFAULT_MAX_PILE = 1024
+
+_grundy_tables = {}  # takes -> in-memory Grundy table
+
+def _cache_file(takes):
+    #One .npy file per pile rule; long subtraction sets are hashed into the name
+    if takes is None:
+        name = 'all'
+    else:
+        name = '-'.join(str(t) for t in takes)
+        if len(name) > 40:
+            name = hashlib.sha1(name.encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f'nim_grundy_v{TABLE_VERSION}_{name}.npy')
+
+def _find_period(g, n, span):
+    #If the last `span` values of g[:n] repeat with some period p, every later
+    #value does too (each value depends only on the `span` values before it).
+    #Returns (start, p) for the smallest such p, or None.
+    window = g[n - span:n]
+    for p in range(1, n - span + 1):
+        if np.array_equal(window, g[n - span - p:n - p]):
+            return n - span - p, p
+    return None
+
+def compute_grundy_table(takes, max_pile):
+    #Grundy values g[0..max_pile] for one pile when a move removes any count
+    #in `takes` (a sorted tuple), or any count at all when takes is None.
+    #Values are filled a block at a time: with smallest take t, the next t
+    #values only depend on values already known, so their options and mex
+    #are computed as one array operation. Subtraction games with a finite
+    #set are eventually periodic, so once a period shows up the rest of the
+    #table is tiled from it.
+    if takes is None:
+        return np.arange(max_pile + 1, dtype=np.int64)
+
+    take_arr = np.array(takes, dtype=np.int64)
+    span = int(take_arr[-1])
+    g = np.zeros(max_pile + 1, dtype=np.int64)
+    n = 1
+    next_check = 4 * span
+    while n <= max_pile:
+        block = np.arange(n, min(n + takes[0], max_pile + 1))
+        sources = block[:, None] - take_arr[None, :]
+        legal = sources >= 0
+        options = np.where(legal, g[np.maximum(sources, 0)], len(takes) + 1)
+        # mex of each row: first value in 0..len(takes) not among its options
+        seen = np.zeros((len(block), len(takes) + 2), dtype=bool)
+        seen[np.arange(len(block))[:, None], options] = True
+        g[block] = np.argmin(seen, axis=1)
+        n = block[-1] + 1
+
+        if n >= next_check and n <= max_pile:
+            period = _find_period(g, n, span)
+            if period is not None:
+                start, p = period
+                rest = np.arange(n, max_pile + 1)
+                g[rest] = g[start + (rest - start) % p]
+                break
+            next_check *= 2
+    return g
+
+def grundy_table(takes, max_pile=DEFAULT_MAX_PILE, use_cache=True):
+    #Grundy table for one pile rule covering at least 0..max_pile, from
+    #memory, then the disk cache, then computed (and cached)
+    table = _grundy_tables.get(takes)
+    if table is not None and len(table) > max_pile:
+        return table
+    filename = _cache_file(takes)
+    if use_cache and os.path.exists(filename):
+        table = np.load(filename)
+    if table is None or len(table) <= max_pile:
+        table = compute_grundy_table(takes, max_pile)
+        if use_cache:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            np.save(filename, table)
+    _grundy_tables[takes] = table
+    return table
+
+class NimVariant:
+    #Rules for a take-away game on several piles:
+    #  subtraction_set - allowed numbers of stones per move (None: any number)
+    #  max_take        - cap on stones per move, one int for every pile or a
+    #                    list with one cap (or None) per pile index
+    #  misere          - the player who takes the last stone loses
+    #A player with no legal move has lost under normal play (won under misère).
+    #Normal play is solved by Sprague-Grundy: XOR the per-pile Grundy values.
+    #Misère play uses the tame rule when a brute-force check up to
+    #verify_piles piles of verify_max stones agrees with it, and an exact
+    #memoized search otherwise.
+    def __init__(self, subtraction_set=None, max_take=None, misere=False,
+                 max_pile=DEFAULT_MAX_PILE, use_cache=True, verify_piles=3, verify_max=12):
+        self.subtraction_set = tuple(sorted(set(subtraction_set))) if subtraction_set else None
+        if self.subtraction_set and self.subtraction_set[0] < 1:
+            raise ValueError("subtraction set entries must be positive")
+        self.max_take = max_take
+        self.misere = misere
+        self.max_pile = max_pile
+        self.use_cache = use_cache
+        self.verify_piles = verify_piles
+        self.verify_max = verify_max
+        self._tame = None
+        self._search_wins = lru_cache(maxsize=None)(self._search_wins_uncached)
+
+    def pile_takes(self, pile_idx):
+        #Sorted tuple of the stone counts one move may remove from this pile,
+        #or None when any count is allowed
+        limit = self.max_take[pile_idx] if isinstance(self.max_take, (list, tuple)) else self.max_take
+        if self.subtraction_set is None:
+            return None if limit is None else tuple(range(1, limit + 1))
+        if limit is None:
+            return self.subtraction_set
+        return tuple(t for t in self.subtraction_set if t <= limit)
+
+    def description(self):
+        parts = []
+        if self.subtraction_set:
+            parts.append(f"subtraction set {list(self.subtraction_set)}")
+        if self.max_take is not None:
+            parts.append(f"max take {self.max_take}")
+        if not parts:
+            parts.append("unrestricted takes")
+        parts.append("misère" if self.misere else "normal play")
+        return ", ".join(parts)
+
+    def grundy(self, pile_idx, stones):
+        takes = self.pile_takes(pile_idx)
+        if takes is None:
+            return stones
+        table = grundy_table(takes, max(self.max_pile, stones), self.use_cache)
+        return int(table[stones])
+
+    def legal_takes(self, pile_idx, stones):
+        takes = self.pile_takes(pile_idx)
+        if takes is None:
+            return range(1, stones + 1)
+        return [t for t in takes if t <= stones]
+
+    def is_legal_move(self, piles, idx, stones):
+        if not (0 <= idx < len(piles) and 1 <= stones <= piles[idx]):
+            return False
+        takes = self.pile_takes(idx)
+        return takes is None or stones in takes
+
+    def generate_moves(self, piles):
+        return [(i, t) for i, pile in enumerate(piles) for t in self.legal_takes(i, pile)]
+
+    def has_moves(self, piles):
+        return any(self.legal_takes(i, pile) for i, pile in enumerate(piles))
+
+    def grundy_values(self, piles):
+        return [self.grundy(i, pile) for i, pile in enumerate(piles)]
+
+    def _take_to_value(self, pile_idx, stones, target):
+        #A legal take from this pile leaving Grundy value `target`
+        takes = self.pile_takes(pile_idx)
+        if takes is None:
+            return stones - target if target < stones else None
+        for t in self.legal_takes(pile_idx, stones):
+            if self.grundy(pile_idx, stones - t) == target:
+                return t
+        return None
+
+    # ---- misère ----
+    def _tame_is_losing(self, values):
+        #Tame misère rule: with every Grundy value at most 1 the side to move
+        #loses on an odd nim-sum, otherwise on a zero nim-sum as in normal play
+        nim_sum = 0
+        for v in values:
+            nim_sum ^= v
+        if all(v <= 1 for v in values):
+            return nim_sum == 1
+        return nim_sum == 0
+
+    def _search_is_losing(self, piles):
+        return not self._search_wins(tuple(piles))
+
+    def _search_wins_uncached(self, piles):
+        #Exact misère outcome: True if the side to move wins
+        moves = self.generate_moves(piles)
+        if not moves:
+            return True  # no move left: the opponent made the last move and lost
+        for idx, take in moves:
+            child = list(piles)
+            child[idx] -= take
+            if not self._search_wins(tuple(child)):
+                return True
+        return False
+
+    def verify_misere_tame(self):
+        #Compare the tame rule with exact search on every position of up to
+        #verify_piles piles with at most verify_max stones each
+        max_piles = self.verify_piles
+        if isinstance(self.max_take, (list, tuple)):
+            max_piles = min(max_piles, len(self.max_take))
+        for num_piles in range(1, max_piles + 1):
+            for piles in product(range(self.verify_max + 1), repeat=num_piles):
+                if self._tame_is_losing(self.grundy_values(piles)) != self._search_is_losing(piles):
+                    return False
+        return True
+
+    def misere_is_tame(self):
+        if self._tame is None:
+            self._tame = self.verify_misere_tame()
+        return self._tame
+
+    # ---- strategy ----
+    def is_losing(self, piles):
+        #True if the side to move loses with perfect play
+        if not self.misere:
+            nim_sum = 0
+            for i, pile in enumerate(piles):
+                nim_sum ^= self.grundy(i, pile)
+            return nim_sum == 0
+        if self.misere_is_tame():
+            return self._tame_is_losing(self.grundy_values(piles))
+        return self._search_is_losing(piles)
+
+    def optimal_move(self, piles):
+        #A winning (pile_index, stones_to_take), or None if every move loses
+        #(or there is no move). O(piles) table lookups plus one scan of the
+        #chosen pile's allowed takes.
+        if self.misere and not self.misere_is_tame():
+            for idx, take in self.generate_moves(piles):
+                child = list(piles)
+                child[idx] -= take
+                if self._search_is_losing(child):
+                    return (idx, take)
+            return None
+
+        values = self.grundy_values(piles)
+        nim_sum = 0
+        for v in values:
+            nim_sum ^= v
+        big = [i for i, v in enumerate(values) if v >= 2]
+
+        if self.misere and len(big) <= 1:
+            ones = sum(1 for v in values if v == 1)
+            if not big:
+                # Leave an odd number of 1s: flip one component between 0 and 1
+                if ones % 2 == 1:
+                    return None
+                for i, v in enumerate(values):
+                    take = self._take_to_value(i, piles[i], 1 - v)
+                    if take is not None:
+                        return (i, take)
+                return None
+            # Reduce the only big component to 0 or 1 so the count of 1s is odd
+            i = big[0]
+            target = 1 if ones % 2 == 0 else 0
+            return (i, self._take_to_value(i, piles[i], target))
+
+        if nim_sum == 0:
+            return None
+        for i, v in enumerate(values):
+            if v ^ nim_sum < v:
+                return (i, self._take_to_value(i, piles[i], v ^ nim_sum))
+        return None
+
+class VariantNimGame:
+    #NimGame-style state for a NimVariant
+    def __init__(self, variant, initial_piles=[3, 4, 5]):
+        self.variant = variant
+        self.piles = initial_piles.copy()
+        self.move_history = []
+
+    def make_move(self, idx, stones):
+        if self.variant.is_legal_move(self.piles, idx, stones):
+            self.move_history.append((idx, stones, self.piles[idx]))
+            self.piles[idx] -= stones
+            return True
+        return False
+
+    def unmake_move(self):
+        idx, stones, _ = self.move_history.pop()
+        self.piles[idx] += stones
+
+    def is_game_over(self):
+        return not self.variant.has_moves(self.piles)
+
+    def generate_moves(self):
+        return self.variant.generate_moves(self.piles)
+
+def optimal_agent(game):
+    #Perfect play from the Grundy tables; any legal move when already lost
+    move = game.variant.optimal_move(game.piles)
+    if move is None:
+        moves = game.generate_moves()
+        return random.choice(moves) if moves else None
+    return move
+
+def random_agent(game):
+    moves = game.generate_moves()
+    return random.choice(moves) if moves else None
+
+def simulate_variant_game(variant, agent1=optimal_agent, agent2=random_agent, initial_piles=[3, 4, 5]):
+    #Play one game; returns (winner, game_length)
+    game = VariantNimGame(variant, initial_piles)
+    current_player = 1
+    length = 0
+    while not game.is_game_over():
+        agent = agent1 if current_player == 1 else agent2
+        game.make_move(*agent(game))
+        length += 1
+        current_player = 3 - current_player
+    # current_player has no move: under normal play they lose, under misère
+    # the opponent made the last move and loses
+    winner = current_player if variant.misere else 3 - current_player
+    return winner, length
+
+def main():
+    variants = [
+        NimVariant(),
+        NimVariant(subtraction_set=[1, 3, 4]),
+        NimVariant(max_take=3),
+        NimVariant(max_take=[2, 3, None]),
+        NimVariant(misere=True),
+        NimVariant(subtraction_set=[1, 2], misere=True),
+    ]
+    for variant in variants:
+        wins = 0
+        games = 200
+        for _ in range(games):
+            winner, _ = simulate_variant_game(variant, initial_piles=[7, 9, 12])
+            wins += winner == 1
+        losing = variant.is_losing([7, 9, 12])
+        print(f"{variant.description():<45} start {'P' if losing else 'N'}, "
+              f"optimal vs random: {wins / games:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+#Game-agnostic search over any match.GameState (moves, apply, undo, terminal, key).
+#The df-pn solver is imported from search.pns, which also runs as a script.
+from .table import TranspositionTable, EXACT, LOWER, UPPER
+from .negamax import (Searcher, SearchStats, negamax, iterative_deepening,
+                      WIN_SCORE, WIN_THRESHOLD)
+
+__all__ = [
+    'TranspositionTable', 'EXACT', 'LOWER', 'UPPER',
+    'Searcher', 'SearchStats', 'negamax', 'iterative_deepening',
+    'WIN_SCORE', 'WIN_THRESHOLD',
+]
@@ -0,0 +1,170 @@
+import time
+
+from .table import EXACT, LOWER, UPPER
+
+WIN_SCORE = 1000000
+WIN_THRESHOLD = WIN_SCORE - 1000  # Scores beyond this are forced wins/losses
+
+class _SearchStopped(Exception):
+    pass  # deadline or node budget reached
+
+class SearchStats:
+    #Counters for one or more searches, like nim.SearchContext
+    def __init__(self):
+        self.nodes = 0            # positions visited, including the root
+        self.cutoffs = 0          # alpha-beta cutoffs
+        self.tt_hits = 0          # table entries deep enough to use
+        self.max_depth = 0        # deepest ply reached below a root
+        self.completed_depth = 0  # last fully searched iteration
+
+    def merge(self, other):
+        self.nodes += other.nodes
+        self.cutoffs += other.cutoffs
+        self.tt_hits += other.tt_hits
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.completed_depth = max(self.completed_depth, other.completed_depth)
+
+    def to_dict(self):
+        return {
+            'nodes': self.nodes,
+            'cutoffs': self.cutoffs,
+            'tt_hits': self.tt_hits,
+            'max_depth': self.max_depth,
+            'completed_depth': self.completed_depth
+        }
+
+class Searcher:
+    #Depth-limited negamax with alpha-beta over any match.GameState: the
+    #search plays and takes back moves on the one state with apply/undo, so
+    #no position is copied. Scores are from the side to move's view and
+    #relative to the node, as in MNKGame.negamax: a position won in d plies
+    #scores WIN_SCORE - d, a draw 0, and a position at the depth limit
+    #evaluate(state) (0 without one; keep it within +-WIN_THRESHOLD).
+    #Hooks:
+    #  table    - TranspositionTable (or anything with get/store), keyed on
+    #             state.key(); its best move is also tried first
+    #  order    - order(state, moves) -> moves in the order to search them
+    #  evaluate - leaf score at the depth limit
+    def __init__(self, table=None, evaluate=None, order=None, stats=None):
+        self.table = table
+        self.evaluate = evaluate
+        self.order = order
+        self.stats = stats if stats is not None else SearchStats()
+        self.deadline = None
+        self.node_limit = None
+        self.best_move = None  # root move of the last finished search
+
+    def negamax(self, state, depth, alpha=-WIN_SCORE - 1, beta=WIN_SCORE + 1, ply=0):
+        stats = self.stats
+        stats.nodes += 1
+        if ply > stats.max_depth:
+            stats.max_depth = ply
+        if self.deadline is not None and stats.nodes & 1023 == 0 and time.time() > self.deadline:
+            raise _SearchStopped()
+        if self.node_limit is not None and stats.nodes > self.node_limit:
+            raise _SearchStopped()
+
+        winner = state.terminal()
+        if winner is not None:
+            if winner == 0:
+                return 0
+            return WIN_SCORE if winner == state.player else -WIN_SCORE
+        if depth == 0:
+            return self.evaluate(state) if self.evaluate is not None else 0
+
+        alpha_orig = alpha
+        table = self.table
+        tt_move = None
+        if table is not None:
+            key = state.key()
+            entry = table.get(key)
+            if entry is not None:
+                entry_depth, value, flag, tt_move = entry
+                if entry_depth >= depth and ply > 0:
+                    stats.tt_hits += 1
+                    if flag == EXACT:
+                        return value
+                    if flag == LOWER:
+                        alpha = max(alpha, value)
+                    elif flag == UPPER:
+                        beta = min(beta, value)
+                    if alpha >= beta:
+                        return value
+
+        moves = state.moves()
+        if self.order is not None:
+            moves = self.order(state, moves)
+        if tt_move is not None and tt_move in moves:
+            moves = [tt_move] + [move for move in moves if move != tt_move]
+
+        best = -WIN_SCORE - 1
+        best_move = None
+        apply = state.apply
+        undo = state.undo
+        for move in moves:
+            apply(move)
+            try:
+                value = -self.negamax(state, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                undo()
+            # Forced results get one ply further away at every level
+            if value > WIN_THRESHOLD:
+                value -= 1
+            elif value < -WIN_THRESHOLD:
+                value += 1
+            if value > best:
+                best = value
+                best_move = move
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                stats.cutoffs += 1
+                break
+
+        if table is not None:
+            flag = UPPER if best <= alpha_orig else LOWER if best >= beta else EXACT
+            table.store(key, (depth, best, flag, best_move))
+        if ply == 0:
+            self.best_move = best_move
+        return best
+
+    def search(self, state, depth):
+        #(value, move) of a fixed-depth search from state
+        self.deadline = None
+        self.node_limit = None
+        value = self.negamax(state, depth)
+        self.stats.completed_depth = depth
+        return value, self.best_move
+
+    def iterative_deepening(self, state, max_depth, time_limit=None, max_nodes=None):
+        #Search depth 1, 2, ... max_depth, each iteration seeding the next
+        #through the table's best moves, and return (value, move, depth) of
+        #the deepest iteration that finished before time_limit seconds and
+        #within max_nodes nodes of this call. A forced win or loss ends the
+        #deepening early. depth is 0 (and move None) when not even depth 1
+        #finished.
+        self.deadline = time.time() + time_limit if time_limit is not None else None
+        self.node_limit = self.stats.nodes + max_nodes if max_nodes is not None else None
+        result = (0, None, 0)
+        try:
+            for depth in range(1, max_depth + 1):
+                value = self.negamax(state, depth)
+                result = (value, self.best_move, depth)
+                self.stats.completed_depth = depth
+                if abs(value) > WIN_THRESHOLD:
+                    break  # Result is forced; deeper search cannot change it
+        except _SearchStopped:
+            pass
+        finally:
+            self.deadline = None
+            self.node_limit = None
+        return result
+
+def negamax(state, depth, table=None, evaluate=None, order=None, stats=None):
+    #(value, move) of a fixed-depth search; see Searcher for the hooks
+    return Searcher(table, evaluate, order, stats).search(state, depth)
+
+def iterative_deepening(state, max_depth, time_limit=None, table=None, evaluate=None, order=None, stats=None,
+                        max_nodes=None):
+    #(value, move, completed depth); see Searcher.iterative_deepening
+    return Searcher(table, evaluate, order, stats).iterative_deepening(state, max_depth, time_limit, max_nodes)
@@ -0,0 +1,211 @@
+import sys
+import time
+from collections import namedtuple
+
+INFINITE = 1 << 60  # proof/disproof number of a settled position
+
+# Result of a df-pn run: outcome is +1 if the player to move at the root wins,
+# -1 if they lose and 0 for a draw (None when unsolved), nodes the positions
+# expanded, proof_size the positions in the proof tree and gcs the table
+# collections it took
+ProofResult = namedtuple('ProofResult', ['outcome', 'nodes', 'proof_size', 'gcs'])
+
+class ProofTable:
+    #Memory-bounded table of key -> [pn, dn, work] for df-pn, where work is
+    #the number of expansions spent below the position. Past max_size the
+    #least-worked half of the unsettled entries is dropped (SmallTreeGC):
+    #those are the cheapest to search again. Settled entries stay unless
+    #there is nothing else left to drop, so max_size should comfortably
+    #exceed the proof being built or the search keeps re-proving it.
+    def __init__(self, max_size=1 << 20):
+        self.max_size = max_size
+        self.entries = {}
+        self.gcs = 0
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def store(self, key, pn, dn, work):
+        entries = self.entries
+        if len(entries) >= self.max_size and key not in entries:
+            self.collect()
+        entries[key] = [pn, dn, work]
+
+    def collect(self):
+        entries = self.entries
+        open_keys = [key for key, (pn, dn, _) in entries.items() if pn and dn]
+        if len(open_keys) < len(entries) // 4:
+            open_keys = list(entries)
+        open_keys.sort(key=lambda key: entries[key][2])
+        for key in open_keys[:len(open_keys) // 2 + 1]:
+            del entries[key]
+        self.gcs += 1
+
+    def __len__(self):
+        return len(self.entries)
+
+class ProofNumberSearch:
+    #Depth-first proof-number search (df-pn) on any match.GameState with
+    #apply/undo/terminal/key. prove(state, attacker) settles whether
+    #attacker can force a win: positions where attacker moves are OR nodes,
+    #the rest AND nodes, and a draw counts against the attacker, so games
+    #with draws (Connect4) are handled by asking each side in turn. Proof
+    #(pn) and disproof (dn) numbers live in a ProofTable keyed on
+    #(state.key(), attacker to move), so transpositions share work.
+    #Unknown positions start at pn = dn = 1. Recursion follows the game, so
+    #very long games raise the interpreter's recursion limit as needed.
+    def __init__(self, max_size=1 << 20):
+        self.table = ProofTable(max_size)
+        self.nodes = 0
+
+    def _lookup(self, key):
+        entry = self.table.get(key)
+        return (entry[0], entry[1]) if entry is not None else (1, 1)
+
+    def _mid(self, state, attacker, pn_limit, dn_limit):
+        #Expand state until its pn or dn reaches its limit; returns (pn, dn)
+        self.nodes += 1
+        start_nodes = self.nodes
+        key = (state.key(), state.player == attacker)
+        winner = state.terminal()
+        if winner is not None:
+            pn, dn = (0, INFINITE) if winner == attacker else (INFINITE, 0)
+            self.table.store(key, pn, dn, 0)
+            return pn, dn
+
+        or_node = state.player == attacker
+        moves = state.moves()
+        child_keys = []
+        for move in moves:
+            state.apply(move)
+            child_keys.append((state.key(), state.player == attacker))
+            state.undo()
+
+        while True:
+            # Child numbers, from the table or 1/1 for unseen children
+            best = best_index = None
+            second = INFINITE
+            total = 0
+            for i, child_key in enumerate(child_keys):
+                child_pn, child_dn = self._lookup(child_key)
+                select, other = (child_pn, child_dn) if or_node else (child_dn, child_pn)
+                total = min(total + other, INFINITE)
+                if best is None or select < best:
+                    if best is not None:
+                        second = best
+                    best, best_index = select, i
+                elif select < second:
+                    second = select
+            pn, dn = (best, total) if or_node else (total, best)
+            if pn >= pn_limit or dn >= dn_limit:
+                break
+
+            child_pn, child_dn = self._lookup(child_keys[best_index])
+            if or_node:
+                child_pn_limit = min(pn_limit, second + 1)
+                child_dn_limit = min(dn_limit - dn + child_dn, INFINITE)
+            else:
+                child_dn_limit = min(dn_limit, second + 1)
+                child_pn_limit = min(pn_limit - pn + child_pn, INFINITE)
+            state.apply(moves[best_index])
+            try:
+                self._mid(state, attacker, child_pn_limit, child_dn_limit)
+            finally:
+                state.undo()
+
+        self.table.store(key, pn, dn, self.nodes - start_nodes)
+        return pn, dn
+
+    def prove(self, state, attacker=None):
+        #True if attacker (default: the player to move) can force a win
+        if attacker is None:
+            attacker = state.player
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, 10000))
+        try:
+            pn, _ = self._mid(state, attacker, INFINITE, INFINITE)
+        finally:
+            sys.setrecursionlimit(limit)
+        return pn == 0
+
+    def proof_size(self, state, attacker=None):
+        #Distinct positions in one proof (or disproof) tree of state, read
+        #back from the table: one proven child at a settled OR node, every
+        #child at an AND node (the reverse for a disproof). None if a
+        #position it needs was collected.
+        if attacker is None:
+            attacker = state.player
+        seen = set()
+
+        def visit():
+            key = (state.key(), state.player == attacker)
+            if key in seen:
+                return True
+            entry = self.table.get(key)
+            if entry is None:
+                return False
+            seen.add(key)
+            if state.terminal() is not None:
+                return True
+            proven = entry[0] == 0
+            # A proof needs one move at OR nodes, a disproof one at AND nodes
+            one_move = proven == (state.player == attacker)
+            for move in state.moves():
+                state.apply(move)
+                child = self.table.get((state.key(), state.player == attacker))
+                settled = child is not None and (child[0] == 0 if proven else child[1] == 0)
+                if one_move and not settled:
+                    state.undo()
+                    continue
+                ok = visit()
+                state.undo()
+                if not ok:
+                    return False
+                if one_move:
+                    return True
+            return not one_move
+
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, 10000))
+        try:
+            return len(seen) if visit() else None
+        finally:
+            sys.setrecursionlimit(limit)
+
+def solve(state, max_size=1 << 20, draws=False):
+    #ProofResult for the player to move. In games without draws one proof
+    #settles it; with draws=True a failed proof is followed by one for the
+    #opponent, and a position neither side can win is a draw.
+    search = ProofNumberSearch(max_size)
+    player = state.player
+    if search.prove(state, player):
+        return ProofResult(1, search.nodes, search.proof_size(state, player), search.table.gcs)
+    if not draws:
+        return ProofResult(-1, search.nodes, search.proof_size(state, player), search.table.gcs)
+    opponent = 3 - player
+    if search.prove(state, opponent):
+        return ProofResult(-1, search.nodes, search.proof_size(state, opponent), search.table.gcs)
+    return ProofResult(0, search.nodes, None, search.table.gcs)
+
+def main():
+    #Which starts are decided, and at what cost, well past the range the
+    #minimax searches reach
+    from match import HalvingState, NimState
+
+    print("Halving (player to move)")
+    for exponent in (3, 6, 9, 12, 15, 18):
+        n = 10 ** exponent
+        start_time = time.time()
+        result = solve(HalvingState(n))
+        print(f"  {n:>25,}: {'win' if result.outcome == 1 else 'loss'}, {result.nodes:,} nodes, "
+              f"proof {result.proof_size} positions, {time.time() - start_time:.2f}s")
+
+    print("Nim (player to move)")
+    for piles in ([3, 5, 7], [1, 2, 3, 4, 5], [5, 7, 9, 11], [1, 2, 3, 4, 5, 6, 7]):
+        start_time = time.time()
+        result = solve(NimState(piles))
+        print(f"  {str(piles):>25}: {'win' if result.outcome == 1 else 'loss'}, {result.nodes:,} nodes, "
+              f"proof {result.proof_size} positions, {time.time() - start_time:.2f}s")
+
+if __name__ == "__main__":
+    main()
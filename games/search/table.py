@@ -0,0 +1,37 @@
+EXACT, LOWER, UPPER = 0, 1, 2  # bound type of a stored value
+
+class TranspositionTable:
+    #Bounded map from a position key to (depth, value, flag, move), as
+    #MNKGame keeps it: values are from the side to move's view and relative
+    #to the position, so an entry serves every path that reaches it. When
+    #full, the table is emptied rather than aged entry by entry, which keeps
+    #store() a single dict write. Any object with get(key) and
+    #store(key, entry) can take its place in a search.
+    def __init__(self, max_size=1 << 20):
+        self.max_size = max_size
+        self.entries = {}
+        self.clears = 0
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def store(self, key, entry):
+        entries = self.entries
+        if len(entries) >= self.max_size and key not in entries:
+            entries.clear()
+            self.clears += 1
+        entries[key] = entry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+        self.clears = 0
+
+    def stats(self):
+        return {
+            'size': len(self.entries),
+            'max_size': self.max_size,
+            'clears': self.clears
+        }
@@ -1,3 +1,5 @@
+import json
+import os
 import time
 
 EMPTY = 0
@@ -10,32 +12,172 @@ BOARD = {
     PLAYER_O: 'O'
 }
 
+# Bitboard layout: cell (row, col) is bit row * 3 + col of a 9-bit integer,
+# one integer per player. All win, draw and index checks are table lookups
+# indexed by those integers.
+FULL_MASK = (1 << 9) - 1
+WIN_MASKS = [
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100                # diagonals
+]
+CELL_MOVES = [(k // 3, k % 3) for k in range(9)]
+IS_WIN = [any(bits & mask == mask for mask in WIN_MASKS) for bits in range(1 << 9)]
+# Base-3 index contribution of a player's bitboard (cell (0, 0) most significant)
+X_INDEX = [sum(3 ** (8 - k) for k in range(9) if bits >> k & 1) for bits in range(1 << 9)]
+O_INDEX = [2 * value for value in X_INDEX]
+
+# Perfect-play table indexed by the board read row-major as a base-3 number.
+# Each reachable entry is (value, best_moves): value is what minimax(0, ...)
+# returns for the position and best_moves are the optimal (row, col) moves in
+# the order find_best_move's search would consider them. Unreachable and
+# finished positions map to None.
+TABLE_SIZE = 3 ** 9
+TABLE_VERSION = 1
+TABLE_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'output', 'cache', 'tic_tac_toe_table.json')
+_lookup_table = None
+
+def solve_lookup_table():
+    #Solve every position reachable from the empty board in one memoized pass
+    values = [None] * TABLE_SIZE
+    table = [None] * TABLE_SIZE
+
+    def solve(x_bits, o_bits, x_to_move):
+        idx = X_INDEX[x_bits] + O_INDEX[o_bits]
+        if values[idx] is not None:
+            return values[idx]
+        if IS_WIN[x_bits] or IS_WIN[o_bits] or x_bits | o_bits == FULL_MASK:
+            values[idx] = 10 if IS_WIN[x_bits] else -10 if IS_WIN[o_bits] else 0
+            return values[idx]
+        moves = []
+        child_values = []
+        for k in range(9):
+            bit = 1 << k
+            if (x_bits | o_bits) & bit:
+                continue
+            moves.append(CELL_MOVES[k])
+            if x_to_move:
+                child_values.append(solve(x_bits | bit, o_bits, False))
+            else:
+                child_values.append(solve(x_bits, o_bits | bit, True))
+        best = max(child_values) if x_to_move else min(child_values)
+        # A child won in k plies is worth one point less once a ply further away
+        values[idx] = best - 1 if best > 0 else best + 1 if best < 0 else 0
+        table[idx] = (values[idx], [m for m, v in zip(moves, child_values) if v == best])
+        return values[idx]
+
+    solve(0, 0, True)
+    return table
+
+def load_lookup_table(filename=TABLE_CACHE_FILE):
+    #Load the solved table from the cache file, solving and caching it if missing
+    global _lookup_table
+    if _lookup_table is not None:
+        return _lookup_table
+    table = None
+    if filename and os.path.exists(filename):
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        if data.get('version') == TABLE_VERSION and len(data.get('table', [])) == TABLE_SIZE:
+            table = [None if entry is None else (entry[0], [tuple(m) for m in entry[1]])
+                     for entry in data['table']]
+    if table is None:
+        table = solve_lookup_table()
+        if filename:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            with open(filename, 'w') as f:
+                json.dump({'version': TABLE_VERSION, 'table': table}, f)
+    _lookup_table = table
+    return table
+
+def verify_lookup_table():
+    #Check every table entry against the alpha-beta search; returns mismatching indices
+    mismatches = []
+    game = TicTacToe()
+    for idx, entry in enumerate(load_lookup_table()):
+        if entry is None:
+            continue
+        cells = []
+        rest = idx
+        for _ in range(9):
+            cells.append(rest % 3)
+            rest //= 3
+        cells.reverse()
+        game.board = [cells[0:3], cells[3:6], cells[6:9]]
+        game.player = PLAYER_X if cells.count(PLAYER_X) == cells.count(PLAYER_O) else PLAYER_O
+        game.cnt = 9 - cells.count(EMPTY)
+        if game.cnt == 0:
+            continue  # find_best_move always opens in the center
+        if game.search_best_move() != entry[1][0]:
+            mismatches.append(idx)
+    return mismatches
+
 class TicTacToe:
     def __init__(self):
-        # Initialize empty 3x3 board using nested lists
-        self.board = [[EMPTY for _ in range(3)] for _ in range(3)]
+        # Initialize empty board as one 9-bit integer per player
+        self.x_bits = 0
+        self.o_bits = 0
         self.player = PLAYER_X  # X (Player 1) goes first
         self.game_over = False
         self.winner = None
         self.cnt = 0  # Track number of moves (game turns)
+    
+    @property
+    def board(self):
+        #Read-only rows of the bitboards for printing and inspection. They are
+        #tuples so that a board[i][j] = ... write fails instead of being lost;
+        #write a cell with set_cell, or assign the whole board.
+        return tuple(tuple(self.get_cell(i, j) for j in range(3)) for i in range(3))
+    
+    @board.setter
+    def board(self, rows):
+        self.x_bits = 0
+        self.o_bits = 0
+        for i in range(3):
+            for j in range(3):
+                self.set_cell(i, j, rows[i][j])
+    
+    def get_cell(self, row, col):
+        bit = 1 << (row * 3 + col)
+        if self.x_bits & bit:
+            return PLAYER_X
+        if self.o_bits & bit:
+            return PLAYER_O
+        return EMPTY
+    
+    def set_cell(self, row, col, value):
+        #Place PLAYER_X/PLAYER_O on a cell, or clear it with EMPTY
+        bit = 1 << (row * 3 + col)
+        self.x_bits &= ~bit
+        self.o_bits &= ~bit
+        if value == PLAYER_X:
+            self.x_bits |= bit
+        elif value == PLAYER_O:
+            self.o_bits |= bit
+    
+    def index(self):
+        #Base-3 table index of the current board
+        return X_INDEX[self.x_bits] + O_INDEX[self.o_bits]
         
     def print_board(self):
         #Display the current board state with coordinates
+        board = self.board
         print("  0 1 2")
         for i in range(3):
-            row = [BOARD[self.board[i][j]] for j in range(3)]
+            row = [BOARD[board[i][j]] for j in range(3)]
             print(f"{i} {'|'.join(row)}")
             if i < 2:
                 print("  -----")
         print()
     
     def is_valid_move(self, row, col):
-        return 0 <= row <= 2 and 0 <= col <= 2 and self.board[row][col] == EMPTY
+        return 0 <= row <= 2 and 0 <= col <= 2 and not (self.x_bits | self.o_bits) >> (row * 3 + col) & 1
     
     def make_move(self, row, col):
         if self.game_over or not self.is_valid_move(row, col):
             return False
-        self.board[row][col] = self.player
+        self.set_cell(row, col, self.player)
         self.cnt += 1
         self.check_game_over()
         if not self.game_over:
@@ -43,64 +185,34 @@ class TicTacToe:
         return True
     
     def get_available_moves(self):
-        #Get all available (empty) positions on the board
+        #Get all available (empty) positions on the board, in row-major order
         moves = []
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == EMPTY:
-                    moves.append((i,j))
+        empty = ~(self.x_bits | self.o_bits) & FULL_MASK
+        while empty:
+            low = empty & -empty
+            moves.append(CELL_MOVES[low.bit_length() - 1])
+            empty ^= low
         return moves
     
     def check_game_over(self):
         #Check if the game is over and determine the winner
-        # Check rows
-        for i in range(3):
-            if self.board[i][0] == self.board[i][1] == self.board[i][2] != EMPTY:
-                self.game_over = True
-                self.winner = self.board[i][0]
-                return
-        # Check columns
-        for j in range(3):
-            if self.board[0][j] == self.board[1][j] == self.board[2][j] != EMPTY:
-                self.game_over = True
-                self.winner = self.board[0][j]
-                return
-        # Check diagonals
-        if self.board[0][0] == self.board[1][1] == self.board[2][2] != EMPTY:
+        if IS_WIN[self.x_bits]:
             self.game_over = True
-            self.winner = self.board[0][0]
-            return
-        if self.board[0][2] == self.board[1][1] == self.board[2][0] != EMPTY:
+            self.winner = PLAYER_X
+        elif IS_WIN[self.o_bits]:
             self.game_over = True
-            self.winner = self.board[0][2]
-            return
-        # Check for a draw
-        flag = True
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == EMPTY:
-                    flag = False
-                    break
-        if flag == True:
+            self.winner = PLAYER_O
+        elif self.x_bits | self.o_bits == FULL_MASK:
             self.game_over = True
             self.winner = DRAW
     
     def evaluate_board(self):
         #Evaluate the board state for minimax algorithm (helper function for utility evaluation)
         #Returns: 10 for X win, -10 for O win, 0 for draw or ongoing game
-        # Check rows
-        for i in range(3):
-            if self.board[i][0] == self.board[i][1] == self.board[i][2] != EMPTY:
-                return 10 if self.board[i][0] == PLAYER_X else -10
-        # Check columns
-        for j in range(3):
-            if self.board[0][j] == self.board[1][j] == self.board[2][j] != EMPTY:
-                return 10 if self.board[0][j] == PLAYER_X else -10
-        # Check diagonals
-        if self.board[0][0] == self.board[1][1] == self.board[2][2] != EMPTY:
-            return 10 if self.board[0][0] == PLAYER_X else -10
-        if self.board[0][2] == self.board[1][1] == self.board[2][0] != EMPTY:
-            return 10 if self.board[0][2] == PLAYER_X else -10
+        if IS_WIN[self.x_bits]:
+            return 10
+        if IS_WIN[self.o_bits]:
+            return -10
         # Draw or ongoing game
         return 0
     
@@ -113,65 +225,78 @@ class TicTacToe:
         #Returns:
             #Best score for the current player
 
-        score = self.evaluate_board()
         # Terminal state evaluation with depth consideration
-        if score == 10:
-            return score - depth  # Prefer faster wins
-        if score == -10:
-            return score + depth  # Prefer slower losses
-        if len(self.get_available_moves()) == 0:
+        if IS_WIN[self.x_bits]:
+            return 10 - depth  # Prefer faster wins
+        if IS_WIN[self.o_bits]:
+            return -10 + depth  # Prefer slower losses
+        occupied = self.x_bits | self.o_bits
+        if occupied == FULL_MASK:
             return 0
         
         if is_maximizing:
             best = float('-inf')
-            for i in range(3):
-                for j in range(3):
-                    if self.board[i][j] == EMPTY:
-                        self.board[i][j] = PLAYER_X
-                        best = max(best, self.minimax(depth + 1, False, alpha, beta))
-                        self.board[i][j] = EMPTY
-                        # Alpha-Beta pruning
-                        alpha = max(alpha, best)
-                        if beta <= alpha:
-                            break
+            for k in range(9):
+                bit = 1 << k
+                if not occupied & bit:
+                    self.x_bits |= bit
+                    best = max(best, self.minimax(depth + 1, False, alpha, beta))
+                    self.x_bits ^= bit
+                    # Alpha-Beta pruning
+                    alpha = max(alpha, best)
+                    if beta <= alpha:
+                        break
             return best
         else:
             best = float('inf')
-            for i in range(3):
-                for j in range(3):
-                    if self.board[i][j] == EMPTY:
-                        self.board[i][j] = PLAYER_O
-                        best = min(best, self.minimax(depth + 1, True, alpha, beta))
-                        self.board[i][j] = EMPTY
-                        # Alpha-Beta pruning
-                        beta = min(beta, best)
-                        if beta <= alpha:
-                            break
+            for k in range(9):
+                bit = 1 << k
+                if not occupied & bit:
+                    self.o_bits |= bit
+                    best = min(best, self.minimax(depth + 1, True, alpha, beta))
+                    self.o_bits ^= bit
+                    # Alpha-Beta pruning
+                    beta = min(beta, best)
+                    if beta <= alpha:
+                        break
             return best
     
     def find_best_move(self):
+        #Find the best move for the current player with an O(1) perfect-play table lookup
+        # Special case: if it's the first move and center is available, choose center
+        if self.cnt==0 and not (self.x_bits | self.o_bits) & (1 << 4):
+            return (1, 1)
+        
+        entry = load_lookup_table()[self.index()]
+        x_count = bin(self.x_bits).count('1')
+        o_count = bin(self.o_bits).count('1')
+        to_move = PLAYER_X if x_count == o_count else PLAYER_O
+        if entry is not None and self.player == to_move:
+            return entry[1][0]
+        # Positions outside the table (set up by hand) fall back to the search
+        return self.search_best_move()
+    
+    def search_best_move(self):
         #Find the best move for the current player based on the minimax algorithm
         # Special case: if it's the first move and center is available, choose center
-        if self.cnt==0 and self.board[1][1] == EMPTY:
+        if self.cnt==0 and not (self.x_bits | self.o_bits) & (1 << 4):
             return (1, 1)
         
         best_val = float('-inf') if self.player == PLAYER_X else float('inf')
         best_move = (-1, -1)
 
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == EMPTY:
-                    self.board[i][j] = self.player
-                    move_val = self.minimax(0, self.player == PLAYER_O)
-                    self.board[i][j] = EMPTY
-                    if self.player == PLAYER_X:
-                        if move_val > best_val or (move_val == best_val and best_move == (-1, -1)):
-                            best_move = (i, j)
-                            best_val = move_val
-                    else:
-                        if move_val < best_val or (move_val == best_val and best_move == (-1, -1)):
-                            best_move = (i, j)
-                            best_val = move_val
+        for row, col in self.get_available_moves():
+            self.set_cell(row, col, self.player)
+            move_val = self.minimax(0, self.player == PLAYER_O)
+            self.set_cell(row, col, EMPTY)
+            if self.player == PLAYER_X:
+                if move_val > best_val or (move_val == best_val and best_move == (-1, -1)):
+                    best_move = (row, col)
+                    best_val = move_val
+            else:
+                if move_val < best_val or (move_val == best_val and best_move == (-1, -1)):
+                    best_move = (row, col)
+                    best_val = move_val
         
         return best_move
     
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The games and analysis modules import each other as top-level modules,
+# the same way the scripts put their directories on sys.path
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+for directory in ('games', 'games/connect4', 'analysis'):
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.append(path)
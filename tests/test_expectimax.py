@@ -0,0 +1,9 @@
+import nim
+from expectimax import nim_exact, nim_minimax_agent, rates
+
+def test_nim_minimax_cost_does_not_depend_on_the_shared_table():
+    nim.transposition_table.clear()
+    first = rates(nim_exact([2, 3, 4], nim_minimax_agent(6), "random"))
+    nim.solve_position([3, 4, 4])
+    nim.find_best_move(nim.NimGame([2, 3, 4]), depth=6, use_nim_sum=False)
+    assert rates(nim_exact([2, 3, 4], nim_minimax_agent(6), "random")) == first
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from Halving import HalvingGame
+from halving_automaton import HalvingAutomaton
+from halving_tablebase import HalvingTablebase
+
+BUILD = 1 << 12
+VERIFY = 1 << 16
+
+@pytest.fixture(scope="module")
+def tablebase(tmp_path_factory):
+    return HalvingTablebase(VERIFY, str(tmp_path_factory.mktemp("tablebase"))).load()
+
+@pytest.fixture(scope="module")
+def automaton(tablebase):
+    return HalvingAutomaton.build(BUILD, VERIFY, tablebase)
+
+def test_automaton_matches_halving_game(automaton):
+    HalvingGame.clear_cache()
+    for n in range(1, 400):
+        for is_maximizing in (True, False):
+            assert automaton.minimax(n, is_maximizing) == HalvingGame(n).minimax(n, is_maximizing), n
+    HalvingGame.clear_cache()
+
+def test_automaton_matches_tablebase_beyond_the_build_range(automaton, tablebase):
+    assert automaton.verified_limit == VERIFY
+    for n in range(BUILD, VERIFY + 1, 97):
+        assert automaton.is_win(n) == tablebase.is_win(n), n
+        assert automaton.best_move(n) == tablebase.best_move(n), n
+    numbers = np.arange(1, VERIFY + 1, dtype=np.uint64)
+    expected = np.array([tablebase.is_win(n) for n in range(1, VERIFY + 1)])
+    assert np.array_equal(automaton.win_mask(numbers), expected)
+
+def test_outcome_runs_cover_the_range(automaton):
+    runs = automaton.outcome_runs(10, 500)
+    assert runs[0][0] == 10 and runs[-1][1] == 500
+    for (_, last, win), (first, _, next_win) in zip(runs, runs[1:]):
+        assert first == last + 1 and win != next_win
+    for first, last, win in runs:
+        assert all(automaton.is_win(n) == win for n in range(first, last + 1))
+
+def test_verify_rejects_a_wrong_automaton(automaton, tablebase):
+    wrong = HalvingAutomaton(automaton.transitions, automaton.outputs ^ 2)  # flip every outcome
+    with pytest.raises(RuntimeError):
+        wrong.verify(tablebase, 100)
+    with pytest.raises(ValueError):
+        automaton.is_win(0)
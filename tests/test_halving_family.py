@@ -0,0 +1,61 @@
+import itertools
+import sys
+from functools import lru_cache
+
+import pytest
+
+from halving_family import RuleSet, solve, check, MIN_BLOCK
+
+LIMIT = 300
+MOVE_SETS = [
+    ((1,), (2,)),        # Halving's moves: the alternating solver
+    ((1,), ()),
+    ((1,), (2, 3)),
+    ((1, 2), (2,)),      # smallest subtraction under MIN_BLOCK: the loop
+    ((2,), (3,)),
+    ((2,), ()),
+    ((), (2,)),
+    ((MIN_BLOCK, MIN_BLOCK + 3), (2,)),  # vectorized blocks
+    ((MIN_BLOCK + 8,), (3, 5)),
+]
+RULE_SETS = [RuleSet(subtract, divisors, rounding, terminal, misere)
+             for (subtract, divisors), rounding, terminal, misere
+             in itertools.product(MOVE_SETS, ['floor', 'ceil'], [0, 1], [False, True])]
+
+def brute_force(rules, limit):
+    # Plain recursion over the rules as documented, sharing no code with
+    # solve(): (win, index of the first move to a lost position, else of the
+    # first legal move, else -1) for every number from terminal to limit
+    def children(n):
+        results = [n - s if n - s >= rules.terminal else None for s in rules.subtract]
+        for k in rules.divisors:
+            child = n // k if rules.rounding == 'floor' else (n + k - 1) // k
+            results.append(child if rules.terminal <= child < n else None)
+        return results
+
+    @lru_cache(maxsize=None)
+    def outcome(n):
+        legal = [i for i, child in enumerate(children(n)) if child is not None]
+        if not legal:
+            return rules.misere, -1
+        for i in legal:
+            if not outcome(children(n)[i])[0]:
+                return True, i
+        return False, legal[0]
+
+    limit_before = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit_before, 4 * limit + 100))
+    try:
+        return {n: outcome(n) for n in range(rules.terminal, limit + 1)}
+    finally:
+        sys.setrecursionlimit(limit_before)
+
+@pytest.mark.parametrize('rules', RULE_SETS, ids=repr)
+def test_solve_matches_brute_force(rules):
+    win, choice = solve(rules, LIMIT)
+    for n, (expected_win, expected_choice) in brute_force(rules, LIMIT).items():
+        assert (bool(win[n]), int(choice[n])) == (expected_win, expected_choice), n
+
+@pytest.mark.parametrize('rules', RULE_SETS[::4], ids=repr)
+def test_check_finds_no_differences(rules):
+    assert check(rules, LIMIT) == []
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import halving_tablebase
+from Halving import HalvingGame
+from halving_tablebase import HalvingTablebase
+
+LIMIT = 5000
+
+def halving_dp(limit):
+    # win[n]: the player to move at n wins; move[n]: n - 1 unless only n // 2 wins
+    win = [False, False]
+    move = [None, None]
+    for n in range(2, limit + 1):
+        win.append(not win[n - 1] or not win[n // 2])
+        move.append(n - 1 if not win[n - 1] or win[n // 2] else n // 2)
+    return win, move
+
+@pytest.fixture(scope="module")
+def chunked(tmp_path_factory):
+    # Small in-memory head and chunks, so the on-disk pass is exercised
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(halving_tablebase, 'IN_MEMORY_LIMIT', 256)
+        mp.setattr(halving_tablebase, 'CHUNK', 64)
+        return HalvingTablebase(LIMIT, str(tmp_path_factory.mktemp("chunked"))).load()
+
+def test_tablebase_matches_brute_force(chunked):
+    win, move = halving_dp(LIMIT)
+    for n in range(1, LIMIT + 1):
+        assert chunked.is_win(n) == win[n], n
+        assert chunked.best_move(n) == move[n], n
+        assert chunked.distance_to_end(n) == len(chunked.trajectory(n)) - 1, n
+
+def test_tablebase_minimax_matches_halving_game(chunked):
+    HalvingGame.clear_cache()
+    for n in range(1, 400):
+        for is_maximizing in (True, False):
+            assert chunked.minimax(n, is_maximizing) == HalvingGame(n).minimax(n, is_maximizing), n
+    HalvingGame.clear_cache()
+
+def test_chunked_build_matches_in_memory_build(chunked, tmp_path):
+    whole = HalvingTablebase(LIMIT, str(tmp_path)).load()
+    for name in ('win_bits', 'halve_bits', 'dte'):
+        assert np.array_equal(getattr(whole, name), getattr(chunked, name))
+
+def test_existing_tablebase_is_reused_and_range_checked(chunked):
+    smaller = HalvingTablebase(100, chunked.directory)
+    assert smaller.exists()
+    assert not HalvingTablebase(LIMIT + 1, chunked.directory).exists()
+    smaller.load()
+    assert smaller.limit == LIMIT  # opens the larger table already on disk
+    with pytest.raises(ValueError):
+        smaller.is_win(LIMIT + 1)
+    with pytest.raises(ValueError):
+        smaller.best_move(0)
@@ -0,0 +1,81 @@
+from functools import lru_cache
+
+import pytest
+
+from mnk_game import MNKGame, WIN_THRESHOLD, WIN_SCORE
+from tic_tac_toe import PLAYER_X, PLAYER_O, solve_lookup_table, X_INDEX, O_INDEX
+
+def brute_force(m, n, k):
+    # Plain memoized minimax with its own line list: value (+1/0/-1) for the
+    # side to move at (me, opp)
+    lines = []
+    for r in range(m):
+        for c in range(n):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                cells = [(r + i * dr, c + i * dc) for i in range(k)]
+                if all(0 <= rr < m and 0 <= cc < n for rr, cc in cells):
+                    lines.append(sum(1 << (rr * n + cc) for rr, cc in cells))
+    full = (1 << (m * n)) - 1
+
+    @lru_cache(maxsize=None)
+    def value(me, opp):
+        if any(opp & line == line for line in lines):
+            return -1
+        if me | opp == full:
+            return 0
+        return max(-value(opp, me | 1 << cell) for cell in range(m * n) if not (me | opp) >> cell & 1)
+    return value
+
+def search_value(game):
+    # Sign of MNKGame's full-depth negamax score for the side to move
+    me, opp = (game.x_bits, game.o_bits) if game.player == PLAYER_X else (game.o_bits, game.x_bits)
+    score = game.negamax(me, opp, game.m * game.n, -WIN_SCORE - 1, WIN_SCORE + 1)
+    return 1 if score > WIN_THRESHOLD else -1 if score < -WIN_THRESHOLD else 0
+
+def play(game, moves):
+    for move in moves:
+        assert game.make_move(*move)
+    return game
+
+@pytest.mark.parametrize('m, n, k', [(3, 3, 3), (2, 3, 2), (3, 4, 3), (2, 5, 3), (4, 3, 3)])
+def test_negamax_matches_brute_force(m, n, k):
+    value = brute_force(m, n, k)
+    openings = [[], [(0, 0)], [(m - 1, n - 1)], [(0, 0), (m - 1, n - 1)], [(1, 1), (0, 1)]]
+    for moves in openings:
+        game = play(MNKGame(m, n, k), moves)
+        if game.game_over:
+            continue
+        me, opp = (game.x_bits, game.o_bits) if game.player == PLAYER_X else (game.o_bits, game.x_bits)
+        assert search_value(game) == value(me, opp), moves
+
+def test_best_move_matches_tic_tac_toe_lookup_table():
+    table = solve_lookup_table()
+    openings = [[(0, 0)], [(1, 1)], [(0, 1), (1, 1)], [(0, 0), (0, 1)], [(1, 1), (0, 0), (2, 2)]]
+    for moves in openings:
+        game = play(MNKGame(), moves)
+        expected, best_moves = table[X_INDEX[game.x_bits] + O_INDEX[game.o_bits]]
+        move = game.find_best_move()
+        assert move in best_moves, moves
+        # The lookup table scores from X's point of view
+        x_value = (expected > 0) - (expected < 0)
+        assert search_value(game) == (x_value if game.player == PLAYER_X else -x_value)
+
+def test_symmetric_positions_share_a_key():
+    game = MNKGame(4, 4, 3)
+    corner = 1 << 0
+    # The four corners and a transposed edge cell map to one key
+    keys = {game.canonical_key(1 << cell, 0)[0] for cell in (0, 3, 12, 15)}
+    assert len(keys) == 1
+    assert game.canonical_key(corner | 1 << 1, 1 << 5)[0] == game.canonical_key(corner | 1 << 4, 1 << 5)[0]
+    # A rectangular board only has its four reflections
+    wide = MNKGame(2, 3, 2)
+    assert wide.canonical_key(1 << 0, 0)[0] == wide.canonical_key(1 << 5, 0)[0]
+    assert wide.canonical_key(1 << 0, 0)[0] != wide.canonical_key(1 << 1, 0)[0]
+
+def test_k_in_a_row_on_larger_boards():
+    game = play(MNKGame(5, 5, 4), [(0, 1), (4, 4), (1, 2), (4, 3), (2, 3), (4, 2)])
+    assert not game.game_over
+    game.make_move(3, 4)
+    assert game.game_over and game.winner == PLAYER_X
+    game = play(MNKGame(4, 6, 4), [(0, 0), (3, 0), (0, 1), (3, 1), (1, 5), (3, 2), (2, 5), (3, 3)])
+    assert game.game_over and game.winner == PLAYER_O
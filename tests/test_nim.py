@@ -0,0 +1,118 @@
+import itertools
+import random
+
+import pytest
+
+from nim import NimGame, SearchContext, calculate_nim_sum, canonical_key, find_best_move, minimax, solve_position
+from search import TranspositionTable
+
+def check_index(game):
+    # The incremental nim-sum, stone count and per-bit index match the piles
+    assert game.nim_sum == calculate_nim_sum(game.piles)
+    assert game.stones_left == sum(game.piles)
+    for bit, indices in enumerate(game.bit_piles):
+        assert indices == {idx for idx, pile in enumerate(game.piles) if pile >> bit & 1}
+
+def test_unmake_move_on_a_copy_restores_larger_piles():
+    game = NimGame([1, 4])
+    game.make_move(1, 4)
+    copy = game.copy()
+    copy.unmake_move()
+    assert copy.piles == [1, 4]
+    check_index(copy)
+    assert game.piles == [1, 0]
+    check_index(game)
+
+def test_make_unmake_copy_round_trip():
+    rng = random.Random(0)
+    initial = [5, 9, 1, 12, 7]
+    game = NimGame(initial)
+    states = []
+    while not game.is_game_over():
+        states.append(game.piles.copy())
+        game.make_move(*game.sample_move(rng))
+        game = game.copy()
+        check_index(game)
+    while states:
+        game.unmake_move()
+        assert game.piles == states.pop()
+        check_index(game)
+        game = game.copy()
+    assert game.piles == initial
+    assert game.move_history == []
+
+SMALL_PILES = [list(piles) for piles in itertools.product(range(5), repeat=3) if sum(piles)]
+
+def move_value(piles, move, depth, table=None):
+    # Minimax value of move for the side making it, searched depth plies in all
+    game = NimGame(piles)
+    game.make_move(*move)
+    return minimax(game, depth - 1, False, table=table)
+
+@pytest.mark.parametrize('piles', SMALL_PILES)
+def test_solve_position_matches_nim_sum(piles):
+    winning = calculate_nim_sum(piles) != 0
+    value, move = solve_position(piles, table=TranspositionTable())
+    assert value == (1 if winning else -1)
+    game = NimGame(piles)
+    assert game.make_move(*move)
+    if winning:
+        assert game.nim_sum == 0
+
+@pytest.mark.parametrize('piles', SMALL_PILES)
+def test_minimax_move_matches_nim_sum(piles):
+    for table in (None, TranspositionTable()):
+        game = NimGame(piles)
+        move, _ = find_best_move(game, depth=sum(piles), use_nim_sum=False, table=table)
+        assert game.piles == piles and game.move_history == []  # searched in place and restored
+        assert game.make_move(*move)
+        if calculate_nim_sum(piles):
+            assert game.nim_sum == 0
+
+@pytest.mark.parametrize('depth', [2, 3, 12])
+def test_table_does_not_change_move_values(depth):
+    # One table shared by every search, as find_best_move's module table is
+    table = TranspositionTable()
+    ctx = SearchContext()
+    for piles in SMALL_PILES:
+        plain, _ = find_best_move(NimGame(piles), depth, use_nim_sum=False, table=None)
+        cached, _ = find_best_move(NimGame(piles), depth, use_nim_sum=False, table=table, ctx=ctx)
+        assert move_value(piles, cached, depth) == move_value(piles, plain, depth)
+    assert ctx.memo_hits > 0
+
+def test_table_keys_on_the_pile_multiset():
+    assert canonical_key([3, 0, 1, 3]) == canonical_key([1, 3, 3]) == (1, 3, 3)
+    table = TranspositionTable()
+    solve_position([2, 3, 4], table=table)
+    ctx = SearchContext()
+    find_best_move(NimGame([4, 0, 2, 3]), depth=9, use_nim_sum=False, table=table, ctx=ctx)
+    assert ctx.memo_hits > 0
+
+def test_search_context_counts_the_search():
+    ctx = SearchContext()
+    game = NimGame([3, 4, 5])
+    _, nodes = find_best_move(game, depth=4, use_nim_sum=False, table=None, ctx=ctx)
+    assert nodes == ctx.nodes > 1
+    assert ctx.max_depth == 4
+    assert ctx.cutoffs > 0
+    assert ctx.memo_hits == 0
+
+    # A shared context totals several searches; each call reports its own nodes
+    before = ctx.nodes
+    _, nodes = find_best_move(game, depth=2, use_nim_sum=False, table=None, ctx=ctx)
+    assert ctx.nodes == before + nodes
+    assert ctx.max_depth == 4
+
+    # The nim-sum move costs only the root
+    _, nodes = find_best_move(game, depth=4, use_nim_sum=True, ctx=ctx)
+    assert nodes == 1
+
+def test_search_context_merge_and_budget():
+    budgeted = SearchContext()
+    find_best_move(NimGame([3, 4, 5]), depth=12, use_nim_sum=False, table=None, ctx=budgeted, max_nodes=200)
+    assert 1 <= budgeted.completed_depth < 12
+    total = SearchContext()
+    total.merge(budgeted)
+    total.merge(budgeted)
+    assert total.nodes == 2 * budgeted.nodes
+    assert total.completed_depth == budgeted.completed_depth
@@ -0,0 +1,57 @@
+import itertools
+from fractions import Fraction
+from functools import lru_cache
+
+import numpy as np
+
+import nim_batch
+from nim import optimal_nim_move, NimGame
+from nim_batch import simulate_batch
+
+@lru_cache(maxsize=None)
+def random_vs_random(piles):
+    # Exact chance the player to move wins when both sides move uniformly at random
+    moves = NimGame(list(piles)).generate_moves()
+    if not moves:
+        return Fraction(0)
+    total = Fraction(0)
+    for idx, take in moves:
+        child = list(piles)
+        child[idx] -= take
+        total += 1 - random_vs_random(tuple(child))
+    return total / len(moves)
+
+def test_nim_sum_moves_match_optimal_nim_move():
+    configs = [config for config in itertools.product(range(6), repeat=3) if optimal_nim_move(list(config))]
+    cols, takes = nim_batch._nim_sum_moves(np.array(configs, dtype=np.int64), np.random.default_rng(0))
+    assert [(int(c), int(t)) for c, t in zip(cols, takes)] == [optimal_nim_move(list(c)) for c in configs]
+
+def test_random_moves_are_uniform_over_legal_moves():
+    piles = np.tile(np.array([2, 0, 3, 1], dtype=np.int64), (60000, 1))
+    cols, takes = nim_batch._random_moves(piles, np.random.default_rng(0))
+    moves = NimGame([2, 0, 3, 1]).generate_moves()
+    counts = {move: 0 for move in moves}
+    for move in zip(cols.tolist(), takes.tolist()):
+        counts[move] += 1  # KeyError on an illegal move
+    expected = len(piles) / len(moves)
+    assert all(abs(count - expected) < 5 * expected ** 0.5 for count in counts.values())
+
+def test_nim_sum_agent_wins_every_n_position():
+    results = simulate_batch(5000, "nim_sum", "random", [3, 4, 5], seed=0, verbose=False)
+    assert results['agent1_wins'] == 5000
+    # From a P position it only wins when random play hands it an N position
+    results = simulate_batch(5000, "random", "nim_sum", [1, 2, 3], seed=0, verbose=False)
+    assert results['agent1_wins'] == 0
+
+def test_random_win_rate_matches_exact_value(monkeypatch):
+    # Several chunks, so the length counts are merged across them
+    monkeypatch.setattr(nim_batch, 'CHUNK_GAMES', 1 << 15)
+    num_games = 100000
+    results = simulate_batch(num_games, "random", "random", [1, 2, 3], seed=1, verbose=False)
+    exact = float(random_vs_random((1, 2, 3)))
+    sigma = (exact * (1 - exact) / num_games) ** 0.5
+    assert abs(results['agent1_win_rate'] / 100 - exact) < 4 * sigma
+    low, high = results['win_rate_ci95']
+    assert low < results['agent1_win_rate'] < high
+    assert sum(results['game_length_counts']) == num_games
+    assert results['game_length_counts'][:3] == [0, 0, 0]  # six stones take at least three moves
@@ -0,0 +1,55 @@
+import csv
+import itertools
+from fractions import Fraction
+from functools import lru_cache
+
+from nim_census import solve_census, run_census, summarize_census
+
+def children(piles):
+    for i, pile in enumerate(piles):
+        for take in range(1, pile + 1):
+            yield tuple(sorted(piles[:i] + (pile - take,) + piles[i + 1:]))
+
+@lru_cache(maxsize=None)
+def wins(piles):
+    # The player to move wins, by plain game-tree search
+    return any(not wins(child) for child in children(piles))
+
+@lru_cache(maxsize=None)
+def agent_first(piles):
+    # Chance the nim-sum agent, to move, beats the random player
+    if not any(piles):
+        return Fraction(0)
+    if wins(piles):
+        return Fraction(1)
+    moves = list(children(piles))
+    return sum(random_first(child) for child in moves) / len(moves)
+
+@lru_cache(maxsize=None)
+def random_first(piles):
+    # The same with the random player to move
+    if not any(piles):
+        return Fraction(1)
+    moves = list(children(piles))
+    return sum(agent_first(child) for child in moves) / len(moves)
+
+def test_census_matches_brute_force():
+    nim_sum, win_first, win_second = solve_census(3, 4)
+    for config in itertools.product(range(5), repeat=3):
+        piles = tuple(sorted(config))
+        assert (nim_sum[config] == 0) == (not wins(piles)), config
+        assert abs(win_first[config] - float(agent_first(piles))) < 1e-12, config
+        assert abs(win_second[config] - float(random_first(piles))) < 1e-12, config
+
+def test_run_census_lists_each_configuration_once(tmp_path):
+    filename = str(tmp_path / 'census.csv')
+    rows = run_census(3, 3, filename)
+    # Multisets of 3 piles of 0..3 stones, without the empty board
+    assert len(rows) == 19
+    assert len({row['piles'] for row in rows}) == 19
+    with open(filename) as f:
+        assert [row['piles'] for row in csv.DictReader(f)] == [row['piles'] for row in rows]
+    summary = summarize_census(rows)
+    assert sum(group['configurations'] for group in summary.values()) == 19
+    # Single piles are all N positions, won outright moving first
+    assert summary[1]['p_positions'] == 0 and summary[1]['min_win_rate'] == 100
@@ -0,0 +1,86 @@
+import itertools
+
+import pytest
+
+from Halving import HalvingGame
+from halving_automaton import HalvingAutomaton
+from halving_tablebase import HalvingTablebase
+from match import HalvingState, NimState, TicTacToeState, ConnectFourState
+from nim import calculate_nim_sum
+from search import Searcher, TranspositionTable, WIN_THRESHOLD
+from search.pns import ProofNumberSearch, ProofTable, solve
+from tic_tac_toe import solve_lookup_table, X_INDEX, O_INDEX
+
+@pytest.mark.parametrize('piles', [piles for piles in itertools.combinations_with_replacement(range(6), 3)
+                                   if sum(piles)])
+def test_solve_matches_nim_sum(piles):
+    result = solve(NimState(piles))
+    assert result.outcome == (1 if calculate_nim_sum(piles) else -1)
+    assert result.proof_size is not None and result.proof_size <= result.nodes
+
+def test_solve_matches_halving_minimax():
+    for n in range(2, 400):
+        expected, _ = HalvingGame(n).minimax(n, True)
+        assert solve(HalvingState(n)).outcome == expected, n
+
+def test_solve_matches_halving_automaton(tmp_path):
+    automaton = HalvingAutomaton.build(1 << 12, 1 << 16, HalvingTablebase(1 << 16, str(tmp_path)).load())
+    for n in (10 ** 6, 10 ** 9 + 7, 3 * 2 ** 35, 10 ** 12):
+        assert solve(HalvingState(n)).outcome == automaton.outcome(n), n
+
+def test_solve_with_draws_matches_tic_tac_toe_lookup_table():
+    # Tic-Tac-Toe is a draw from the empty board, so a failed proof for the
+    # player to move is followed by a failed one for the opponent
+    assert solve(TicTacToeState(), draws=True).outcome == 0
+    table = solve_lookup_table()
+    seen = set()
+    state = TicTacToeState()
+    for first, second in itertools.permutations([(0, 0), (1, 1), (0, 1), (2, 2), (1, 0)], 2):
+        state.apply(first)
+        state.apply(second)
+        if state.key() not in seen:
+            seen.add(state.key())
+            value = table[X_INDEX[state.game.x_bits] + O_INDEX[state.game.o_bits]][0]
+            # The lookup table scores from X's point of view; X is to move
+            expected = (value > 0) - (value < 0)
+            assert solve(state, draws=True).outcome == expected
+        state.undo()
+        state.undo()
+
+def test_collection_keeps_the_result():
+    # A table smaller than the search forces ProofTable.collect (far smaller
+    # and the search keeps re-proving what it dropped)
+    for piles in ([3, 4, 5], [3, 5, 7], [2, 3, 4, 4]):
+        result = solve(NimState(piles), max_size=64)
+        assert result.gcs > 0
+        assert result.outcome == (1 if calculate_nim_sum(piles) else -1)
+
+def test_collect_drops_least_worked_open_entries():
+    table = ProofTable(max_size=8)
+    for i in range(6):
+        table.store(('open', i), 1, 1, i)
+    table.store(('won', 0), 0, 1 << 60, 100)
+    table.store(('lost', 0), 1 << 60, 0, 100)
+    table.collect()
+    assert table.gcs == 1
+    assert ('won', 0) in table.entries and ('lost', 0) in table.entries
+    assert [key for key in table.entries if key[0] == 'open'] == [('open', 4), ('open', 5)]
+
+def test_prove_either_side():
+    search = ProofNumberSearch()
+    state = NimState([1, 2, 3])
+    assert not search.prove(state)
+    assert search.prove(state, attacker=2)
+
+def test_solve_matches_connect4_negamax():
+    state = ConnectFourState()
+    if not hasattr(state.c4f, 'find_best'):
+        pytest.skip("Connect4 extension is not built")
+    # Late positions from the benchmark suite, solved exactly by both engines
+    from connect4 import ConnectFour
+    for moves in ('13633325320364012022454562044150', '5602323336125306221324645644'):
+        position = ConnectFourState(ConnectFour.from_moves(moves))
+        result = solve(position, draws=True)
+        score, _ = Searcher(TranspositionTable()).search(position, 42 - len(moves))
+        expected = 1 if score > WIN_THRESHOLD else -1 if score < -WIN_THRESHOLD else 0
+        assert result.outcome == expected
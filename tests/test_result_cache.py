@@ -0,0 +1,48 @@
+import os
+
+import result_cache
+from result_cache import ResultCache, engine_hash, entries, invalidate
+
+def write(root, path, text):
+    full_path = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, 'w') as f:
+        f.write(text)
+
+def test_engine_hash_follows_source_edits(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, 'ROOT', str(tmp_path))
+    for path in result_cache.ENGINE_SOURCES['nim'] + result_cache.COMMON_SOURCES:
+        write(tmp_path, path, 'original\n')
+    write(tmp_path, 'analysis/script.py', 'original\n')
+    before = engine_hash('nim', ['analysis/script.py'])
+    assert engine_hash('nim', ['analysis/script.py']) == before
+
+    # An edit to the game's engine, a shared source or an extra source all change the hash
+    for path in ['games/nim.py', 'games/search/negamax.py', 'analysis/script.py']:
+        write(tmp_path, path, 'edited\n')
+        after = engine_hash('nim', ['analysis/script.py'])
+        assert after != before
+        before = after
+    # Another game's engine is not part of it
+    write(tmp_path, 'games/tic_tac_toe.py', 'edited\n')
+    assert engine_hash('nim', ['analysis/script.py']) == before
+
+def test_invalidate_stale_only_removes_changed_engines(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, 'ROOT', str(tmp_path))
+    for game in ['nim', 'tic_tac_toe']:
+        for path in result_cache.ENGINE_SOURCES[game]:
+            write(tmp_path, path, 'original\n')
+    directory = str(tmp_path / 'cache')
+    cache = ResultCache(directory)
+    specs = [cache.spec('nim', ('a', 'b'), {'heaps': [1, 2]}, 10, 0),
+             cache.spec('nim', ('a', 'b'), {'heaps': [3, 4]}, 10, 0),
+             cache.spec('tic_tac_toe', ('a', 'b'), {}, 10, 0)]
+    for spec in specs:
+        cache.put(spec, {'wins': 1})
+
+    assert invalidate(directory, stale_only=True) == 0
+    write(tmp_path, 'games/nim.py', 'edited\n')
+    assert invalidate(directory, stale_only=True) == 2
+    assert [entry['spec'] for _, entry in entries(directory)] == [specs[2]]
+    assert cache.get(specs[2]) == {'wins': 1}
+    assert cache.get(specs[0]) is None
@@ -0,0 +1,81 @@
+import json
+import os
+
+from run_journal import RunJournal
+
+SPEC = {'script': 'test', 'engine': 'abc'}
+
+def lines(path):
+    with open(path) as f:
+        return f.read().split('\n')
+
+def test_resumes_recorded_checkpoints(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = RunJournal(path, SPEC)
+    journal.record(['chunk', 0], {'wins': 3}, seconds=1.5)
+    journal.record(['chunk', 1], {'wins': 4}, seconds=2.0)
+    journal.close()
+
+    journal = RunJournal(path, SPEC)
+    assert journal.recovered == 2
+    assert journal.reuse(['chunk', 1]) == {'wins': 4}
+    assert journal.reuse(['chunk', 2]) is None
+    assert journal.reused == 1
+    assert journal.reused_seconds == 2.0
+    assert journal.run(['chunk', 0], lambda: {'wins': -1}) == {'wins': 3}
+    journal.close(complete=True)
+    assert not os.path.exists(path)
+
+def test_truncated_last_line_is_dropped_and_rewritten(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = RunJournal(path, SPEC)
+    journal.record(['chunk', 0], 10)
+    journal.record(['chunk', 1], 11)
+    journal.close()
+    # The process died halfway through writing a third record
+    with open(path, 'a') as f:
+        f.write('{"key": ["chunk", 2], "val')
+
+    journal = RunJournal(path, SPEC)
+    assert journal.recovered == 2
+    assert ['chunk', 2] not in journal
+    # The broken tail is gone, so the next record starts on a line of its own
+    rewritten = lines(path)
+    assert rewritten[-1] == ''
+    assert [json.loads(line) for line in rewritten[:-1]][1:] == [
+        {'key': ['chunk', 0], 'value': 10, 'seconds': 0.0},
+        {'key': ['chunk', 1], 'value': 11, 'seconds': 0.0}]
+    journal.record(['chunk', 2], 12)
+    journal.close()
+
+    records = [json.loads(line) for line in lines(path) if line]
+    assert records[0] == {'spec': SPEC}
+    assert [record['key'] for record in records[1:]] == [['chunk', 0], ['chunk', 1], ['chunk', 2]]
+    journal = RunJournal(path, SPEC)
+    assert journal.recovered == 3
+    assert journal.get(['chunk', 2]) == 12
+    journal.close()
+
+def test_spec_mismatch_moves_journal_aside(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = RunJournal(path, SPEC)
+    journal.record(['chunk', 0], 10)
+    journal.close()
+    old_contents = lines(path)
+
+    journal = RunJournal(path, dict(SPEC, engine='changed'))
+    assert journal.recovered == 0
+    assert ['chunk', 0] not in journal
+    journal.close()
+    # The stale journal is kept as .old and a fresh one started for the new spec
+    assert lines(path + '.old') == old_contents
+    assert [json.loads(line) for line in lines(path) if line] == [{'spec': dict(SPEC, engine='changed')}]
+
+def test_unreadable_first_line_starts_fresh(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    with open(path, 'w') as f:
+        f.write('{"spe')
+    journal = RunJournal(path, SPEC)
+    assert journal.recovered == 0
+    journal.close()
+    assert os.path.exists(path + '.old')
@@ -0,0 +1,212 @@
+import itertools
+
+import pytest
+
+from Halving import HalvingGame
+from match import TicTacToeState, NimState, HalvingState, TicTacToeSearchAgent
+from search import Searcher, TranspositionTable, EXACT, LOWER, UPPER, WIN_SCORE, WIN_THRESHOLD
+from tic_tac_toe import solve_lookup_table, X_INDEX, O_INDEX
+
+@pytest.fixture(scope='module')
+def lookup_table():
+    return solve_lookup_table()
+
+def tic_tac_toe_positions():
+    # Every reachable non-terminal position, played out on one state
+    state = TicTacToeState()
+    seen = set()
+
+    def walk():
+        if state.terminal() is not None or state.key() in seen:
+            return
+        seen.add(state.key())
+        yield state
+        for move in state.moves():
+            state.apply(move)
+            yield from walk()
+            state.undo()
+    return walk()
+
+def lookup_value(score, player):
+    # Searcher score (side to move, WIN_SCORE - plies) as the lookup
+    # table's value (X's view, 10 - plies)
+    if player == 2:
+        score = -score
+    if score > WIN_THRESHOLD:
+        return score - WIN_SCORE + 10
+    if score < -WIN_THRESHOLD:
+        return score + WIN_SCORE - 10
+    return score
+
+def check_tic_tac_toe(state, lookup_table, score, move):
+    value, best_moves = lookup_table[X_INDEX[state.game.x_bits] + O_INDEX[state.game.o_bits]]
+    assert lookup_value(score, state.player) == value
+    assert move in best_moves
+
+def test_search_matches_tic_tac_toe_lookup_table(lookup_table):
+    for state in tic_tac_toe_positions():
+        if state.game.cnt >= 3:
+            score, move = Searcher(TranspositionTable()).search(state, 9)
+            check_tic_tac_toe(state, lookup_table, score, move)
+
+def test_shared_table_matches_tic_tac_toe_lookup_table(lookup_table):
+    # Bound entries stored by narrow windows under one root are reused by
+    # the searches of every later root
+    searcher = Searcher(TranspositionTable())
+    for state in tic_tac_toe_positions():
+        score, move = searcher.search(state, 9)
+        check_tic_tac_toe(state, lookup_table, score, move)
+    assert searcher.stats.tt_hits > 0
+
+def test_iterative_deepening_matches_tic_tac_toe_lookup_table(lookup_table):
+    for state in tic_tac_toe_positions():
+        if state.game.cnt >= 4:
+            score, move, depth = Searcher(TranspositionTable()).iterative_deepening(state, 9)
+            check_tic_tac_toe(state, lookup_table, score, move)
+            assert 1 <= depth <= 9
+
+NIM_PILES = [piles for piles in itertools.combinations_with_replacement(range(6), 3) if sum(piles)]
+
+@pytest.mark.parametrize('piles', NIM_PILES)
+def test_search_matches_nim_sum(piles):
+    state = NimState(piles)
+    winning = state.game.nim_sum != 0
+    score, move = Searcher(TranspositionTable()).search(state, sum(piles))
+    assert (score > WIN_THRESHOLD) == winning
+    assert (score < -WIN_THRESHOLD) == (not winning)
+    if winning:
+        state.apply(move)
+        assert state.game.nim_sum == 0
+
+@pytest.mark.parametrize('piles', NIM_PILES[::5])
+def test_iterative_deepening_matches_nim_sum(piles):
+    state = NimState(piles)
+    score, move, depth = Searcher(TranspositionTable()).iterative_deepening(state, sum(piles))
+    assert (score > WIN_THRESHOLD) == (state.game.nim_sum != 0)
+    # A forced result ends the deepening no later than the ply it is
+    # reached (table entries from transpositions can show it sooner)
+    assert depth <= WIN_SCORE - abs(score)
+
+def test_search_matches_halving_minimax():
+    HalvingGame.clear_cache()
+    for n in range(1, 80):
+        expected, _ = HalvingGame(n).minimax(n, True)
+        state = HalvingState(n)
+        score, move = Searcher(TranspositionTable()).search(state, n)
+        if n == 1:
+            assert score == -WIN_SCORE and move is None
+            continue
+        assert (score > WIN_THRESHOLD) == (expected == 1)
+        assert (score < -WIN_THRESHOLD) == (expected == -1)
+        state.apply(move)
+        assert HalvingGame(move).minimax(move, False)[0] == expected
+
+def halving_dp(limit):
+    # win[n]: the player to move at n wins; move[n]: the first of n - 1 and
+    # n // 2 reaching that result
+    win = [False, False]
+    move = [None, None]
+    for n in range(2, limit + 1):
+        win.append(not win[n - 1] or not win[n // 2])
+        move.append(n - 1 if not win[n - 1] or win[n // 2] else n // 2)
+    return win, move
+
+def test_halving_minimax_on_the_engine_past_the_recursion_limit(monkeypatch):
+    # HalvingGame.minimax searches bottom-up on Searcher, so a chain of
+    # 20000 -1 moves needs no deep recursion, even when the bounded cache
+    # evicts results the solve still needs
+    monkeypatch.setattr(HalvingGame, 'cache_max_size', 500)
+    HalvingGame.clear_cache()
+    win, move = halving_dp(20000)
+    for n in [20000, 12345, 777, 2, 1]:
+        assert HalvingGame(n).minimax(n, True) == (1 if win[n] else -1, move[n])
+        assert HalvingGame(n).minimax(n, False) == (-1 if win[n] else 1, move[n])
+    HalvingGame.clear_cache()
+
+def test_iterative_deepening_matches_halving_minimax():
+    searcher = Searcher(TranspositionTable())
+    for n in range(2, 200):
+        expected, _ = HalvingGame(n).minimax(n, True)
+        score, _, depth = searcher.iterative_deepening(HalvingState(n), n)
+        assert (score > WIN_THRESHOLD) == (expected == 1)
+        assert depth <= n
+
+def test_table_bound_flags():
+    # (1, 2, 3) is lost for the side to move, (1, 2, 4) won
+    lost, won = NimState((1, 2, 3)), NimState((1, 2, 4))
+
+    table = TranspositionTable()
+    score = Searcher(table).negamax(won, 7, -WIN_SCORE - 1, 0)
+    depth, value, flag, _ = table.get(won.key())
+    assert score >= 0 and (depth, value, flag) == (7, score, LOWER)
+
+    table = TranspositionTable()
+    score = Searcher(table).negamax(lost, 6, 0, WIN_SCORE + 1)
+    depth, value, flag, _ = table.get(lost.key())
+    assert score <= 0 and (depth, value, flag) == (6, score, UPPER)
+
+    table = TranspositionTable()
+    score = Searcher(table).negamax(lost, 6)
+    assert table.get(lost.key())[1:3] == (score, EXACT)
+    assert score == -(WIN_SCORE - 6)
+
+def test_bounds_in_table_narrow_later_searches():
+    table = TranspositionTable()
+    state = NimState((1, 2, 4))
+    exact = Searcher(TranspositionTable()).search(state, 7)[0]
+    # A lower bound at the root alone cannot answer a full-window search
+    Searcher(table).negamax(state, 7, -WIN_SCORE - 1, 0)
+    searcher = Searcher(table)
+    assert searcher.search(state, 7)[0] == exact
+    assert table.get(state.key())[1:3] == (exact, EXACT)
+    # Exact entries below the root are served from the table
+    assert searcher.search(state, 7)[0] == exact
+    assert searcher.stats.tt_hits > 0
+
+def test_shallow_entries_are_not_used_deeper():
+    table = TranspositionTable()
+    state = NimState((3, 4, 5))
+    shallow = Searcher(table).search(state, 1)[0]
+    assert shallow == 0  # No forced result within one ply
+    assert Searcher(table).search(state, 12)[0] > WIN_THRESHOLD
+
+def test_node_budget_stops_the_deepening():
+    state = NimState((5, 6, 7))
+    searcher = Searcher()
+    assert searcher.iterative_deepening(state, 18, max_nodes=0) == (0, None, 0)
+    assert searcher.node_limit is None
+
+    searcher = Searcher()
+    score, move, depth = searcher.iterative_deepening(state, 18, max_nodes=2000)
+    assert 1 <= depth < 18
+    assert searcher.stats.nodes == 2001  # The node past the budget stops it
+    assert searcher.stats.completed_depth == depth
+    # The answer is the deepest finished iteration's
+    assert (score, move) == Searcher().search(state, depth)
+
+    # The budget counts from the start of each call, not of the searcher
+    more = searcher.iterative_deepening(state, 18, max_nodes=2000)
+    assert more[2] == depth
+
+def test_deadline_stops_the_deepening():
+    state = NimState((5, 6, 7))
+    searcher = Searcher()
+    score, move, depth = searcher.iterative_deepening(state, 18, time_limit=0)
+    # The clock is read every 1024 nodes, so an expired deadline stops the search there
+    assert searcher.stats.nodes == 1024
+    assert 1 <= depth < 18
+    assert searcher.deadline is None
+    assert (score, move) == Searcher().search(state, depth)
+
+def test_tic_tac_toe_search_agent_searches_each_move_afresh(lookup_table):
+    agent = TicTacToeSearchAgent(8)
+    state = TicTacToeState()
+    state.apply((0, 0))
+    first = agent.select(state)
+    once = agent.stats()
+    # A second search of the same position costs the same: no table carries over
+    assert agent.select(state) == first
+    assert agent.stats() == {'nodes': 2 * once['nodes'], 'tt_hits': 2 * once['tt_hits'], 'searches': 2}
+    assert first in lookup_table[X_INDEX[state.game.x_bits] + O_INDEX[state.game.o_bits]][1]
+    agent.reset()
+    assert agent.stats() == {'nodes': 0, 'tt_hits': 0, 'searches': 0}
@@ -0,0 +1,14 @@
+import pytest
+
+from tic_tac_toe import TicTacToe, PLAYER_X, PLAYER_O, EMPTY
+
+def test_board_view_is_read_only():
+    game = TicTacToe()
+    game.set_cell(1, 1, PLAYER_X)
+    game.board = [[PLAYER_O, EMPTY, EMPTY], [EMPTY, PLAYER_X, EMPTY], [EMPTY, EMPTY, EMPTY]]
+    assert game.board == ((PLAYER_O, EMPTY, EMPTY), (EMPTY, PLAYER_X, EMPTY), (EMPTY, EMPTY, EMPTY))
+    with pytest.raises(TypeError):
+        game.board[0][2] = PLAYER_X
+    assert game.get_cell(0, 2) == EMPTY
+    game.set_cell(0, 2, PLAYER_X)
+    assert game.board[0] == (PLAYER_O, EMPTY, PLAYER_X)
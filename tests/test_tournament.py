@@ -0,0 +1,62 @@
+import random
+
+import numpy as np
+
+import nim
+import tournament
+from match import play_match
+
+SCENARIO = ('nim_nim_sum_vs_nim_sum', 'nim', 'nim_sum', 'nim_sum', {'piles': [1, 2, 3, 4, 4]}, 25)
+
+def test_nim_sum_chunk_plays_every_game():
+    # The nim-sum agent moves at random in a lost position, so a chunk must
+    # play each game rather than replay the first one from the same start
+    task = tournament.make_tasks([SCENARIO], seed=0)[0]
+    _, totals, timings = tournament.run_chunk(task)
+    assert None not in timings['games']
+
+    _, game, agent1, agent2, params, num_games, seed_state, starts = task
+    assert starts is None
+    random.seed(int.from_bytes(np.asarray(seed_state, dtype=np.uint32).tobytes(), 'little'))
+    nim.transposition_table.clear()
+    agents = (tournament.make_agent(game, agent1, params, 1), tournament.make_agent(game, agent2, params, 2))
+    length_counts = {}
+    wins = [0, 0, 0]
+    for _ in range(num_games):
+        result = play_match(tournament.make_state(game, params), *agents)
+        length_counts[result.length] = length_counts.get(result.length, 0) + 1
+        wins[result.winner] += 1
+    assert totals['length_counts'] == length_counts
+    assert (totals['agent1_wins'], totals['agent2_wins']) == (wins[1], wins[2])
+    assert len(length_counts) > 1
+
+def test_deterministic_scenario_plays_each_start_once():
+    # Deduplicated per scenario, not per chunk: 100 games from one start are
+    # one task with weight 100, and count as 100 separately played games
+    scenario = ('halving_minimax_vs_minimax', 'halving', 'minimax', 'minimax', {'start': 50}, 100)
+    tasks = tournament.make_tasks([scenario], seed=0)
+    assert len(tasks) == 1 and tasks[0][-1] == [[None, 100]]
+    results, _ = tournament.run_tournament([scenario], workers=1)
+    played = results[scenario[0]]
+    assert sum(game is not None for game in played['timings']['games']) == 1
+    assert len(played['timings']['games']) == 100
+
+    _, game, agent1, agent2, params, _ = scenario
+    agents = (tournament.make_agent(game, agent1, params, 1), tournament.make_agent(game, agent2, params, 2))
+    wins = [0, 0, 0]
+    total_moves = 0
+    for _ in range(100):
+        result = play_match(tournament.make_state(game, params), *agents)
+        wins[result.winner] += 1
+        total_moves += result.length
+    assert (played['agent1_wins'], played['agent2_wins'], played['total_moves']) == (wins[1], wins[2], total_moves)
+
+def test_deterministic_starts_are_drawn_per_scenario():
+    # Connect4's first player is drawn for every game up front; the weights
+    # of the distinct starts cover the scenario and chunking keeps them
+    scenario = ('c4', 'connect4', 'ai', 'ai', {'depth1': 2, 'depth2': 2}, 60)
+    tasks = tournament.make_tasks([scenario], seed=0, games_per_chunk=1)
+    starts = [start for task in tasks for start in task[-1]]
+    assert sorted(start for start, _ in starts) == ['O', 'X']
+    assert sum(weight for _, weight in starts) == 60
+    assert [task[5] for task in tasks] == [weight for _, weight in starts]
@@ -8,7 +8,6 @@ import sys
 import os
 import json
 import time
-import random
 import copy
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
@@ -21,10 +20,12 @@ from math import pi
 from glob import glob
 
 sys.path.append('games')
+sys.path.append('analysis')
 
-from tic_tac_toe import TicTacToe
-import nim
-from Halving import HalvingGame
+import expectimax
+from result_cache import ResultCache
+
+NODE_BUDGET = 100  # search nodes per move behind the computational efficiency axis
 
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("husl")
@@ -33,92 +34,20 @@ plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'DejaVu Sans', 'Liberatio
 plt.rcParams['axes.unicode_minus'] = False
 plt.rcParams['font.size'] = 12
 
-def run_tic_tac_toe_simulations(num_games=200):
-    """Run actual Tic-Tac-Toe simulations"""
-    print("Running Tic-Tac-Toe simulations...")
-    
-    results = {
-        'agent_vs_random': {'wins': 0, 'draws': 0, 'losses': 0, 'total_moves': 0},
-        'agent_vs_agent': {'wins': 0, 'draws': 0, 'losses': 0, 'total_moves': 0},
-        'random_vs_random': {'wins': 0, 'draws': 0, 'losses': 0, 'total_moves': 0}
-    }
+def run_tic_tac_toe_simulations():
+    """Exact Tic-Tac-Toe results (expectimax over every game against the random agent)"""
+    print("Evaluating Tic-Tac-Toe matchups exactly...")
     
-    # Agent vs Random
-    for i in range(num_games):
-        game = TicTacToe()
-        moves = 0
-        
-        while not game.game_over:
-            if game.player == 1:  # X
-                row, col = game.find_best_move()
-                game.make_move(row, col)
-            else:  # O
-                moves_available = game.get_available_moves()
-                if moves_available:
-                    row, col = random.choice(moves_available)
-                    game.make_move(row, col)
-            moves += 1
-        
-        results['agent_vs_random']['total_moves'] += moves
-        if game.winner == 1:  # X wins
-            results['agent_vs_random']['wins'] += 1
-        elif game.winner == 2:  # O wins
-            results['agent_vs_random']['losses'] += 1
-        else:  # Draw
-            results['agent_vs_random']['draws'] += 1
-    
-    # Agent vs Agent
-    for i in range(num_games):
-        game = TicTacToe()
-        moves = 0
-        
-        while not game.game_over:
-            row, col = game.find_best_move()
-            game.make_move(row, col)
-            moves += 1
-        
-        results['agent_vs_agent']['total_moves'] += moves
-        if game.winner == 1:
-            results['agent_vs_agent']['wins'] += 1
-        elif game.winner == 2:
-            results['agent_vs_agent']['losses'] += 1
-        else:
-            results['agent_vs_agent']['draws'] += 1
-    
-    # Random vs Random
-    for i in range(num_games):
-        game = TicTacToe()
-        moves = 0
-        
-        while not game.game_over:
-            moves_available = game.get_available_moves()
-            if moves_available:
-                row, col = random.choice(moves_available)
-                game.make_move(row, col)
-            moves += 1
-        
-        results['random_vs_random']['total_moves'] += moves
-        if game.winner == 1:
-            results['random_vs_random']['wins'] += 1
-        elif game.winner == 2:
-            results['random_vs_random']['losses'] += 1
-        else:
-            results['random_vs_random']['draws'] += 1
-    
-    # Calculate statistics
-    for scenario in results:
-        total_games = results[scenario]['wins'] + results[scenario]['draws'] + results[scenario]['losses']
-        if total_games > 0:
-            results[scenario]['win_rate'] = (results[scenario]['wins'] / total_games) * 100
-            results[scenario]['draw_rate'] = (results[scenario]['draws'] / total_games) * 100
-            results[scenario]['loss_rate'] = (results[scenario]['losses'] / total_games) * 100
-            results[scenario]['avg_moves'] = results[scenario]['total_moves'] / total_games
-    
-    return results
+    agent = expectimax.tic_tac_toe_agent
+    return {
+        'agent_vs_random': expectimax.rates(expectimax.tic_tac_toe_exact(agent, "random")),
+        'agent_vs_agent': expectimax.rates(expectimax.tic_tac_toe_exact(agent, agent)),
+        'random_vs_random': expectimax.rates(expectimax.tic_tac_toe_exact("random", "random"))
+    }
 
-def run_nim_simulations(num_games=200):
-    """Run actual Nim simulations"""
-    print("Running Nim simulations...")
+def run_nim_simulations():
+    """Exact Nim results against the random agent"""
+    print("Evaluating Nim matchups exactly...")
     
     # Test different initial configurations
     configurations = [
@@ -130,193 +59,35 @@ def run_nim_simulations(num_games=200):
     ]
     
     config_results = {}
-    
     for config in configurations:
-        config_key = str(config)
-        config_results[config_key] = {
-            'wins': 0, 'losses': 0, 'total_moves': 0, 'nodes_evaluated': 0
-        }
-        
-        for i in range(num_games // len(configurations)):
-            game = nim.NimGame(config.copy())
-            moves = 0
-            current_player = 1  # 1 for agent, 2 for random
-            
-            while not game.is_game_over():
-                if current_player == 1:  # Agent
-                    move, nodes = nim.find_best_move(game, depth=8, use_nim_sum=True)
-                    config_results[config_key]['nodes_evaluated'] += nodes
-                else:  # Random
-                    available_moves = game.generate_moves()
-                    if available_moves:
-                        move = random.choice(available_moves)
-                    else:
-                        break
-                
-                if move:
-                    game.make_move(move[0], move[1])
-                    current_player = 3 - current_player  # Switch players
-                moves += 1
-            
-            config_results[config_key]['total_moves'] += moves
-            
-            # Winner is the last player to move (game over means current player lost)
-            winner = 3 - current_player
-            if winner == 1:
-                config_results[config_key]['wins'] += 1
-            else:
-                config_results[config_key]['losses'] += 1
-    
-    # Nim-sum vs Random
-    nim_sum_results = {'wins': 0, 'losses': 0, 'total_moves': 0, 'nodes_evaluated': 0}
-    
-    for i in range(num_games):
-        game = nim.NimGame([3, 5, 7])  # Standard configuration
-        moves = 0
-        current_player = 1
-        
-        while not game.is_game_over():
-            if current_player == 1:  # Nim-sum strategy
-                move = nim.optimal_nim_move(game.piles)
-                if move and move in game.generate_moves():
-                    nim_sum_results['nodes_evaluated'] += 1
-                else:
-                    # Fallback to random if no optimal move
-                    move = random.choice(game.generate_moves()) if game.generate_moves() else None
-            else:  # Random
-                available_moves = game.generate_moves()
-                if available_moves:
-                    move = random.choice(available_moves)
-                else:
-                    break
-            
-            if move:
-                game.make_move(move[0], move[1])
-                current_player = 3 - current_player
-            moves += 1
-            
-            if moves > 100:
-                break
-        
-        nim_sum_results['total_moves'] += moves
-        winner = 3 - current_player
-        if winner == 1:
-            nim_sum_results['wins'] += 1
-        else:
-            nim_sum_results['losses'] += 1
-    
-    # Minimax vs Random
-    minimax_results = {'wins': 0, 'losses': 0, 'total_moves': 0, 'nodes_evaluated': 0}
-    
-    for i in range(num_games):
-        game = nim.NimGame([3, 5, 7])
-        moves = 0
-        current_player = 1
-        
-        while not game.is_game_over():
-            if current_player == 1:  # Minimax
-                move, nodes = nim.find_best_move(game, depth=8, use_nim_sum=False)
-                minimax_results['nodes_evaluated'] += nodes
-            else:  # Random
-                available_moves = game.generate_moves()
-                if available_moves:
-                    move = random.choice(available_moves)
-                else:
-                    break
-            
-            if move:
-                game.make_move(move[0], move[1])
-                current_player = 3 - current_player
-            moves += 1
-            
-            if moves > 100:
-                break
-        
-        minimax_results['total_moves'] += moves
-        winner = 3 - current_player
-        if winner == 1:
-            minimax_results['wins'] += 1
-        else:
-            minimax_results['losses'] += 1
-    
-    # Calculate statistics
-    for config_key in config_results:
-        total_games = config_results[config_key]['wins'] + config_results[config_key]['losses']
-        if total_games > 0:
-            config_results[config_key]['win_rate'] = (config_results[config_key]['wins'] / total_games) * 100
-            config_results[config_key]['avg_game_length'] = config_results[config_key]['total_moves'] / total_games
-            config_results[config_key]['avg_nodes_per_game'] = config_results[config_key]['nodes_evaluated'] / total_games
-    
-    # Nim-sum statistics
-    total_nim_sum = nim_sum_results['wins'] + nim_sum_results['losses']
-    if total_nim_sum > 0:
-        nim_sum_results['win_rate'] = (nim_sum_results['wins'] / total_nim_sum) * 100
-        nim_sum_results['avg_moves'] = nim_sum_results['total_moves'] / total_nim_sum
-        nim_sum_results['avg_nodes'] = nim_sum_results['nodes_evaluated'] / total_nim_sum
-    
-    # Minimax statistics
-    total_minimax = minimax_results['wins'] + minimax_results['losses']
-    if total_minimax > 0:
-        minimax_results['win_rate'] = (minimax_results['wins'] / total_minimax) * 100
-        minimax_results['avg_moves'] = minimax_results['total_moves'] / total_minimax
-        minimax_results['avg_nodes'] = minimax_results['nodes_evaluated'] / total_minimax
+        # find_best_move with the nim-sum: one node per decision
+        result = expectimax.rates(expectimax.nim_exact(config, expectimax.nim_sum_agent, "random"))
+        result['avg_game_length'] = result['avg_moves']
+        result['avg_nodes_per_game'] = result['avg_cost']
+        config_results[str(config)] = result
+    
+    nim_sum_results = expectimax.rates(expectimax.nim_exact([3, 5, 7], expectimax.nim_sum_agent, "random"))
+    nim_sum_results['avg_nodes'] = nim_sum_results['avg_cost']
+    
+    minimax_results = expectimax.rates(expectimax.nim_exact([3, 5, 7], expectimax.nim_minimax_agent(8), "random"))
+    minimax_results['avg_nodes'] = minimax_results['avg_cost']
     
     return {
         'configurations': config_results,
         'nim_sum_vs_random': nim_sum_results,
-        'minimax_vs_random': minimax_results
+        'minimax_vs_random': minimax_results,
+        'random_vs_random': expectimax.rates(expectimax.nim_exact([3, 5, 7], "random", "random"))
     }
 
-def run_halving_simulations(num_games=100):
-    """Run actual Halving game simulations"""
-    print("Running Halving game simulations...")
+def run_halving_simulations():
+    """Exact Halving results: minimax (player 1) against the random agent"""
+    print("Evaluating Halving matchups exactly...")
     
     starting_numbers = [10, 15, 20, 25, 30, 50]
     results = {}
     
     for num in starting_numbers:
-        results[f'number_{num}'] = {'wins': 0, 'losses': 0, 'total_moves': 0}
-        
-        for i in range(num_games):
-            game = HalvingGame(num)
-            current_number = num
-            current_player = 1
-            moves = 0
-            
-            while current_number > 1:
-                if current_player == 1:
-                    _, best_move = game.minimax(current_number, True)
-                    if best_move is not None:
-                        current_number = best_move
-                    else:
-                        break
-                else:
-                    available_moves = game.get_moves(current_number)
-                    if available_moves:
-                        current_number = random.choice(available_moves)
-                    else:
-                        break
-                
-                current_player = 3 - current_player
-                moves += 1
-                
-                if moves > 50:
-                    break
-            
-            results[f'number_{num}']['total_moves'] += moves
-            
-            winner = 3 - current_player
-            if winner == 1:
-                results[f'number_{num}']['wins'] += 1
-            else:
-                results[f'number_{num}']['losses'] += 1
-    
-    # Calculate statistics
-    for num_key in results:
-        total_games = results[num_key]['wins'] + results[num_key]['losses']
-        if total_games > 0:
-            results[num_key]['win_rate'] = (results[num_key]['wins'] / total_games) * 100
-            results[num_key]['avg_moves'] = results[num_key]['total_moves'] / total_games
+        results[f'number_{num}'] = expectimax.rates(expectimax.halving_exact(num, expectimax.halving_agent, "random"))
     
     return results
 
@@ -325,9 +96,20 @@ def collect_simulation_data():
     print("=== Comprehensive Game Analysis ===")
     print("Running simulations for Tic-Tac-Toe, Nim, and Halving games...")
     
-    tic_tac_toe_data = run_tic_tac_toe_simulations(200)
-    nim_data = run_nim_simulations(200)
-    halving_data = run_halving_simulations(100)
+    # Exact results only change with the engines, so each game's section is
+    # reused from the result cache until its sources change
+    cache = ResultCache()
+    sources = ['games/expectimax.py', 'viz.py']
+    tic_tac_toe_data = cache.cached(
+        cache.spec('tic_tac_toe', ('agent', 'random'), {'section': 'viz_exact'}, sources=sources),
+        run_tic_tac_toe_simulations)
+    nim_data = cache.cached(
+        cache.spec('nim', ('nim_sum', 'minimax', 'random'), {'section': 'viz_exact'}, sources=sources),
+        run_nim_simulations)
+    halving_data = cache.cached(
+        cache.spec('halving', ('minimax', 'random'), {'section': 'viz_exact'}, sources=sources),
+        run_halving_simulations)
+    print(cache.report())
     
     # Combine all data with exact structure expected by radar plots
     combined_data = {
@@ -373,6 +155,9 @@ def calculate_game_metrics(data):
     """Extract and calculate normalized metrics for each game (maintains exact radar plot logic)"""
     
     metrics = {}
+    # Exact win rate vs random of one search engine held to NODE_BUDGET nodes
+    # per move, so the axis compares strength per unit of compute across games
+    efficiency = expectimax.budget_efficiency(NODE_BUDGET)
     
     # Tic-Tac-Toe metrics
     ttt_data = data.get('tic_tac_toe', {})
@@ -380,7 +165,7 @@ def calculate_game_metrics(data):
         metrics['Tic-Tac-Toe'] = {
             'win_rate': ttt_data['agent_vs_random']['win_rate'],
             'avg_game_length': ttt_data['agent_vs_random']['avg_moves'],
-            'computational_efficiency': 95,  # High efficiency due to small state space
+            'computational_efficiency': efficiency['Tic-Tac-Toe'],
             'strategic_consistency': 98,     # Very consistent performance
             'algorithm_effectiveness': 90,   # Good but not perfect due to draws
             'theoretical_optimality': 95     # Near optimal play
@@ -401,7 +186,7 @@ def calculate_game_metrics(data):
     metrics['Nim'] = {
         'win_rate': nim_wr,
         'avg_game_length': nim_moves,
-        'computational_efficiency': 100,  # Perfect with nim-sum heuristic
+        'computational_efficiency': efficiency['Nim'],
         'strategic_consistency': 100,     # Mathematical consistency
         'algorithm_effectiveness': 100,   # Perfect mathematical solution
         'theoretical_optimality': 100    # Mathematically optimal
@@ -430,7 +215,7 @@ def calculate_game_metrics(data):
     metrics['Halving'] = {
         'win_rate': avg_win_rate,
         'avg_game_length': avg_game_length,
-        'computational_efficiency': 70,   # Variable efficiency
+        'computational_efficiency': efficiency['Halving'],
         'strategic_consistency': max(30, consistency),  # Highly variable
         'algorithm_effectiveness': 85,    # Good mathematical analysis
         'theoretical_optimality': 75     # Dependent on starting conditions
@@ -520,7 +305,7 @@ def create_radar_plot(metrics):
             game,
             f"{game_metrics['win_rate']:.1f}%",
             f"{game_metrics['avg_game_length']:.1f}",
-            f"{game_metrics['computational_efficiency']}/100",
+            f"{game_metrics['computational_efficiency']:.0f}/100",
             f"{overall_score:.1f}/100"
         ])
     
@@ -790,7 +575,7 @@ def generate_all_radar_plots(data):
         print(f"  {game}:")
         print(f"    Win Rate: {game_metrics['win_rate']:.1f}%")
         print(f"    Avg Game Length: {game_metrics['avg_game_length']:.1f} moves")
-        print(f"    Computational Efficiency: {game_metrics['computational_efficiency']}/100")
+        print(f"    Computational Efficiency: {game_metrics['computational_efficiency']:.0f}/100")
 
 def main():
     """Main function: Run simulations then generate radar plots"""